@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import mmap
 import time
-from typing import AsyncGenerator, Optional
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import AsyncGenerator, Optional, Union
 
+from core import fastjson
 from core.agent.prompts import RAG_CONTEXT_PROMPT, get_system_prompt
 from core.agent.tools.base import BaseTool, ToolResult
 from core.agent.tools.calculator import CalculatorTool
@@ -21,12 +25,78 @@ from core.agent.tools.web_search import WebSearchTool
 from core.agent.tools.wikipedia_tool import WikipediaTool
 from core.config import get_settings
 from core.events import EventType, get_event_bus
-from core.llm.base import Message
+from core.llm.base import Message, MessageLike, Role
 from core.llm.router import LLMRouter
 
+try:
+    from pybase64 import b64encode_as_string as _b64_str  # SIMD, encodes straight to str
+except ImportError:
+    import base64
+
+    def _b64_str(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
 logger = logging.getLogger(__name__)
 
 MAX_ITERATIONS = 5  # Maximum tool-calling loops
+TOOL_CACHE_SIZE = 128  # Cached results kept for cacheable tools (LRU)
+
+
+_MIME_MAP = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+}
+
+# Magic-byte prefixes for images handed over in memory (no file suffix to go on)
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+)
+
+
+def _sniff_mime(data: bytes) -> str:
+    """Guess an image MIME type from its leading bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mime in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return mime
+    return "image/png"
+
+
+def _encode_image(image: Union[Path, bytes]) -> str:
+    """
+    Base64-encode an image file or raw image bytes (runs in a worker thread).
+    Files are memory-mapped so the raw image never becomes a Python bytes copy.
+    """
+    if not isinstance(image, Path):
+        return _b64_str(image)
+    with image.open("rb") as f:
+        if f.seek(0, 2) == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return _b64_str(view)
+
+
+def _tool_message(tool_call: dict, result: ToolResult) -> dict:
+    """
+    Tool result in OpenAI wire format. These only live for one turn and
+    only feed the provider request, so a plain dict skips building (and
+    later re-serializing) a Message object for each one.
+    """
+    return {
+        "role": "tool",
+        "content": str(result),
+        "name": tool_call["name"],
+        "tool_call_id": tool_call["id"],
+    }
 
 
 class HolexAgent:
@@ -44,17 +114,27 @@ class HolexAgent:
 
         # Register all tools
         self._tools: dict[str, BaseTool] = {}
+        self._tool_schemas: list[dict] = []  # rebuilt on registration, reused every turn
+        self._tool_schemas_json: bytes = b"[]"  # same schemas, pre-serialized for the router
+        # (tool, args json) -> (expires_at, result) for tools marked cacheable
+        self._tool_cache: OrderedDict[tuple[str, str], tuple[float, ToolResult]] = OrderedDict()
         self._register_default_tools()
 
-        # Conversation history
-        self._history: list[Message] = []
+        # Conversation history - trimmed a whole turn at a time (see _trim_history)
+        self._max_history = 50  # Hard cap on stored messages
+        self._history_floor = self._max_history * 3 // 4  # Trim back down to this
+        self._history: deque[Message] = deque()
         self._system_message = Message.system(get_system_prompt())
-        self._max_history = 50  # Keep last 50 messages
+        self._call_seq = 0  # source of tool_call_ids for providers that omit them
 
     def clear_history(self) -> None:
         """Clear conversation history (called on new/clear chat)."""
         self._history.clear()
 
+    async def close(self) -> None:
+        """Close the tools' pooled HTTP clients (called on app shutdown)."""
+        await asyncio.gather(*(tool.close() for tool in self._tools.values()), return_exceptions=True)
+
     def _register_default_tools(self) -> None:
         """Register all built-in tools."""
         tools = [
@@ -72,52 +152,57 @@ class HolexAgent:
         for tool in tools:
             self._tools[tool.name] = tool
             logger.debug(f"Registered tool: {tool.name}")
+        self._refresh_tool_schemas()
 
     def register_tool(self, tool: BaseTool) -> None:
         """Register a custom tool (for plugins)."""
         self._tools[tool.name] = tool
+        self._refresh_tool_schemas()
         logger.info(f"Registered custom tool: {tool.name}")
 
+    def _refresh_tool_schemas(self) -> None:
+        """Rebuild the cached schema list after the tool set changes."""
+        self._tool_schemas = [tool.to_openai_tool() for tool in self._tools.values()]
+        self._tool_schemas_json = fastjson.dumps_bytes(self._tool_schemas)
+
     def get_tool_schemas(self) -> list[dict]:
-        """Get OpenAI-format tool schemas for all registered tools."""
-        return [tool.to_openai_tool() for tool in self._tools.values()]
+        """
+        Get OpenAI-format tool schemas for all registered tools.
+        Returns the shared cached list - treat it as read-only.
+        """
+        return self._tool_schemas
 
     async def process_with_image(
         self,
         user_message: str,
-        image_path: str,
+        image: Union[str, Path, bytes],
     ) -> str:
         """
         Send an image + text to a vision model.
-        Reads the file, base64 encodes it, and lets the router
-        pick the right vision model (Llama 4 Scout usually).
+        Accepts a file path or the raw image bytes (e.g. straight from the
+        clipboard or a screenshot buffer, no temp file needed), base64
+        encodes it, and lets the router pick the right vision model
+        (Llama 4 Scout usually).
         """
-        import base64
-        from pathlib import Path
-
-        img_path = Path(image_path)
-        if not img_path.exists():
-            return f"Image file not found: {image_path}"
-
-        # Read and encode the image
-        suffix = img_path.suffix.lower()
-        mime_map = {
-            ".png": "image/png",
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-            ".bmp": "image/bmp",
-        }
-        mime = mime_map.get(suffix, "image/png")
-        raw = img_path.read_bytes()
-        b64 = base64.b64encode(raw).decode()
+        if isinstance(image, (bytes, bytearray)):
+            mime = _sniff_mime(image)
+            label = "Image"
+            b64 = await asyncio.to_thread(_encode_image, bytes(image))
+        else:
+            img_path = Path(image)
+            if not img_path.exists():
+                return f"Image file not found: {image}"
+
+            mime = _MIME_MAP.get(img_path.suffix.lower(), "image/png")
+            label = f"Image: {img_path.name}"
+            b64 = await asyncio.to_thread(_encode_image, img_path)
+
         data_url = f"data:{mime};base64,{b64}"
 
         # Build multimodal message
         prompt = user_message or "Describe this image in detail."
         vision_msg = Message.user_with_image(prompt, data_url)
-        self._history.append(Message.user(f"[Image: {img_path.name}] {prompt}"))
+        self._remember(Message.user(f"[{label}] {prompt}"))
 
         messages = [self._system_message] + [vision_msg]
 
@@ -131,8 +216,7 @@ class HolexAgent:
                 messages=messages,
                 auto_route=True,  # will auto-select Llama 4 via vision tier
             )
-            self._history.append(Message.assistant(response.content))
-            self._trim_history()
+            self._remember(Message.assistant(response.content))
 
             self.bus.emit(EventType.AGENT_RESPONSE, {
                 "content": response.content,
@@ -146,7 +230,7 @@ class HolexAgent:
         except Exception as e:
             error_msg = f"Vision analysis failed: {e}"
             logger.error(error_msg)
-            self._history.append(Message.assistant(error_msg))
+            self._remember(Message.assistant(error_msg))
             return error_msg
 
     async def process(
@@ -161,7 +245,7 @@ class HolexAgent:
         start_time = time.perf_counter()
 
         # Add user message to history
-        self._history.append(Message.user(user_message))
+        self._remember(Message.user(user_message))
 
         # Build messages for LLM
         messages = self._build_messages(rag_context)
@@ -177,6 +261,7 @@ class HolexAgent:
                 response = await self.router.generate(
                     messages=messages,
                     tools=self.get_tool_schemas(),
+                    tools_json=self._tool_schemas_json,
                 )
 
                 # Check if LLM wants to call tools
@@ -186,8 +271,7 @@ class HolexAgent:
                 if not tool_calls:
                     # No tool calls → final answer
                     final_text = response.content
-                    self._history.append(Message.assistant(final_text))
-                    self._trim_history()
+                    self._remember(Message.assistant(final_text))
 
                     latency = (time.perf_counter() - start_time) * 1000
                     self.bus.emit(EventType.AGENT_RESPONSE, {
@@ -200,20 +284,19 @@ class HolexAgent:
                     return final_text
 
                 # Execute tool calls
-                import uuid
-
                 # Ensure all tool calls have IDs and proper structure
                 # This fixes the "missing tool_call_id" error when switching providers
                 normalized_tool_calls = []
                 for tc in tool_calls:
                     if not tc.get("id"):
-                        tc["id"] = f"call_{uuid.uuid4().hex[:8]}"
+                        self._call_seq += 1
+                        tc["id"] = f"call_{self._call_seq:08x}"
                     normalized_tool_calls.append({
                         "id": tc["id"],
                         "type": "function",
                         "function": {
                             "name": tc["name"],
-                            "arguments": json.dumps(tc["arguments"])
+                            "arguments": fastjson.dumps(tc["arguments"])
                         }
                     })
 
@@ -231,16 +314,9 @@ class HolexAgent:
                     })
 
                 # Execute independent tool calls in parallel
-                import asyncio as _aio
-                results = await _aio.gather(
-                    *[self._execute_tool(tc["name"], tc["arguments"]) for tc in tool_calls],
-                    return_exceptions=True,
-                )
+                results = await self._run_tools(tool_calls)
 
                 for tc, result in zip(tool_calls, results):
-                    if isinstance(result, Exception):
-                        result = ToolResult(success=False, output="", error=str(result))
-
                     self.bus.emit(EventType.AGENT_TOOL_RESULT, {
                         "tool": tc["name"],
                         "success": result.success,
@@ -248,9 +324,7 @@ class HolexAgent:
                     })
 
                     # Add tool result to messages (with call ID for Groq/OpenAI)
-                    messages.append(Message.tool(
-                        str(result), name=tc["name"], tool_call_id=tc["id"],
-                    ))
+                    messages.append(_tool_message(tc, result))
 
             except Exception as e:
                 logger.error(f"Agent iteration {iteration + 1} failed: {e}")
@@ -258,7 +332,7 @@ class HolexAgent:
 
                 # Try to give a graceful response
                 error_msg = f"I encountered an error: {str(e)}. Let me try to help anyway."
-                self._history.append(Message.assistant(error_msg))
+                self._remember(Message.assistant(error_msg))
                 return error_msg
 
         # Max iterations reached - summarize what we have
@@ -274,7 +348,7 @@ class HolexAgent:
         Tool calls are handled internally with a full ReAct loop
         (up to MAX_ITERATIONS), only the final answer is streamed.
         """
-        self._history.append(Message.user(user_message))
+        self._remember(Message.user(user_message))
         messages = self._build_messages(rag_context)
 
         try:
@@ -283,6 +357,7 @@ class HolexAgent:
                 response = await self.router.generate(
                     messages=messages,
                     tools=self.get_tool_schemas(),
+                    tools_json=self._tool_schemas_json,
                 )
 
                 raw = response.raw_response or {}
@@ -292,17 +367,17 @@ class HolexAgent:
                     break  # No tools needed — stream final answer below
 
                 # Execute proper tool call history construction
-                import uuid
                 normalized_tool_calls = []
                 for tc in tool_calls:
                     if not tc.get("id"):
-                        tc["id"] = f"call_{uuid.uuid4().hex[:8]}"
+                        self._call_seq += 1
+                        tc["id"] = f"call_{self._call_seq:08x}"
                     normalized_tool_calls.append({
                         "id": tc["id"],
                         "type": "function",
                         "function": {
                             "name": tc["name"],
-                            "arguments": json.dumps(tc["arguments"])
+                            "arguments": fastjson.dumps(tc["arguments"])
                         }
                     })
 
@@ -311,41 +386,32 @@ class HolexAgent:
                 messages.append(assistant_msg)
 
                 # Run independent tool calls in parallel
-                import asyncio as _aio
-                results = await _aio.gather(
-                    *[self._execute_tool(tc["name"], tc["arguments"]) for tc in tool_calls],
-                    return_exceptions=True,
-                )
+                results = await self._run_tools(tool_calls)
 
                 for tc, result in zip(tool_calls, results):
-                    if isinstance(result, Exception):
-                        result = ToolResult(success=False, output="", error=str(result))
                     self.bus.emit(EventType.AGENT_TOOL_RESULT, {
                         "tool": tc["name"],
                         "success": result.success,
                     })
-                    messages.append(Message.tool(
-                        str(result), name=tc["name"], tool_call_id=tc["id"],
-                    ))
+                    messages.append(_tool_message(tc, result))
 
             # Stream the final response
-            full_response = ""
+            parts: list[str] = []
             async for chunk in self.router.stream(messages=messages):
                 if chunk.content:
-                    full_response += chunk.content
+                    parts.append(chunk.content)
                     yield chunk.content
 
-            self._history.append(Message.assistant(full_response))
-            self._trim_history()
+            self._remember(Message.assistant("".join(parts)))
 
         except Exception as e:
             error_msg = f"Sorry, I encountered an error: {str(e)}"
             yield error_msg
-            self._history.append(Message.assistant(error_msg))
+            self._remember(Message.assistant(error_msg))
 
-    def _build_messages(self, rag_context: Optional[str] = None) -> list[Message]:
+    def _build_messages(self, rag_context: Optional[str] = None) -> list[MessageLike]:
         """Build the full message list for LLM."""
-        messages = [self._system_message]
+        messages: list[MessageLike] = [self._system_message]
 
         # Add RAG context if available
         if rag_context:
@@ -353,8 +419,8 @@ class HolexAgent:
                 RAG_CONTEXT_PROMPT.format(context=rag_context)
             ))
 
-        # Add conversation history (trimmed)
-        messages.extend(self._history[-self._max_history:])
+        # Add conversation history (already trimmed by _remember)
+        messages.extend(self._history)
         return messages
 
     def _extract_tool_calls(self, raw_response: dict) -> list[dict]:
@@ -362,25 +428,32 @@ class HolexAgent:
         tool_calls = []
 
         # OpenAI/Groq format
-        choices = raw_response.get("choices", [])
-        if choices:
-            message = choices[0].get("message", {})
-            calls = message.get("tool_calls", [])
+        if "choices" in raw_response:
+            choices = raw_response["choices"]
+            if not choices:
+                return tool_calls
+            calls = choices[0].get("message", {}).get("tool_calls") or ()
+            json_loads = fastjson.loads
             for call in calls:
                 func = call.get("function", {})
-                try:
-                    args = json.loads(func.get("arguments", "{}"))
-                except json.JSONDecodeError:
+                args_s = func.get("arguments") or ""
+                if not args_s or args_s == "{}":
                     args = {}
+                else:
+                    try:
+                        args = json_loads(args_s)
+                    except fastjson.JSONDecodeError:
+                        args = {}
                 tool_calls.append({
                     "id": call.get("id", ""),
                     "name": func.get("name", ""),
                     "arguments": args,
                 })
+            return tool_calls
 
         # Gemini format
-        candidates = raw_response.get("candidates", [])
-        if candidates and not tool_calls:
+        candidates = raw_response.get("candidates")
+        if candidates:
             parts = candidates[0].get("content", {}).get("parts", [])
             for part in parts:
                 fc = part.get("functionCall")
@@ -392,6 +465,61 @@ class HolexAgent:
 
         return tool_calls
 
+    async def _run_tools(self, tool_calls: list[dict]) -> list[ToolResult]:
+        """
+        Execute tool calls concurrently and return results in call order.
+
+        Identical calls (same tool, same arguments) to a cacheable tool in
+        one response run once and share the result; calls to other tools
+        may have side effects (two volume_up calls mean two steps), so
+        they all run. If one tool raises something
+        _execute_tool doesn't swallow, or the whole turn is cancelled, the
+        tools still running are cancelled instead of being left to finish
+        in the background.
+        """
+        unique_calls: list[dict] = []
+        seen: dict[tuple[str, str], int] = {}
+        slots: list[int] = []  # index into unique_calls for each original call
+        for tc in tool_calls:
+            tool = self._tools.get(tc["name"])
+            if tool is None or not tool.cacheable:
+                slots.append(len(unique_calls))
+                unique_calls.append(tc)
+                continue
+            key = (tc["name"], fastjson.dumps(tc["arguments"], sort_keys=True))
+            if key not in seen:
+                seen[key] = len(unique_calls)
+                unique_calls.append(tc)
+            slots.append(seen[key])
+
+        tasks = [
+            asyncio.ensure_future(self._execute_tool(tc["name"], tc["arguments"]))
+            for tc in unique_calls
+        ]
+        if not tasks:
+            return []
+        try:
+            _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(ToolResult(success=False, output="", error="Cancelled"))
+            elif task.exception() is not None:
+                results.append(ToolResult(success=False, output="", error=str(task.exception())))
+            else:
+                results.append(task.result())
+        return [results[slot] for slot in slots]
+
     async def _execute_tool(self, tool_name: str, args: dict) -> ToolResult:
         """Execute a tool by name with given arguments."""
         tool = self._tools.get(tool_name)
@@ -401,19 +529,48 @@ class HolexAgent:
                 error=f"Tool '{tool_name}' not found",
             )
 
+        key = None
+        if tool.cacheable:
+            key = (tool_name, fastjson.dumps(args, sort_keys=True))
+            cached = self._tool_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self._tool_cache.move_to_end(key)
+                logger.info(f"Tool cache hit: {tool_name}({args})")
+                return cached[1]
+
         try:
             logger.info(f"Executing tool: {tool_name}({args})")
-            return await tool.execute(**args)
+            result = await tool.execute_raw(args)
         except Exception as e:
             logger.error(f"Tool {tool_name} crashed: {e}")
             return ToolResult(success=False, output="", error=str(e))
 
-    def _trim_history(self) -> None:
-        """Keep conversation history within bounds."""
+        if key is not None and result.success:
+            self._tool_cache[key] = (time.monotonic() + tool.cache_ttl, result)
+            self._tool_cache.move_to_end(key)
+            if len(self._tool_cache) > TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+        return result
+
+    def _remember(self, message: Message) -> None:
+        """Append a message to history, trimming once it passes the cap."""
+        self._history.append(message)
         if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
+            self._trim_history()
 
+    def _trim_history(self) -> None:
+        """
+        Drop the oldest complete turns until history is back under the floor.
 
+        Trimming in one larger step (instead of sliding one message per
+        turn) keeps the prompt prefix byte-identical for the next several
+        requests, so provider-side prefix caches keep hitting. History
+        always restarts on a user message, never mid-turn.
+        """
+        while len(self._history) > self._history_floor:
+            self._history.popleft()
+            while self._history and self._history[0].role != Role.USER:
+                self._history.popleft()
 
     def get_history(self) -> list[Message]:
         """Get current conversation history."""
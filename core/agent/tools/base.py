@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
+
+import httpx
+
+from core import background
+
+_F = TypeVar("_F", bound=Callable)
 
 
 @dataclass
@@ -21,12 +28,46 @@ class ToolResult:
         return f"Error: {self.error or self.output}"
 
 
+def action(*names: str) -> Callable[[_F], _F]:
+    """Mark a tool method as the handler for one or more values of its `action` argument."""
+    def register(fn: _F) -> _F:
+        fn._tool_actions = names
+        return fn
+    return register
+
+
 class BaseTool(ABC):
     """
     Every tool needs a name, description, and JSON schema
     so the LLM knows when and how to call it.
+
+    Tools whose output depends only on their arguments (for a while, at
+    least) can set `cacheable = True` and a `cache_ttl` in seconds; the
+    agent then reuses successful results for identical calls.
+
+    Multi-action tools decorate their handlers with `@action("name")`;
+    the handlers are collected into the class's `_actions` table when
+    the class is defined, so execute() is a single dict lookup.
+
+    Tools that call web APIs use `_http_client()`, a pooled client built
+    from `_http_options`; the agent calls `close()` on shutdown.
     """
 
+    cacheable: bool = False
+    cache_ttl: float = 0.0
+    _actions: dict[str, Callable] = {}
+    _http_options: dict[str, Any] = {"timeout": 10}
+    _http: Optional[httpx.AsyncClient] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        table = dict(cls._actions)
+        for attr in vars(cls).values():
+            for name in getattr(attr, "_tool_actions", ()):
+                table[name] = attr
+        cls._actions = table
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -50,6 +91,40 @@ class BaseTool(ABC):
         """Execute the tool with given parameters."""
         ...
 
+    def _http_client(self) -> httpx.AsyncClient:
+        """
+        This tool's pooled client for the running loop, so repeat calls
+        reuse keep-alive connections. If the loop changes, the old client
+        is closed on its own loop and a new one is built.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop or self._http.is_closed:
+            if self._http is not None and self._http_loop is not loop:
+                background.close_on(self._http, self._http_loop)
+            self._http = httpx.AsyncClient(**self._http_options)
+            self._http_loop = loop
+        return self._http
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client, on whichever loop it belongs to."""
+        client, loop = self._http, self._http_loop
+        self._http, self._http_loop = None, None
+        if client is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            future = background.close_on(client, loop)
+            if future is not None:
+                await asyncio.wrap_future(future)
+
+    async def execute_raw(self, args: dict) -> ToolResult:
+        """
+        Execute with the LLM's argument dict as-is (what the agent calls).
+        Tools on a hot path can override this to skip the **kwargs splat.
+        """
+        return await self.execute(**args)
+
     def to_openai_tool(self) -> dict:
         """Convert to OpenAI function calling format (used by Groq too)."""
         return {
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import ast
+import asyncio
 import logging
 import math
+from functools import lru_cache
+from types import CodeType
+from typing import Optional
 
 from core.agent.tools.base import BaseTool, ToolResult
 
@@ -26,10 +31,143 @@ SAFE_MATH_GLOBALS = {
     "gcd": math.gcd, "degrees": math.degrees, "radians": math.radians,
 }
 
+_FORBIDDEN_NAMES = ("import", "exec", "eval", "open", "os", "sys", "__")
+_MAX_LITERAL_BITS = 4096     # reject absurd integer literals before evaluating
+_MAX_RESULT_BITS = 1 << 16   # ...and anything whose value could grow past this
+_FLOAT_BITS = 1024           # floats overflow (cheaply) past 2**1024
+_FLOAT_NAMES = frozenset({"pi", "e", "tau", "inf"})
+_FLOAT_FUNCS = frozenset({
+    "float", "sqrt", "cbrt", "sin", "cos", "tan", "asin", "acos", "atan",
+    "sinh", "cosh", "tanh", "log", "log2", "log10", "exp", "degrees", "radians",
+})
+EVAL_TIMEOUT = 2.0           # seconds before we stop waiting on a runaway expression
+
+
+class ForbiddenExpressionError(ValueError):
+    """Expression references a name the calculator refuses to evaluate."""
+
+
+def _bits(node: ast.AST) -> float:
+    """
+    Upper bound on the bit length of what node evaluates to. Big-int **,
+    << and factorial hold the GIL, so the eval timeout can't stop them;
+    they have to be refused before they start.
+    """
+    seq = _seq_bits(node)
+    if seq is not None:
+        return seq
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, int):
+            return _FLOAT_BITS
+        return node.value.bit_length()
+    if isinstance(node, ast.UnaryOp):
+        return _bits(node.operand)
+    if isinstance(node, ast.BinOp):
+        left, right = _bits(node.left), _bits(node.right)
+        op = node.op
+        if isinstance(op, (ast.Add, ast.Sub)):
+            return max(left, right) + 1
+        if isinstance(op, ast.Mult):
+            return left + right
+        if isinstance(op, ast.Div):
+            return _FLOAT_BITS
+        if isinstance(op, (ast.FloorDiv, ast.Mod, ast.RShift)):
+            return left
+        if isinstance(op, ast.Pow):
+            return _power_bits(node.left, node.right)
+        if isinstance(op, ast.LShift):
+            return left + _max_value(node.right)
+        return max(left, right)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id == "pow" and len(node.args) == 2:
+            return _power_bits(*node.args)
+        if node.func.id == "factorial" and len(node.args) == 1:
+            n = _max_value(node.args[0])
+            return n * math.log2(n) if n > 1 else 1   # n! < n**n
+    children = [_bits(child) for child in ast.iter_child_nodes(node)]
+    return max(children, default=1) + len(children).bit_length()
+
+
+def _seq_bits(node: ast.AST) -> Optional[float]:
+    """
+    Upper bound on the size in bits of a str/bytes/list/tuple node, or None
+    if node isn't a sequence. "a" * 10**9 allocates before the eval
+    timeout can fire, so repetition shares the integer bit budget.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes)):
+        return 8 * len(node.value)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return 64 * len(node.elts)      # one pointer per element
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _seq_bits(node.left), _seq_bits(node.right)
+        if left is not None and right is not None:
+            return left + right
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        for seq, count in ((node.left, node.right), (node.right, node.left)):
+            size = _seq_bits(seq)
+            if size is not None:
+                return size * _max_value(count) if size else 0
+    return None
+
+
+def _may_be_int(node: ast.AST) -> bool:
+    """False when node certainly evaluates to a float (so ** can't grow without bound)."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, int)
+    if isinstance(node, ast.Name):
+        return node.id not in _FLOAT_NAMES
+    if isinstance(node, ast.UnaryOp):
+        return _may_be_int(node.operand)
+    if isinstance(node, ast.BinOp):
+        return not isinstance(node.op, ast.Div) and _may_be_int(node.left) and _may_be_int(node.right)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id not in _FLOAT_FUNCS
+    return True
+
+
+def _max_value(node: ast.AST) -> float:
+    """Upper bound on abs(value) of node, as used for exponents and shift counts."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return abs(node.value)
+    bits = _bits(node)
+    return 2 ** bits if bits <= 64 else math.inf
+
+
+def _power_bits(base: ast.AST, exponent: ast.AST) -> float:
+    if not (_may_be_int(base) and _may_be_int(exponent)):
+        return _FLOAT_BITS      # float powers overflow cheaply instead of growing
+    if (isinstance(exponent, ast.UnaryOp) and isinstance(exponent.op, ast.USub)
+            and isinstance(exponent.operand, ast.Constant)):
+        return _FLOAT_BITS      # negative power of an int is a float
+    return _bits(base) * _max_value(exponent)
+
+
+@lru_cache(maxsize=256)
+def _compile_safe(expression: str) -> CodeType:
+    """
+    Compile an expression and vet the names it references.
+    Cached so repeated expressions skip compile() entirely; a rejected
+    expression raises and is never cached.
+    """
+    tree = ast.parse(expression, "<calc>", "eval")
+    code = compile(tree, "<calc>", "eval")
+    for name in code.co_names:
+        if any(f in name.lower() for f in _FORBIDDEN_NAMES):
+            raise ForbiddenExpressionError(f"Forbidden operation: {name}")
+    for const in code.co_consts:
+        if isinstance(const, int) and const.bit_length() > _MAX_LITERAL_BITS:
+            raise ForbiddenExpressionError("Number too large")
+    if _bits(tree.body) > _MAX_RESULT_BITS:
+        raise ForbiddenExpressionError("Result would be too large to compute")
+    return code
+
 
 class CalculatorTool(BaseTool):
     """Evaluate mathematical expressions safely."""
 
+    cacheable = True
+    cache_ttl = math.inf  # pure function of the expression
+
     @property
     def name(self) -> str:
         return "calculator"
@@ -55,21 +193,19 @@ class CalculatorTool(BaseTool):
             "required": ["expression"],
         }
 
+    async def execute_raw(self, args: dict) -> ToolResult:
+        return await self.execute(args.get("expression", ""))
+
     async def execute(self, expression: str, **kwargs) -> ToolResult:
         try:
-            # Security: compile to check for dangerous operations
-            code = compile(expression, "<calc>", "eval")
+            # Security: compile (cached) and check for dangerous operations
+            code = _compile_safe(expression)
 
-            # Check for forbidden names
-            forbidden = {"import", "exec", "eval", "open", "os", "sys", "__"}
-            for name in code.co_names:
-                if any(f in name.lower() for f in forbidden):
-                    return ToolResult(
-                        success=False, output="",
-                        error=f"Forbidden operation: {name}",
-                    )
-
-            result = eval(code, SAFE_MATH_GLOBALS)
+            # Evaluate in a worker thread so huge powers/factorials can't stall the event loop
+            result = await asyncio.wait_for(
+                asyncio.to_thread(eval, code, SAFE_MATH_GLOBALS),
+                timeout=EVAL_TIMEOUT,
+            )
 
             # Format nicely
             if isinstance(result, float):
@@ -88,6 +224,13 @@ class CalculatorTool(BaseTool):
                 data={"expression": expression, "result": result},
             )
 
+        except asyncio.TimeoutError:
+            return ToolResult(
+                success=False, output="",
+                error="Calculator timed out",
+            )
+        except ForbiddenExpressionError as e:
+            return ToolResult(success=False, output="", error=str(e))
         except SyntaxError:
             return ToolResult(
                 success=False, output="",
@@ -1,6 +1,9 @@
 """
 Runs user code in a subprocess with a timeout.
 
+Tiny arithmetic/print snippets that can be proven cheap from their AST
+skip the subprocess and run in-process instead.
+
 This is NOT a proper sandbox - for a real app you'd want Docker
 or something. But it's good enough for a desktop assistant where
 the user is running their own code anyway.
@@ -8,19 +11,52 @@ the user is running their own code anyway.
 
 from __future__ import annotations
 
+import ast
+import asyncio
 import logging
-import os
+import math
+import re
 import subprocess
 import sys
 import textwrap
+import threading
+from collections import deque
 from pathlib import Path
+from typing import Optional
 
 from core.agent.tools.base import BaseTool, ToolResult
 
+try:
+    import hyperscan  # python-hyperscan - optional SIMD DFA (not on Windows)
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick  # pyahocorasick - optional C automaton
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT_SECONDS = 15
 
+# Safe stdlib modules every snippet gets for free
+_PRELUDE = (
+    "import math, json, datetime, re, collections, itertools, functools, "
+    "statistics, random, textwrap, string\n"
+)
+
+# -I: isolated (ignores PYTHON* env, user site, cwd on sys.path); site-packages
+#     stay importable, so snippets can still use numpy, requests, ...
+# -B: no .pyc writes (PYTHONDONTWRITEBYTECODE is ignored under -I)
+# -X utf8: stdout/stderr are UTF-8 regardless of the console code page
+_PYTHON_FLAGS = ("-I", "-B", "-X", "utf8")
+
+# Output is read in chunks into a bounded buffer; a snippet that prints
+# more than this per stream gets killed instead of eating memory.
+_MAX_OUTPUT_BYTES = 1 << 20
+_READ_CHUNK = 4096
+
 # Aggressive string-level filter — reject before even spawning a process.
 _BLOCKED_TOKENS = (
     "import os", "import sys", "import subprocess", "import shutil",
@@ -33,6 +69,256 @@ _BLOCKED_TOKENS = (
 )
 
 
+# ASCII-only lowercasing table (every blocked token is ASCII). bytes.translate
+# is a flat table lookup, unlike str.lower which has to handle Unicode case.
+_LOWER_TABLE = bytes.maketrans(bytes(range(256)), bytes(range(256)).lower())
+
+
+def _ascii_lower(code: str) -> bytes:
+    """Lowercase the ASCII letters of code as UTF-8 bytes for token matching."""
+    return code.encode("utf-8", "replace").translate(_LOWER_TABLE)
+
+
+def _build_blocked_matcher():
+    """
+    Compile _BLOCKED_TOKENS into one single-pass matcher over _ascii_lower() bytes.
+    Prefers a Hyperscan block database, then an Aho-Corasick automaton, else
+    a regex alternation (still one scan instead of one `in` per token).
+    """
+    if hyperscan is not None:
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[re.escape(token.lower()).encode("ascii") for token in _BLOCKED_TOKENS],
+            ids=list(range(len(_BLOCKED_TOKENS))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_BLOCKED_TOKENS),
+        )
+
+        def find(lowered: bytes) -> Optional[str]:
+            hits: list[int] = []
+
+            def on_match(token_id, start, end, flags, context):
+                hits.append(token_id)
+                return True   # stop at the first hit
+
+            try:
+                db.scan(lowered, match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass
+            return _BLOCKED_TOKENS[hits[0]] if hits else None
+        return find
+
+    if ahocorasick is not None:
+        # Default pyahocorasick builds are str-keyed; latin-1 maps bytes 1:1
+        needs_str = getattr(ahocorasick, "unicode", True)
+        automaton = ahocorasick.Automaton()
+        for token in _BLOCKED_TOKENS:
+            key = token.lower()
+            automaton.add_word(key if needs_str else key.encode("ascii"), token)
+        automaton.make_automaton()
+
+        def find(lowered: bytes) -> Optional[str]:
+            haystack = lowered.decode("latin-1") if needs_str else lowered
+            for _, token in automaton.iter(haystack):
+                return token
+            return None
+        return find
+
+    by_lower = {token.lower().encode("ascii"): token for token in _BLOCKED_TOKENS}
+    pattern = re.compile(b"|".join(map(re.escape, by_lower)))
+
+    def find(lowered: bytes) -> Optional[str]:
+        m = pattern.search(lowered)
+        return by_lower[m.group()] if m else None
+    return find
+
+
+_scan_blocked_tokens = _build_blocked_matcher()
+
+
+def _byte_mask(data: bytes) -> int:
+    """256-bit set of the byte values that occur in data."""
+    mask = 0
+    for b in set(data):
+        mask |= 1 << b
+    return mask
+
+
+# A token can only occur if every one of its bytes occurs somewhere in the code
+_TOKEN_MASKS = tuple({_byte_mask(token.lower().encode("ascii")) for token in _BLOCKED_TOKENS})
+
+
+def _find_blocked_token(lowered: bytes) -> Optional[str]:
+    """First blocked token in lowered code, or None. Cheap byte-set pre-check first."""
+    present = _byte_mask(lowered)
+    if not any(present & mask == mask for mask in _TOKEN_MASKS):
+        return None
+    return _scan_blocked_tokens(lowered)
+
+
+def _pump(stream, chunks: deque, proc: subprocess.Popen, overflow: threading.Event) -> None:
+    """Copy one pipe into chunks, killing the process once it overflows the cap."""
+    total = 0
+    for chunk in iter(lambda: stream.read(_READ_CHUNK), b""):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total > _MAX_OUTPUT_BYTES and not overflow.is_set():
+            overflow.set()
+            proc.kill()
+
+
+def _run_capped(args: list[str], **popen_kwargs) -> tuple[int, str, str, bool]:
+    """
+    Like subprocess.run(capture_output=True) but with bounded memory.
+    Returns (returncode, stdout, stderr, overflowed); raises TimeoutExpired.
+    """
+    proc = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **popen_kwargs,
+    )
+    overflow = threading.Event()
+    buffers = (
+        deque(maxlen=_MAX_OUTPUT_BYTES // _READ_CHUNK),
+        deque(maxlen=_MAX_OUTPUT_BYTES // _READ_CHUNK),
+    )
+    readers = [
+        threading.Thread(target=_pump, args=(stream, buf, proc, overflow), daemon=True)
+        for stream, buf in zip((proc.stdout, proc.stderr), buffers)
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        proc.wait(timeout=_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=1.0)
+
+    def decode(buf: deque) -> str:
+        return b"".join(buf).decode("utf-8", "replace").replace("\r\n", "\n")
+
+    return proc.returncode, decode(buffers[0]), decode(buffers[1]), overflow.is_set()
+
+
+# ── In-process fast path ──────────────────────────────────────────────
+# Only short snippets made of expression statements over numbers, a few
+# pure builtins, and math.* qualify. Everything here must behave exactly
+# as it would in the subprocess (same names, no new builtins), and must be
+# cheap by construction since there's no timeout to save us.
+_INLINE_MAX_LEN = 256
+_INLINE_MAX_POW = 64          # constant exponent bound; bases can't contain another **
+_INLINE_MAX_RANGE = 10 ** 6
+_INLINE_FUNCS = {
+    "abs": abs, "round": round, "min": min, "max": max, "sum": sum,
+    "len": len, "int": int, "float": float, "divmod": divmod, "range": range,
+}
+_INLINE_REDUCERS = frozenset({"sum", "min", "max", "len"})   # may take a range()
+_INLINE_MATH_CONSTS = frozenset({"pi", "e", "tau", "inf"})
+_INLINE_MATH_FUNCS = frozenset({
+    "sqrt", "isqrt", "exp", "log", "log2", "log10", "floor", "ceil", "trunc",
+    "fabs", "hypot", "gcd", "degrees", "radians", "sin", "cos", "tan",
+    "asin", "acos", "atan", "atan2", "sinh", "cosh", "tanh",
+})
+_INLINE_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod)
+
+
+def _is_const(node: ast.AST, *types: type) -> bool:
+    return isinstance(node, ast.Constant) and type(node.value) in types
+
+
+def _inline_range_ok(node: ast.AST) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name) and node.func.id == "range"
+        and not node.keywords and 1 <= len(node.args) <= 3
+        and all(_is_const(a, int) and abs(a.value) <= _INLINE_MAX_RANGE for a in node.args)
+    )
+
+
+def _inline_num_ok(node: ast.AST, allow_pow: bool = True) -> bool:
+    """True if node is a numeric expression that is cheap to evaluate."""
+    if isinstance(node, ast.Constant):
+        return type(node.value) in (int, float)
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, (ast.UAdd, ast.USub)) and _inline_num_ok(node.operand, allow_pow)
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Pow):
+            return (
+                allow_pow
+                and _is_const(node.right, int) and abs(node.right.value) <= _INLINE_MAX_POW
+                and _inline_num_ok(node.left, allow_pow=False)
+            )
+        return (
+            isinstance(node.op, _INLINE_BINOPS)
+            and _inline_num_ok(node.left, allow_pow)
+            and _inline_num_ok(node.right, allow_pow)
+        )
+    if isinstance(node, ast.Attribute):
+        return (
+            isinstance(node.value, ast.Name) and node.value.id == "math"
+            and node.attr in _INLINE_MATH_CONSTS
+        )
+    if isinstance(node, ast.Call) and not node.keywords:
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in _INLINE_FUNCS and func.id != "range":
+            reducer = func.id in _INLINE_REDUCERS
+        elif (
+            isinstance(func, ast.Attribute)
+            and isinstance(func.value, ast.Name) and func.value.id == "math"
+            and func.attr in _INLINE_MATH_FUNCS
+        ):
+            reducer = False
+        else:
+            return False
+        return all(
+            (reducer and _inline_range_ok(arg)) or _inline_num_ok(arg, allow_pow)
+            for arg in node.args
+        )
+    return False
+
+
+def _inline_stmt_ok(stmt: ast.stmt) -> bool:
+    if not isinstance(stmt, ast.Expr):
+        return False
+    value = stmt.value
+    if (
+        isinstance(value, ast.Call)
+        and isinstance(value.func, ast.Name) and value.func.id == "print"
+        and not value.keywords
+    ):
+        return all(_is_const(a, str) or _inline_num_ok(a) for a in value.args)
+    return _inline_num_ok(value)
+
+
+def _run_inline(code: str) -> Optional[str]:
+    """
+    Run a provably-cheap snippet in-process and return its printed output,
+    or None if the snippet doesn't qualify (or raised) and needs the subprocess.
+    """
+    if len(code) > _INLINE_MAX_LEN:
+        return None
+    try:
+        tree = ast.parse(code, mode="exec")
+    except SyntaxError:
+        return None
+    if not tree.body or not all(_inline_stmt_ok(stmt) for stmt in tree.body):
+        return None
+
+    lines: list[str] = []
+    namespace = {
+        "__builtins__": {},
+        **_INLINE_FUNCS,
+        "math": math,
+        "print": lambda *args: lines.append(" ".join(map(str, args))),
+    }
+    try:
+        exec(compile(tree, "<code_runner>", "exec"), namespace)
+    except Exception:
+        return None   # let the subprocess produce the real traceback
+    return "\n".join(lines)
+
+
 class CodeRunnerTool(BaseTool):
     """Execute Python snippets in a sandboxed subprocess."""
 
@@ -63,38 +349,48 @@ class CodeRunnerTool(BaseTool):
         }
 
     async def execute(self, code: str, **kwargs) -> ToolResult:
-        lowered = code.lower()
-        for token in _BLOCKED_TOKENS:
-            if token.lower() in lowered:
-                return ToolResult(
-                    success=False, output="",
-                    error=f"Blocked — forbidden operation: {token}",
-                )
+        token = _find_blocked_token(_ascii_lower(code))
+        if token:
+            return ToolResult(
+                success=False, output="",
+                error=f"Blocked — forbidden operation: {token}",
+            )
+
+        # Only indented pastes need dedenting; skip the line walk otherwise
+        if code[:1].isspace():
+            code = textwrap.dedent(code)
+        inline = _run_inline(code)
+        if inline is not None:
+            stdout = inline.strip()
+            return ToolResult(
+                success=True,
+                output=f"```\n{stdout or 'Code executed successfully (no output).'}\n```",
+                data={"stdout": stdout, "stderr": ""},
+            )
 
-        # Wrap so the subprocess has access to safe stdlib modules
-        wrapper = textwrap.dedent(f"""\
-import math, json, datetime, re, collections, itertools, functools, statistics, random, textwrap, string
-{textwrap.dedent(code)}
-""")
+        wrapper = _PRELUDE + code + "\n"
 
         try:
-            result = subprocess.run(
-                [sys.executable, "-c", wrapper],
-                capture_output=True,
-                text=True,
-                timeout=_TIMEOUT_SECONDS,
-                env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            # Waits up to _TIMEOUT_SECONDS - keep it off the shared event loop
+            returncode, stdout, stderr, overflowed = await asyncio.to_thread(
+                _run_capped,
+                [sys.executable, *_PYTHON_FLAGS, "-c", wrapper],
                 cwd=str(Path.cwd()),
             )
+            if overflowed:
+                return ToolResult(
+                    success=False, output="",
+                    error=f"Output exceeded {_MAX_OUTPUT_BYTES // 1024} KiB — process stopped.",
+                )
 
-            stdout = result.stdout.strip()
-            stderr = result.stderr.strip()
+            stdout = stdout.strip()
+            stderr = stderr.strip()
 
-            if result.returncode != 0:
+            if returncode != 0:
                 err_lines = stderr.splitlines()[-20:]
                 return ToolResult(
                     success=False, output="",
-                    error=f"Exit code {result.returncode}\n```\n" + "\n".join(err_lines) + "\n```",
+                    error=f"Exit code {returncode}\n```\n" + "\n".join(err_lines) + "\n```",
                 )
 
             output = stdout or "Code executed successfully (no output)."
@@ -1,37 +1,134 @@
 """Notes and todo list tool — persistent local note-taking.
 
 Handles: add note, list notes, search, delete, and simple todos.
-Data persisted to JSON in the data/ directory.
+Data persisted as an append-only JSON-Lines journal in the data/ directory.
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 from datetime import datetime
+from typing import Optional
 
-from core.agent.tools.base import BaseTool, ToolResult
+from core import fastjson
+from core.agent.tools.base import BaseTool, ToolResult, action
 from core.config import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
-_NOTES_FILE = DATA_DIR / "notes.json"
+_NOTES_FILE = DATA_DIR / "notes.jsonl"
+_LEGACY_FILE = DATA_DIR / "notes.json"    # pre-journal format, migrated on first load
+_COMPACT_FACTOR = 4                        # rewrite once the journal is 4x the live items
+_COMPACT_MIN_LINES = 64
+
+# In-memory state replayed from the journal, valid while the file's mtime matches
+_CACHE: Optional[dict] = None
+_cache_mtime = 0
+_journal_lines = 0
+
+
+def _empty() -> dict:
+    # Memory only - never written to the journal:
+    #   "_search": each note's lowercased text, index-aligned with "notes"
+    #   "_views":  rendered list outputs, dropped on every mutation
+    return {"notes": [], "todos": [], "_search": [], "_views": {}}
+
+
+def _apply(data: dict, rec: dict) -> None:
+    """Apply one journal record to the in-memory notes/todos."""
+    op = rec["op"]
+    data["_views"].clear()
+    if op == "add_note":
+        data["notes"].append(rec["note"])
+        data["_search"].append(rec["note"]["text"].lower())
+    elif op == "add_todo":
+        data["todos"].append(rec["todo"])
+    elif op == "delete_note":
+        data["notes"].pop(rec["index"])
+        data["_search"].pop(rec["index"])
+    elif op == "delete_todo":
+        data["todos"].pop(rec["index"])
+    elif op == "complete_todo":
+        data["todos"][rec["index"]]["done"] = True
+
+
+def _replay() -> dict:
+    """Rebuild state from the journal (or the legacy JSON file)."""
+    global _journal_lines
+    data = _empty()
+    _journal_lines = 0
+    if not _NOTES_FILE.exists():
+        if _LEGACY_FILE.exists():
+            try:
+                legacy = fastjson.loads(_LEGACY_FILE.read_bytes())
+                for note in legacy.get("notes", []):
+                    _apply(data, {"op": "add_note", "note": note})
+                data["todos"] = legacy.get("todos", [])
+                _save_notes(data)
+            except Exception as e:
+                logger.warning(f"Couldn't migrate {_LEGACY_FILE.name}: {e}")
+        return data
+    with open(_NOTES_FILE, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                _apply(data, fastjson.loads(line))
+            except (ValueError, KeyError, IndexError):
+                # A torn final line from a crash mid-append - skip it
+                logger.warning("Skipping bad notes journal line")
+                continue
+            _journal_lines += 1
+    return data
+
+
+def _mtime() -> int:
+    try:
+        return _NOTES_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
 
 
 def _load_notes() -> dict:
-    """Load notes from disk."""
-    if _NOTES_FILE.exists():
-        try:
-            return json.loads(_NOTES_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-    return {"notes": [], "todos": []}
+    """
+    Return the notes from memory, replaying the journal only on first use
+    or when the file was changed behind our back (mtime moved).
+    """
+    global _CACHE, _cache_mtime
+    if _CACHE is None or _mtime() != _cache_mtime:
+        _CACHE = _replay()
+        _cache_mtime = _mtime()
+    return _CACHE
 
 
 def _save_notes(data: dict) -> None:
-    """Save notes to disk."""
+    """Compact: rewrite the journal as one add record per live item."""
+    global _journal_lines, _cache_mtime
+    _NOTES_FILE.parent.mkdir(parents=True, exist_ok=True)
+    lines = [fastjson.dumps_bytes({"op": "add_note", "note": n}) for n in data["notes"]]
+    lines += [fastjson.dumps_bytes({"op": "add_todo", "todo": t}) for t in data["todos"]]
+    # Write-then-rename so a crash mid-compaction can't truncate the journal
+    tmp = _NOTES_FILE.with_suffix(_NOTES_FILE.suffix + ".tmp")
+    tmp.write_bytes(b"".join(line + b"\n" for line in lines))
+    os.replace(tmp, _NOTES_FILE)
+    _journal_lines = len(lines)
+    _cache_mtime = _mtime()
+
+
+def _commit(data: dict, rec: dict) -> None:
+    """Apply one mutation to data and persist it."""
+    global _journal_lines, _cache_mtime
+    _apply(data, rec)
+    live = len(data["notes"]) + len(data["todos"])
+    if _journal_lines + 1 > max(_COMPACT_MIN_LINES, _COMPACT_FACTOR * live):
+        _save_notes(data)
+        return
     _NOTES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _NOTES_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    with open(_NOTES_FILE, "ab") as f:
+        f.write(fastjson.dumps_bytes(rec) + b"\n")
+    _journal_lines += 1
+    _cache_mtime = _mtime()
 
 
 class NotesTool(BaseTool):
@@ -47,9 +144,9 @@ class NotesTool(BaseTool):
             "Manage the user's personal notes and todo list. "
             "Can add notes, list all notes, search notes, delete notes, "
             "add todos, mark todos as done, and list todos. "
-            "Examples: 'Add a note: buy groceries tomorrow', "
-            "'Show my notes', 'Add to my todo list: finish homework', "
-            "'Mark todo 1 as done'."
+            "Examples: 'Add a note: buy groceries' -> add_note/buy groceries; "
+            "'Show my notes' -> list_notes; 'Add todo: finish homework' -> "
+            "add_todo/finish homework; 'Mark todo 1 as done' -> complete_todo/1."
         )
 
     @property
@@ -82,62 +179,53 @@ class NotesTool(BaseTool):
     ) -> ToolResult:
         # LLM sometimes sends 'target' instead of 'text'
         text = text or target
-        data = _load_notes()
-
-        if action == "add_note":
-            return self._add_note(data, text)
-        elif action == "list_notes":
-            return self._list_notes(data)
-        elif action == "search_notes":
-            return self._search_notes(data, text)
-        elif action == "delete_note":
-            return self._delete_note(data, index)
-        elif action == "add_todo":
-            return self._add_todo(data, text)
-        elif action == "list_todos":
-            return self._list_todos(data)
-        elif action == "complete_todo":
-            return self._complete_todo(data, index)
-        elif action == "delete_todo":
-            return self._delete_todo(data, index)
-        return ToolResult(success=False, output="", error=f"Unknown action: {action}")
-
-    def _add_note(self, data: dict, text: str) -> ToolResult:
+        handler = self._actions.get(action)
+        if handler is None:
+            return ToolResult(success=False, output="", error=f"Unknown action: {action}")
+        return handler(self, _load_notes(), text, index)
+
+    @action("add_note")
+    def _add_note(self, data: dict, text: str, index: int) -> ToolResult:
         if not text:
             return ToolResult(success=False, output="", error="No note text provided.")
         note = {
             "text": text,
             "created": datetime.now().isoformat(),
         }
-        data.setdefault("notes", []).append(note)
-        _save_notes(data)
+        _commit(data, {"op": "add_note", "note": note})
         count = len(data["notes"])
         return ToolResult(success=True, output=f"📝 Note added (#{count}): **{text}**")
 
-    def _list_notes(self, data: dict) -> ToolResult:
-        notes = data.get("notes", [])
+    @action("list_notes")
+    def _list_notes(self, data: dict, text: str, index: int) -> ToolResult:
+        notes = data["notes"]
         if not notes:
             return ToolResult(success=True, output="No notes yet. Say 'add a note' to create one.")
-        lines = []
-        for i, n in enumerate(notes, 1):
-            dt = n.get("created", "")[:10]
-            lines.append(f"**{i}.** {n['text']}  *({dt})*")
-        return ToolResult(success=True, output="📝 Your notes:\n" + "\n".join(lines))
+        output = data["_views"].get("notes")
+        if output is None:
+            output = data["_views"]["notes"] = "📝 Your notes:\n" + "\n".join(
+                f"**{i}.** {n['text']}  *({n.get('created', '')[:10]})*"
+                for i, n in enumerate(notes, 1)
+            )
+        return ToolResult(success=True, output=output)
 
-    def _search_notes(self, data: dict, query: str) -> ToolResult:
+    @action("search_notes")
+    def _search_notes(self, data: dict, query: str, index: int) -> ToolResult:
         if not query:
             return ToolResult(success=False, output="", error="No search query.")
-        notes = data.get("notes", [])
+        notes = data["notes"]
+        q = query.lower()
         matches = [
-            (i, n) for i, n in enumerate(notes, 1)
-            if query.lower() in n["text"].lower()
+            (i, notes[i - 1]) for i, lowered in enumerate(data["_search"], 1)
+            if q in lowered
         ]
         if not matches:
             return ToolResult(success=True, output=f"No notes matching '{query}'.")
         lines = [f"**{i}.** {n['text']}" for i, n in matches]
         return ToolResult(success=True, output=f"Found {len(matches)} note(s):\n" + "\n".join(lines))
 
-    def _delete_note(self, data: dict, index: int) -> ToolResult:
+    @action("delete_note")
+    def _delete_note(self, data: dict, text: str, index: int) -> ToolResult:
         notes = data.get("notes", [])
         if not notes:
             return ToolResult(success=True, output="No notes to delete.")
@@ -147,11 +235,12 @@ class NotesTool(BaseTool):
                 success=False, output="",
                 error=f"Invalid note number. You have {len(notes)} notes (1-{len(notes)}).",
             )
-        removed = notes.pop(idx)
-        _save_notes(data)
+        removed = notes[idx]
+        _commit(data, {"op": "delete_note", "index": idx})
         return ToolResult(success=True, output=f"Deleted note: **{removed['text']}**")
 
-    def _add_todo(self, data: dict, text: str) -> ToolResult:
+    @action("add_todo")
+    def _add_todo(self, data: dict, text: str, index: int) -> ToolResult:
         if not text:
             return ToolResult(success=False, output="", error="No todo text provided.")
         todo = {
@@ -159,22 +248,25 @@ class NotesTool(BaseTool):
             "done": False,
             "created": datetime.now().isoformat(),
         }
-        data.setdefault("todos", []).append(todo)
-        _save_notes(data)
+        _commit(data, {"op": "add_todo", "todo": todo})
         count = len(data["todos"])
         return ToolResult(success=True, output=f"✅ Todo added (#{count}): **{text}**")
 
-    def _list_todos(self, data: dict) -> ToolResult:
-        todos = data.get("todos", [])
+    @action("list_todos")
+    def _list_todos(self, data: dict, text: str, index: int) -> ToolResult:
+        todos = data["todos"]
         if not todos:
             return ToolResult(success=True, output="No todos. Say 'add a todo' to start your list.")
-        lines = []
-        for i, t in enumerate(todos, 1):
-            check = "✅" if t.get("done") else "⬜"
-            lines.append(f"{check} **{i}.** {t['text']}")
-        return ToolResult(success=True, output="Your todo list:\n" + "\n".join(lines))
+        output = data["_views"].get("todos")
+        if output is None:
+            output = data["_views"]["todos"] = "Your todo list:\n" + "\n".join(
+                f"{'✅' if t.get('done') else '⬜'} **{i}.** {t['text']}"
+                for i, t in enumerate(todos, 1)
+            )
+        return ToolResult(success=True, output=output)
 
-    def _complete_todo(self, data: dict, index: int) -> ToolResult:
+    @action("complete_todo")
+    def _complete_todo(self, data: dict, text: str, index: int) -> ToolResult:
         todos = data.get("todos", [])
         idx = index - 1
         if idx < 0 or idx >= len(todos):
@@ -182,11 +274,11 @@ class NotesTool(BaseTool):
                 success=False, output="",
                 error=f"Invalid todo number. You have {len(todos)} todos.",
             )
-        todos[idx]["done"] = True
-        _save_notes(data)
+        _commit(data, {"op": "complete_todo", "index": idx})
         return ToolResult(success=True, output=f"✅ Completed: **{todos[idx]['text']}**")
 
-    def _delete_todo(self, data: dict, index: int) -> ToolResult:
+    @action("delete_todo")
+    def _delete_todo(self, data: dict, text: str, index: int) -> ToolResult:
         todos = data.get("todos", [])
         idx = index - 1
         if idx < 0 or idx >= len(todos):
@@ -194,6 +286,7 @@ class NotesTool(BaseTool):
                 success=False, output="",
                 error=f"Invalid todo number. You have {len(todos)} todos.",
             )
-        removed = todos.pop(idx)
-        _save_notes(data)
+        removed = todos[idx]
+        _commit(data, {"op": "delete_todo", "index": idx})
         return ToolResult(success=True, output=f"Deleted todo: **{removed['text']}**")
+
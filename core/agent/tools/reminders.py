@@ -6,22 +6,82 @@ and recurring daily reminders.
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
 import logging
+import os
+import re
+import subprocess
 import threading
 import time
 from datetime import datetime, timedelta
 from typing import Optional
 
-from core.agent.tools.base import BaseTool, ToolResult
+from core import fastjson
+from core.agent.tools.base import BaseTool, ToolResult, action
 from core.config import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
-_REMINDERS_FILE = DATA_DIR / "reminders.json"
+_REMINDERS_FILE = DATA_DIR / "reminders.jsonl"   # append-only set/fire/cancel journal
+_LEGACY_FILE = DATA_DIR / "reminders.json"       # pre-journal snapshot, migrated on load
+_COMPACT_FACTOR = 4
+_COMPACT_MIN_LINES = 64
 _active_reminders: dict[str, dict] = {}
 _reminder_lock = threading.Lock()
 
+# One scheduler thread drives a min-heap of (fire_at, rid). Cancelling just
+# drops the rid from _active_reminders; the stale heap entry is skipped on pop.
+_reminder_heap: list[tuple[float, str]] = []
+_reminder_cv = threading.Condition(_reminder_lock)
+_scheduler: Optional[threading.Thread] = None
+_MAX_WAIT = 60.0   # re-check the wall clock at least this often (sleep/clock changes)
+
+_journal_lock = threading.Lock()
+_journal_lines = 0
+
+# rem_1, rem_2, ... - reseeded past any persisted ids when reminders load
+_rid_counter = itertools.count(1)
+
+# Relative ("in 5 minutes") or absolute ("at 3:00 pm") in one scan; at any
+# given position the relative branch is tried first.
+_RE_WHEN = re.compile(
+    r'in\s+(?P<n>\d+)\s*(?P<unit>seconds?|secs?|s|minutes?|mins?|m|hours?|hrs?|h)'
+    r'|(?:at\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?'
+)
+
+_POWERSHELL = ("powershell", "-NoProfile", "-NonInteractive", "-Command")
+
+# Fallback notifier: one long-lived PowerShell host that owns a NotifyIcon and
+# reads {"t": title, "m": message} JSON lines from stdin. Passing the text as
+# data (never as script) means quotes in a reminder can't break or inject.
+_PS_NOTIFIER_SCRIPT = "; ".join((
+    "Add-Type -AssemblyName System.Windows.Forms, System.Drawing",
+    "$n = New-Object System.Windows.Forms.NotifyIcon",
+    "$n.Icon = [System.Drawing.SystemIcons]::Information",
+    "$n.Visible = $true",
+    "while (($line = [Console]::In.ReadLine()) -ne $null) {"
+    " $msg = $line | ConvertFrom-Json;"
+    " $n.ShowBalloonTip(5000, $msg.t, $msg.m, 'Info') }",
+    "$n.Dispose()",
+))
+_ps_notifier: Optional[subprocess.Popen] = None
+_ps_notifier_lock = threading.Lock()
+
+
+def _notify_powershell(title: str, message: str) -> None:
+    global _ps_notifier
+    with _ps_notifier_lock:
+        if _ps_notifier is None or _ps_notifier.poll() is not None:
+            _ps_notifier = subprocess.Popen(
+                [*_POWERSHELL, _PS_NOTIFIER_SCRIPT],
+                stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        _ps_notifier.stdin.write(json.dumps({"t": title, "m": message}) + "\n")
+        _ps_notifier.stdin.flush()
+
 
 def _notify(title: str, message: str) -> None:
     """Show a Windows notification."""
@@ -35,64 +95,123 @@ def _notify(title: str, message: str) -> None:
     except Exception:
         pass
     try:
-        import subprocess
-        ps = (
-            "Add-Type -AssemblyName System.Windows.Forms;"
-            "$n = New-Object System.Windows.Forms.NotifyIcon;"
-            "$n.Icon = [System.Drawing.SystemIcons]::Information;"
-            "$n.Visible = $true;"
-            f"$n.ShowBalloonTip(5000, '{title}', '{message}', 'Info');"
-            "Start-Sleep -Seconds 6; $n.Dispose()"
-        )
-        subprocess.Popen(["powershell", "-c", ps], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _notify_powershell(title, message)
     except Exception:
         logger.warning(f"Notification failed: {title}")
 
 
-def _reminder_thread(rid: str, seconds: float, text: str) -> None:
-    """Sleep then fire notification."""
-    time.sleep(max(0, seconds))
-    with _reminder_lock:
-        _active_reminders.pop(rid, None)
-    _notify("📌 Reminder", text)
-    logger.info(f"Reminder fired: {text}")
-    _save_reminders()
+def _scheduler_loop() -> None:
+    """Wait for the earliest reminder, fire it, repeat."""
+    while True:
+        with _reminder_cv:
+            while True:
+                if not _reminder_heap:
+                    _reminder_cv.wait()
+                    continue
+                fire_at, rid = _reminder_heap[0]
+                delay = fire_at - time.time()
+                if delay > 0:
+                    _reminder_cv.wait(min(delay, _MAX_WAIT))
+                    continue
+                heapq.heappop(_reminder_heap)
+                info = _active_reminders.pop(rid, None)
+                if info is not None:
+                    break
+        _notify("📌 Reminder", info["text"])
+        logger.info(f"Reminder fired: {info['text']}")
+        _log({"op": "fire", "rid": rid})
+
+
+def _schedule(rid: str, info: dict) -> None:
+    """Register a reminder and wake the scheduler (starting it on first use)."""
+    global _scheduler
+    with _reminder_cv:
+        _active_reminders[rid] = info
+        heapq.heappush(_reminder_heap, (info["fire_at"], rid))
+        if _scheduler is None:
+            _scheduler = threading.Thread(
+                target=_scheduler_loop, name="reminders", daemon=True,
+            )
+            _scheduler.start()
+        _reminder_cv.notify()
 
 
 def _save_reminders() -> None:
-    """Persist active reminders to disk."""
+    """Compact the journal down to one set record per active reminder."""
+    global _journal_lines
     try:
         _REMINDERS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        data = {}
         with _reminder_lock:
-            for rid, info in _active_reminders.items():
-                data[rid] = {
-                    "text": info["text"],
-                    "fire_at": info["fire_at"],
-                }
-        _REMINDERS_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            recs = [
+                {"op": "set", "rid": rid, "text": info["text"], "fire_at": info["fire_at"]}
+                for rid, info in _active_reminders.items()
+            ]
+        with _journal_lock:
+            # Write-then-rename so a crash mid-compaction can't truncate the journal
+            tmp = _REMINDERS_FILE.with_suffix(_REMINDERS_FILE.suffix + ".tmp")
+            tmp.write_bytes(b"".join(fastjson.dumps_bytes(rec) + b"\n" for rec in recs))
+            os.replace(tmp, _REMINDERS_FILE)
+            _journal_lines = len(recs)
     except Exception as e:
         logger.error(f"Failed to save reminders: {e}")
 
 
-def _load_reminders() -> None:
-    """Load persisted reminders and reschedule unexpired ones."""
+def _log(*recs: dict) -> None:
+    """Append mutation records to the journal, compacting when it gets long."""
+    global _journal_lines
+    with _reminder_lock:
+        live = len(_active_reminders)
+    if _journal_lines + len(recs) > max(_COMPACT_MIN_LINES, _COMPACT_FACTOR * live):
+        _save_reminders()
+        return
+    try:
+        _REMINDERS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with _journal_lock:
+            with open(_REMINDERS_FILE, "ab") as f:
+                f.write(b"".join(fastjson.dumps_bytes(rec) + b"\n" for rec in recs))
+            _journal_lines += len(recs)
+    except Exception as e:
+        logger.error(f"Failed to save reminders: {e}")
+
+
+def _replay() -> dict[str, dict]:
+    """Rebuild pending reminders from the journal (or the legacy JSON file)."""
     if not _REMINDERS_FILE.exists():
+        if _LEGACY_FILE.exists():
+            return fastjson.loads(_LEGACY_FILE.read_bytes())
+        return {}
+    pending: dict[str, dict] = {}
+    with open(_REMINDERS_FILE, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rec = fastjson.loads(line)
+                if rec["op"] == "set":
+                    pending[rec["rid"]] = {"text": rec["text"], "fire_at": rec["fire_at"]}
+                else:   # fire / cancel
+                    pending.pop(rec["rid"], None)
+            except (ValueError, KeyError):
+                logger.warning("Skipping bad reminders journal line")
+    return pending
+
+
+def _load_reminders() -> None:
+    """Load persisted reminders, reschedule unexpired ones, and compact the journal."""
+    global _rid_counter
+    if not _REMINDERS_FILE.exists() and not _LEGACY_FILE.exists():
         return
     try:
-        data = json.loads(_REMINDERS_FILE.read_text(encoding="utf-8"))
         now = time.time()
-        for rid, info in data.items():
-            fire_at = info["fire_at"]
-            if fire_at > now:
-                remaining = fire_at - now
-                with _reminder_lock:
-                    _active_reminders[rid] = info
-                threading.Thread(
-                    target=_reminder_thread,
-                    args=(rid, remaining, info["text"]),
-                    daemon=True,
-                ).start()
+        last = 0
+        for rid, info in _replay().items():
+            if info["fire_at"] > now:
+                _schedule(rid, info)
+            suffix = rid.rpartition("_")[2]
+            if rid.count("_") == 1 and suffix.isdigit():
+                last = max(last, int(suffix))
+        _rid_counter = itertools.count(last + 1)
+        _save_reminders()
     except Exception as e:
         logger.error(f"Failed to load reminders: {e}")
 
@@ -109,15 +228,17 @@ def _parse_reminder_time(text: str) -> Optional[float]:
     - 'at 3:00 PM', 'at 14:30', 'at 7 AM'
     - 'tomorrow at 9 AM'
     """
-    import re
     text_lower = text.lower().strip()
     now = datetime.now()
 
+    m = _RE_WHEN.search(text_lower)
+    if m is None:
+        return None
+
     # Relative: "in X minutes/hours/seconds"
-    m = re.search(r'in\s+(\d+)\s*(seconds?|secs?|s|minutes?|mins?|m|hours?|hrs?|h)', text_lower)
-    if m:
-        val = int(m.group(1))
-        unit = m.group(2)[0]
+    if m.group("n"):
+        val = int(m.group("n"))
+        unit = m.group("unit")[0]
         if unit == 's':
             delta = timedelta(seconds=val)
         elif unit == 'm':
@@ -130,23 +251,19 @@ def _parse_reminder_time(text: str) -> Optional[float]:
     add_day = "tomorrow" in text_lower
 
     # Absolute: "at 3:00 PM" or "3 PM"
-    time_pattern = re.search(r'(?:at\s+)?(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', text_lower)
-    if time_pattern:
-        hour = int(time_pattern.group(1))
-        minute = int(time_pattern.group(2) or 0)
-        ampm = time_pattern.group(3)
-        if ampm == "pm" and hour < 12:
-            hour += 12
-        elif ampm == "am" and hour == 12:
-            hour = 0
-        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if add_day:
-            target += timedelta(days=1)
-        elif target <= now:
-            target += timedelta(days=1)
-        return target.timestamp()
-
-    return None
+    hour = int(m.group("hour"))
+    minute = int(m.group("minute") or 0)
+    ampm = m.group("ampm")
+    if ampm == "pm" and hour < 12:
+        hour += 12
+    elif ampm == "am" and hour == 12:
+        hour = 0
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if add_day:
+        target += timedelta(days=1)
+    elif target <= now:
+        target += timedelta(days=1)
+    return target.timestamp()
 
 
 class RemindersTool(BaseTool):
@@ -160,9 +277,10 @@ class RemindersTool(BaseTool):
     def description(self) -> str:
         return (
             "Set reminders that pop up as desktop notifications. "
-            "Supports: 'Remind me to call Mom in 30 minutes', "
-            "'Remind me at 3 PM to take medicine', 'List my reminders', "
-            "'Cancel reminder about X'."
+            "Examples: 'Remind me to call Mom in 30 minutes' -> "
+            "set_reminder/call Mom in 30 minutes; 'Remind me at 3 PM to take "
+            "medicine' -> set_reminder; 'List my reminders' -> list_reminders; "
+            "'Cancel reminder about X' -> cancel_reminder/X."
         )
 
     @property
@@ -191,14 +309,12 @@ class RemindersTool(BaseTool):
         }
 
     async def execute(self, action: str, text: str = "", when: str = "", **kw) -> ToolResult:
-        if action == "set_reminder":
-            return self._set(text, when)
-        elif action == "list_reminders":
-            return self._list()
-        elif action == "cancel_reminder":
-            return self._cancel(text)
-        return ToolResult(success=False, output="", error=f"Unknown action: {action}")
+        handler = self._actions.get(action)
+        if handler is None:
+            return ToolResult(success=False, output="", error=f"Unknown action: {action}")
+        return handler(self, text, when)
 
+    @action("set_reminder")
     def _set(self, text: str, when: str) -> ToolResult:
         if not text:
             return ToolResult(success=False, output="", error="No reminder text.")
@@ -212,19 +328,13 @@ class RemindersTool(BaseTool):
                 error=f"Could not parse time: '{when}'. Try 'in 5 minutes' or 'at 3 PM'.",
             )
 
-        rid = f"rem_{int(time.time())}_{hash(text) % 10000}"
+        rid = f"rem_{next(_rid_counter)}"
         remaining = fire_at - time.time()
         if remaining <= 0:
             return ToolResult(success=False, output="", error="That time is in the past.")
 
-        info = {"text": text, "fire_at": fire_at}
-        with _reminder_lock:
-            _active_reminders[rid] = info
-
-        threading.Thread(
-            target=_reminder_thread, args=(rid, remaining, text), daemon=True,
-        ).start()
-        _save_reminders()
+        _schedule(rid, {"text": text, "fire_at": fire_at})
+        _log({"op": "set", "rid": rid, "text": text, "fire_at": fire_at})
 
         fire_dt = datetime.fromtimestamp(fire_at)
         return ToolResult(
@@ -232,7 +342,8 @@ class RemindersTool(BaseTool):
             output=f"📌 Reminder set: **{text}** at {fire_dt:%I:%M %p}",
         )
 
-    def _list(self) -> ToolResult:
+    @action("list_reminders")
+    def _list(self, text: str, when: str) -> ToolResult:
         with _reminder_lock:
             if not _active_reminders:
                 return ToolResult(success=True, output="No active reminders.")
@@ -246,7 +357,8 @@ class RemindersTool(BaseTool):
                 )
         return ToolResult(success=True, output="Active reminders:\n" + "\n".join(lines))
 
-    def _cancel(self, text: str) -> ToolResult:
+    @action("cancel_reminder")
+    def _cancel(self, text: str, when: str) -> ToolResult:
         with _reminder_lock:
             if not _active_reminders:
                 return ToolResult(success=True, output="No reminders to cancel.")
@@ -260,5 +372,6 @@ class RemindersTool(BaseTool):
             for k in to_remove:
                 del _active_reminders[k]
         count = len(to_remove)
-        _save_reminders()
+        if to_remove:
+            _log(*({"op": "cancel", "rid": k} for k in to_remove))
         return ToolResult(success=True, output=f"Cancelled {count} reminder(s)")
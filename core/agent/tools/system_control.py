@@ -8,18 +8,71 @@ Every operation a desktop voice assistant could ever need.
 
 from __future__ import annotations
 
+import asyncio
+import ctypes
+import errno
+import functools
+import heapq
 import logging
 import os
 import platform
+import re
 import shutil
+import stat
 import subprocess
+import threading
+import time
 import webbrowser
+import zipfile
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+from urllib.parse import quote_plus
 
-from core.agent.tools.base import BaseTool, ToolResult
+from core.agent.tools.base import BaseTool, ToolResult, action
 from core.config import TEMP_DIR
 
+try:
+    import winreg
+except ImportError:  # not on Windows
+    winreg = None
+
+try:
+    import marisa_trie  # optional compact trie for the name lookups below
+except ImportError:
+    marisa_trie = None
+
+# Optional desktop backends, resolved once here rather than on every call.
+# None means "not installed" and each action falls back accordingly.
+try:
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+except (ImportError, OSError):
+    AudioUtilities = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import screen_brightness_control as sbc
+except ImportError:
+    sbc = None
+
+try:
+    import mss
+    import mss.tools
+except ImportError:
+    mss = None
+
+try:
+    import pyautogui
+except Exception:  # also raises when there's no display to attach to
+    pyautogui = None
+
 logger = logging.getLogger(__name__)
 
 # ── App name → executable mapping (case-insensitive) ──
@@ -180,6 +233,676 @@ SETTINGS_MAP = {
 }
 
 
+_KEYEVENTF_KEYUP = 0x0002
+_VK_LWIN = 0x5B
+_VK_M = 0x4D
+_VOLUME_KEYS = {"up": 0xAF, "down": 0xAE, "mute": 0xAD}
+_MEDIA_KEYS = {"play_pause": 0xB3, "next": 0xB0, "previous": 0xB1}
+_MEDIA_LABELS = {"play_pause": "Play/Pause ⏯️", "next": "Next Track ⏭️", "previous": "Previous Track ⏮️"}
+
+
+# CreateProcess flags for launched apps (numeric: subprocess only defines
+# them on Windows). GUI apps are detached from our console entirely;
+# console apps need a window of their own or they'd start invisible.
+_DETACHED_PROCESS = 0x00000008
+_CREATE_NEW_CONSOLE = 0x00000010
+_CREATE_NEW_PROCESS_GROUP = 0x00000200
+_CONSOLE_APPS = frozenset({"cmd.exe", "powershell.exe", "wsl.exe"})
+
+
+def _launch_flags(executable: str) -> int:
+    if executable.lower() in _CONSOLE_APPS:
+        return _CREATE_NEW_CONSOLE | _CREATE_NEW_PROCESS_GROUP
+    return _DETACHED_PROCESS | _CREATE_NEW_PROCESS_GROUP
+
+
+# Skip $PROFILE (can take seconds to load) and never wait on a prompt
+_POWERSHELL = ("powershell", "-NoProfile", "-NonInteractive", "-Command")
+
+
+async def _run(args: list[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run on a worker thread, so a slow netsh/PowerShell call doesn't stall the event loop."""
+    return await asyncio.to_thread(subprocess.run, args, **kwargs)
+
+
+class _PowerShellHost:
+    """
+    One long-lived PowerShell reading one-line scripts from stdin, so
+    repeated WMI calls (brightness) skip the PowerShell start-up each time.
+    Each script is followed by a numbered end marker; output up to the
+    marker is the result. A script that overruns its timeout kills the
+    host, and the next call starts a fresh one.
+    """
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def run(self, script: str, timeout: float = 10) -> str:
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = subprocess.Popen(
+                    [*_POWERSHELL, "-"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                    text=True,
+                )
+            proc = self._proc
+            self._seq += 1
+            marker = f"__holex_end_{self._seq}__"
+            watchdog = threading.Timer(timeout, proc.kill)
+            watchdog.start()
+            try:
+                proc.stdin.write(f"{script}\nWrite-Output '{marker}'\n")
+                proc.stdin.flush()
+                out = []
+                for line in iter(proc.stdout.readline, ""):
+                    if line.rstrip("\r\n") == marker:
+                        return "".join(out)
+                    out.append(line)
+            except OSError:
+                pass
+            finally:
+                watchdog.cancel()
+            self._proc = None
+            raise TimeoutError(f"PowerShell host exited or took longer than {timeout}s")
+
+
+_ps_host = _PowerShellHost()
+
+
+def _shell_execute(target: str) -> None:
+    """Open target the way Explorer would (App Paths, file associations), without cmd.exe."""
+    rc = ctypes.windll.shell32.ShellExecuteW(None, "open", target, None, None, 1)
+    if rc <= 32:    # values up to 32 are error codes
+        raise OSError(f"ShellExecute failed for {target!r} (code {rc})")
+
+
+# copy_file_range can't handle this pair of files (cross-device on older
+# kernels, unsupported filesystem) - fall back to copy2
+_NO_COPY_RANGE = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+def _copy_file_range(src: str, dst: str) -> None:
+    """Copy contents with os.copy_file_range: in-kernel, and a reflink on btrfs/XFS."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        while os.copy_file_range(fin.fileno(), fout.fileno(), 1 << 30):
+            pass
+    shutil.copystat(src, dst)
+
+
+def _copy_file(src: str, dst: str) -> str:
+    """
+    copy2-compatible file copy. On Windows this is CopyFileExW, which copies
+    in the kernel (keeping attributes and timestamps) instead of pumping
+    buffers through Python. On Linux (and WSL) copy_file_range is tried
+    first, which can share extents instead of copying; shutil.copy2 and its
+    sendfile path cover everything else.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    if not hasattr(ctypes, "windll"):
+        if hasattr(os, "copy_file_range") and os.path.isfile(src):
+            try:
+                _copy_file_range(src, dst)
+                return dst
+            except OSError as e:
+                if e.errno not in _NO_COPY_RANGE:
+                    raise
+        return shutil.copy2(src, dst)
+    if not ctypes.windll.kernel32.CopyFileExW(src, dst, None, None, None, 0):
+        raise ctypes.WinError()
+    return dst
+
+
+_CF_UNICODETEXT = 13
+_GMEM_MOVEABLE = 0x0002
+
+
+@functools.lru_cache(maxsize=None)
+def _clipboard_api() -> tuple:
+    """
+    Private user32/kernel32 handles with the clipboard prototypes declared
+    once. Own WinDLL instances keep these argtypes off the shared
+    ctypes.windll function objects other code calls.
+    """
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    # HGLOBALs, HWNDs and pointers are 64-bit; the default int return would truncate them
+    kernel32.GlobalAlloc.restype = ctypes.c_void_p
+    kernel32.GlobalAlloc.argtypes = [ctypes.c_uint, ctypes.c_size_t]
+    kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalLock.argtypes = [ctypes.c_void_p]
+    kernel32.GlobalUnlock.argtypes = [ctypes.c_void_p]
+    kernel32.GlobalFree.argtypes = [ctypes.c_void_p]
+    user32.CreateWindowExW.restype = ctypes.c_void_p
+    user32.CreateWindowExW.argtypes = [
+        ctypes.c_uint, ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_uint,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+    ]
+    user32.DestroyWindow.argtypes = [ctypes.c_void_p]
+    user32.OpenClipboard.argtypes = [ctypes.c_void_p]
+    user32.SetClipboardData.restype = ctypes.c_void_p
+    user32.SetClipboardData.argtypes = [ctypes.c_uint, ctypes.c_void_p]
+    return user32, kernel32
+
+
+def _clipboard_set_win32(text: str) -> None:
+    """Put text on the clipboard as CF_UNICODETEXT with user32/kernel32 calls."""
+    user32, kernel32 = _clipboard_api()
+    data = text.encode("utf-16-le") + b"\0\0"
+    # EmptyClipboard hands ownership to the window that opened it; with a
+    # NULL owner SetClipboardData fails, so open it with a hidden window
+    hwnd = user32.CreateWindowExW(0, "STATIC", None, 0, 0, 0, 0, 0, None, None, None, None)
+    if not hwnd:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        # Another app may hold the clipboard for a moment - retry briefly
+        for _ in range(10):
+            if user32.OpenClipboard(hwnd):
+                break
+            time.sleep(0.02)
+        else:
+            raise OSError("clipboard is busy")
+        try:
+            user32.EmptyClipboard()
+            handle = kernel32.GlobalAlloc(_GMEM_MOVEABLE, len(data))
+            if not handle:
+                raise MemoryError("GlobalAlloc failed")
+            ptr = kernel32.GlobalLock(handle)
+            ctypes.memmove(ptr, data, len(data))
+            kernel32.GlobalUnlock(handle)
+            if not user32.SetClipboardData(_CF_UNICODETEXT, handle):
+                kernel32.GlobalFree(handle)    # ownership only passes on success
+                raise ctypes.WinError(ctypes.get_last_error())
+        finally:
+            user32.CloseClipboard()
+    finally:
+        user32.DestroyWindow(hwnd)
+
+
+_SW_RESTORE = 9
+_VK_MENU = 0x12
+
+
+def _activate_window(title: str) -> Optional[str]:
+    """
+    Bring the top-level window whose title best matches to the front:
+    an exact title beats one that starts with it, which beats one that
+    merely contains it (case-insensitive). Returns the window's full
+    title, or None if nothing matched.
+    """
+    user32 = ctypes.windll.user32
+    wanted = title.strip().lower()
+    best: list[tuple[int, int, str]] = []     # (rank, hwnd, title)
+
+    def visit(hwnd, _lparam):
+        if user32.IsWindowVisible(hwnd):
+            n = user32.GetWindowTextLengthW(hwnd)
+            if n:
+                buf = ctypes.create_unicode_buffer(n + 1)
+                user32.GetWindowTextW(hwnd, buf, n + 1)
+                text = buf.value
+                lowered = text.lower()
+                if wanted in lowered:
+                    rank = 0 if lowered == wanted else 1 if lowered.startswith(wanted) else 2
+                    if not best or rank < best[0][0]:
+                        best[:] = [(rank, hwnd, text)]
+        return True
+
+    # Windows are visited in z-order, so ties go to the most recently used one
+    enum_proc = getattr(ctypes, "WINFUNCTYPE", ctypes.CFUNCTYPE)(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+    user32.EnumWindows(enum_proc(visit), 0)
+    if not best:
+        return None
+    _, hwnd, text = best[0]
+    if user32.IsIconic(hwnd):
+        user32.ShowWindow(hwnd, _SW_RESTORE)
+    # A background process may only take the foreground right after input;
+    # a bare Alt tap satisfies that rule
+    _press_keys(_VK_MENU)
+    user32.SetForegroundWindow(hwnd)
+    return text
+
+
+# System CPU % is sampled by a daemon thread once a second, so system_info
+# can report it without blocking on its own measuring window
+_CPU_TICK = 1.0
+_cpu_pct = 0.0
+_cpu_ready = threading.Event()
+_cpu_sampler: Optional[threading.Thread] = None
+_cpu_sampler_lock = threading.Lock()
+
+
+def _cpu_sampler_loop() -> None:
+    global _cpu_pct
+    _cpu_pct = psutil.cpu_percent(interval=0.5)
+    _cpu_ready.set()
+    while True:
+        time.sleep(_CPU_TICK)
+        _cpu_pct = psutil.cpu_percent(interval=None)
+
+
+def _cpu_percent() -> float:
+    """Latest system CPU %; only the very first call waits for a sample."""
+    global _cpu_sampler
+    with _cpu_sampler_lock:
+        if _cpu_sampler is None:
+            _cpu_sampler = threading.Thread(target=_cpu_sampler_loop, name="cpu-sampler", daemon=True)
+            _cpu_sampler.start()
+    _cpu_ready.wait()
+    return _cpu_pct
+
+
+def _host_stats() -> tuple:
+    """(cpu %, memory, disk, physical cores, logical cores, boot time) in one worker-thread hop."""
+    return (
+        _cpu_percent(), psutil.virtual_memory(), psutil.disk_usage("/"),
+        psutil.cpu_count(logical=False), psutil.cpu_count(), psutil.boot_time(),
+    )
+
+
+def _top_processes_by_memory(n: int) -> list[dict]:
+    """
+    The n processes using the most memory, as psutil info dicts.
+    process_iter(attrs) already reads each process in one oneshot() pass;
+    nlargest keeps only n of them instead of sorting the whole table.
+    """
+    return heapq.nlargest(
+        n,
+        (p.info for p in psutil.process_iter(["pid", "name", "memory_percent"])),
+        key=lambda info: info.get("memory_percent") or 0,
+    )
+
+
+def _sbc_step(delta: int) -> int:
+    """Move the primary display's brightness by delta via screen_brightness_control; return the new level."""
+    new_val = max(0, min(100, sbc.get_brightness(display=0)[0] + delta))
+    sbc.set_brightness(new_val, display=0)
+    return new_val
+
+
+def _terminate_by_name(image: str) -> int:
+    """Terminate every process whose image name matches (case-insensitive); return how many."""
+    image = image.lower()
+    procs = [
+        p for p in psutil.process_iter(["name"])
+        if (p.info["name"] or "").lower() == image
+    ]
+    for p in procs:
+        try:
+            p.terminate()
+        except psutil.Error:
+            pass
+    psutil.wait_procs(procs, timeout=2)
+    return len(procs)
+
+
+_SHERB_NOCONFIRMATION = 0x1
+_SHERB_NOPROGRESSUI = 0x2
+_SHERB_NOSOUND = 0x4
+_E_UNEXPECTED = 0x8000FFFF
+
+_FO_DELETE = 0x0003
+_FOF_SILENT = 0x0004
+_FOF_NOCONFIRMATION = 0x0010
+_FOF_ALLOWUNDO = 0x0040
+_FOF_NOERRORUI = 0x0400
+
+
+class _SHFILEOPSTRUCTW(ctypes.Structure):
+    if ctypes.sizeof(ctypes.c_void_p) == 4:
+        _pack_ = 1      # shellapi.h packs this struct on 32-bit Windows only
+    _fields_ = [("hwnd", ctypes.c_void_p), ("wFunc", ctypes.c_uint32), ("pFrom", ctypes.c_wchar_p),
+                ("pTo", ctypes.c_wchar_p), ("fFlags", ctypes.c_uint16), ("fAnyOperationsAborted", ctypes.c_int32),
+                ("hNameMappings", ctypes.c_void_p), ("lpszProgressTitle", ctypes.c_wchar_p)]
+
+
+def _recycle(path: str) -> None:
+    """Move a file or folder to the Recycle Bin with SHFileOperationW, silently."""
+    op = _SHFILEOPSTRUCTW(
+        wFunc=_FO_DELETE,
+        pFrom=os.path.abspath(path) + "\0",    # list of paths ends with a double NUL
+        fFlags=_FOF_ALLOWUNDO | _FOF_NOCONFIRMATION | _FOF_SILENT | _FOF_NOERRORUI,
+    )
+    rc = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(op))
+    if rc or op.fAnyOperationsAborted:
+        raise OSError(f"SHFileOperation could not recycle {path!r} (code {rc:#x})")
+
+
+_SHUTDOWN_DELAY = 30
+_SHTDN_REASON_PLANNED = 0x80000000
+_TOKEN_ADJUST_PRIVILEGES = 0x20
+_TOKEN_QUERY = 0x08
+_SE_PRIVILEGE_ENABLED = 0x02
+
+
+class _LUID(ctypes.Structure):
+    _fields_ = [("LowPart", ctypes.c_uint32), ("HighPart", ctypes.c_int32)]
+
+
+class _TOKEN_PRIVILEGES(ctypes.Structure):
+    # TOKEN_PRIVILEGES with room for exactly one LUID_AND_ATTRIBUTES entry
+    _fields_ = [("PrivilegeCount", ctypes.c_uint32), ("Luid", _LUID), ("Attributes", ctypes.c_uint32)]
+
+
+def _enable_shutdown_privilege() -> None:
+    """Turn on SeShutdownPrivilege for this process (held but disabled by default)."""
+    advapi32, kernel32 = ctypes.windll.advapi32, ctypes.windll.kernel32
+    token = ctypes.c_void_p()
+    if not advapi32.OpenProcessToken(
+        kernel32.GetCurrentProcess(), _TOKEN_ADJUST_PRIVILEGES | _TOKEN_QUERY, ctypes.byref(token)
+    ):
+        raise ctypes.WinError()
+    try:
+        privs = _TOKEN_PRIVILEGES(1, _LUID(), _SE_PRIVILEGE_ENABLED)
+        if not advapi32.LookupPrivilegeValueW(None, "SeShutdownPrivilege", ctypes.byref(privs.Luid)):
+            raise ctypes.WinError()
+        if not advapi32.AdjustTokenPrivileges(token, False, ctypes.byref(privs), 0, None, None):
+            raise ctypes.WinError()
+    finally:
+        kernel32.CloseHandle(token)
+
+
+def _schedule_shutdown(reboot: bool) -> None:
+    """Start the standard Windows shutdown countdown, cancellable with AbortSystemShutdownW."""
+    verb = "Restarting" if reboot else "Shutting down"
+    _enable_shutdown_privilege()
+    if not ctypes.windll.advapi32.InitiateSystemShutdownExW(
+        None, f"Holex Beast: {verb} in {_SHUTDOWN_DELAY} seconds.",
+        _SHUTDOWN_DELAY, False, reboot, _SHTDN_REASON_PLANNED,
+    ):
+        raise ctypes.WinError()
+
+
+# Formats that are already compressed - deflating them again only burns CPU
+_STORED_SUFFIXES = frozenset({
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".aac", ".ogg", ".opus", ".flac", ".m4a",
+    ".mp4", ".mkv", ".webm", ".mov", ".avi",
+    ".zip", ".gz", ".xz", ".bz2", ".7z", ".rar", ".zst",
+    ".docx", ".xlsx", ".pptx", ".pdf",
+})
+_ZIP_CHUNK = 1 << 20
+
+
+def _walk(root: str):
+    """
+    Yield (DirEntry, is_dir) for everything under root, depth-first in name
+    order. scandir answers is_dir() from the readdir type, so unlike rglob
+    there is no Path object or extra stat per entry.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            yield e, True
+            yield from _walk(e.path)
+        else:
+            yield e, False
+
+
+def _write_zip(src: Path, archive: Path) -> None:
+    """Zip a file or folder, streaming each file in 1 MiB chunks."""
+    base = str(src.parent)
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        if not src.is_dir():
+            entries = [(str(src), False)]
+        else:
+            entries = ((e.path, is_dir) for e, is_dir in _walk(str(src)))
+        own = os.stat(archive)
+        for path, is_dir in entries:
+            arcname = os.path.relpath(path, base)
+            if is_dir:
+                zf.write(path, arcname)                  # keeps empty folders
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue                                 # broken link
+            if not stat.S_ISREG(st.st_mode) or os.path.samestat(st, own):
+                continue                                 # socket/fifo, or zipping a folder into itself
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = (
+                zipfile.ZIP_STORED if os.path.splitext(path)[1].lower() in _STORED_SUFFIXES
+                else zipfile.ZIP_DEFLATED
+            )
+            with open(path, "rb") as fin, zf.open(info, "w") as fout:
+                shutil.copyfileobj(fin, fout, _ZIP_CHUNK)
+
+
+# Below this much data, or this many files, one thread is as fast as several
+_PARALLEL_UNZIP_MIN_BYTES = 8 << 20
+_PARALLEL_UNZIP_MIN_FILES = 4
+
+
+def _member_dir(out: str, member: zipfile.ZipInfo) -> Optional[str]:
+    """
+    The folder ZipFile.extract() will write member into, using its own path
+    rules: drive and ../ parts dropped, and on Windows the characters it
+    can't hold replaced. None if the result would still land outside out.
+    """
+    arcname = member.filename.replace("/", os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.sep.join(p for p in arcname.split(os.sep) if p not in ("", os.curdir, os.pardir))
+    if os.sep == "\\":
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.sep)
+    root = os.path.abspath(out)
+    target = os.path.normpath(os.path.join(root, arcname))
+    folder = target if member.is_dir() else os.path.dirname(target)
+    return folder if os.path.commonpath([root, folder]) == root else None
+
+
+def _extract_zip(archive: Path, out: str) -> None:
+    """
+    extractall(), spread over a thread pool for big multi-file archives.
+    zlib releases the GIL while inflating, so the workers really run in
+    parallel; each opens its own ZipFile, since a handle can't be shared.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        members = zf.infolist()
+        files = [m for m in members if not m.is_dir()]
+        workers = min(8, os.cpu_count() or 1, len(files))
+        if (workers < 2 or len(files) < _PARALLEL_UNZIP_MIN_FILES
+                or sum(m.file_size for m in files) < _PARALLEL_UNZIP_MIN_BYTES):
+            zf.extractall(out)
+            return
+        # Create the folder tree up front so workers don't race in makedirs
+        for folder in {_member_dir(out, m) for m in members} - {None}:
+            os.makedirs(folder, exist_ok=True)
+
+    # Same name -> same worker, so duplicate entries keep extractall's last-one-wins
+    shards: list[list[zipfile.ZipInfo]] = [[] for _ in range(workers)]
+    for m in files:
+        shards[hash(m.filename) % workers].append(m)
+
+    def extract_shard(shard: list[zipfile.ZipInfo]) -> None:
+        with zipfile.ZipFile(archive) as zf:
+            for m in shard:
+                zf.extract(m, out)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(extract_shard, shards))
+
+
+def _press_keys(*vks: int) -> None:
+    """Tap a key chord via user32.keybd_event: press in order, release in reverse."""
+    keybd_event = ctypes.windll.user32.keybd_event
+    for vk in vks:
+        keybd_event(vk, 0, 0, 0)
+    for vk in reversed(vks):
+        keybd_event(vk, 0, _KEYEVENTF_KEYUP, 0)
+
+
+_INPUT_KEYBOARD = 1
+_KEYEVENTF_UNICODE = 0x0004
+# Controls don't act on a VK_PACKET character, so these go as real keys
+_TEXT_VKS = {"\n": 0x0D, "\r": 0x0D, "\t": 0x09}
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_uint16), ("wScan", ctypes.c_uint16), ("dwFlags", ctypes.c_uint32),
+                ("time", ctypes.c_uint32), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    # Only here so the INPUT union has its real (largest-member) size
+    _fields_ = [("dx", ctypes.c_int32), ("dy", ctypes.c_int32), ("mouseData", ctypes.c_uint32),
+                ("dwFlags", ctypes.c_uint32), ("time", ctypes.c_uint32), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _INPUT(ctypes.Structure):
+    class _U(ctypes.Union):
+        _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+    _fields_ = [("type", ctypes.c_uint32), ("u", _U)]
+
+
+def _send_text(text: str) -> None:
+    """
+    Type text with one user32.SendInput call: a down/up pair per UTF-16
+    code unit as KEYEVENTF_UNICODE packets, so layout and modifiers don't
+    matter and nothing sleeps between characters. Raises OSError if input
+    was blocked (e.g. the focused window runs elevated).
+    """
+    events = []
+    for ch in text:
+        vk = _TEXT_VKS.get(ch)
+        if vk is not None:
+            events += [(vk, 0, 0), (vk, 0, _KEYEVENTF_KEYUP)]
+            continue
+        data = ch.encode("utf-16-le")
+        for i in range(0, len(data), 2):   # astral characters are two surrogates
+            unit = int.from_bytes(data[i:i + 2], "little")
+            events += [(0, unit, _KEYEVENTF_UNICODE), (0, unit, _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP)]
+    inputs = (_INPUT * len(events))()
+    for slot, (vk, scan, flags) in zip(inputs, events):
+        slot.type = _INPUT_KEYBOARD
+        slot.u.ki.wVk, slot.u.ki.wScan, slot.u.ki.dwFlags = vk, scan, flags
+    if ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT)) != len(inputs):
+        raise ctypes.WinError()
+
+
+class _NameIndex:
+    """
+    Resolve what the user said to a key of a fixed name map.
+
+    Tries, in order: the exact name; the longest key that starts the phrase
+    on a word boundary ("chrome browser" -> "chrome"); and an unambiguous
+    completion of a partial name ("microsoft wor" -> "microsoft word").
+    Backed by a marisa-trie when installed, else sorted keys + bisect.
+    Resolutions are memoised, since people ask for the same few apps.
+    """
+
+    _MIN_COMPLETION = 3   # don't complete "c" to whatever sorts first
+
+    def __init__(self, mapping: dict[str, str]):
+        if any(k != k.lower().strip() for k in mapping):
+            raise ValueError("name map keys must be lowercase and stripped")
+        self._map = mapping
+        self.resolve = functools.lru_cache(maxsize=512)(self._resolve)
+        self._trie = marisa_trie.Trie(mapping) if marisa_trie is not None else None
+        # Only the bisect fallback needs the sorted keys; the trie covers both searches
+        self._sorted: tuple[str, ...] = () if self._trie is not None else tuple(sorted(mapping))
+
+    def _prefixes(self, phrase: str) -> list[str]:
+        if self._trie is not None:
+            return self._trie.prefixes(phrase)
+        return [phrase[:i] for i, ch in enumerate(phrase) if ch == " " and phrase[:i] in self._map]
+
+    def _completions(self, partial: str) -> list[str]:
+        if self._trie is not None:
+            return self._trie.keys(partial)
+        i = bisect_left(self._sorted, partial)
+        out = []
+        while i < len(self._sorted) and self._sorted[i].startswith(partial):
+            out.append(self._sorted[i])
+            i += 1
+        return out
+
+    def _resolve(self, phrase: str) -> Optional[str]:
+        key = phrase.lower().strip()
+        if key in self._map:
+            return key
+        bounded = [p for p in self._prefixes(key) if key[len(p):len(p) + 1] == " "]
+        if bounded:
+            return max(bounded, key=len)
+        if len(key) >= self._MIN_COMPLETION:
+            completions = self._completions(key)
+            if completions:
+                shortest = min(completions, key=len)
+                if all(c.startswith(shortest) for c in completions):
+                    return shortest
+        return None
+
+
+_APP_INDEX = _NameIndex(APP_MAP)
+# lowercased executable -> its canonical spelling, for users who name the .exe
+_EXE_NAMES = {exe.lower(): exe for exe in APP_MAP.values() if exe.lower().endswith(".exe")}
+_SETTINGS_INDEX = _NameIndex(SETTINGS_MAP)
+
+# Installed apps registered under App Paths: lowercased "chrome.exe" -> full
+# path. Scanned on first use; refresh_app_paths() re-scans after installs.
+_APP_PATHS_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"
+_app_paths: Optional[dict[str, str]] = None
+
+
+def refresh_app_paths() -> dict[str, str]:
+    """Re-read App Paths from HKLM, then HKCU (per-user installs win)."""
+    global _app_paths
+    paths: dict[str, str] = {}
+    if winreg is not None:
+        for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+            try:
+                root = winreg.OpenKey(hive, _APP_PATHS_KEY)
+            except OSError:
+                continue
+            with root:
+                for i in range(winreg.QueryInfoKey(root)[0]):
+                    try:
+                        name = winreg.EnumKey(root, i)
+                        target = winreg.QueryValue(root, name)
+                    except OSError:
+                        continue
+                    if target:
+                        paths[name.lower()] = os.path.expandvars(target.strip().strip('"'))
+    _app_paths = paths
+    return paths
+
+
+def _app_path(exe: str) -> Optional[str]:
+    paths = _app_paths if _app_paths is not None else refresh_app_paths()
+    return paths.get(exe.lower())
+
+
+_GOOGLE_SEARCH_URL = "https://www.google.com/search?q="
+_YOUTUBE_SEARCH_URL = "https://www.youtube.com/results?search_query="
+# Characters quote_plus leaves alone, plus the space it turns into "+"
+_PLAIN_QUERY = re.compile(r"[A-Za-z0-9_.~ -]*")
+
+
+def _quote_query(query: str) -> str:
+    """quote_plus, short-circuited for plain spoken queries like "lofi hip hop"."""
+    if _PLAIN_QUERY.fullmatch(query):
+        return query.replace(" ", "+")
+    return quote_plus(query)
+
+
+# play_youtube: first videoId on the results page, memoised per query
+# (bytes, so the page is scanned as it streams in - no decode)
+_RE_VIDEO_ID = re.compile(rb'/watch\?v=([\w-]{11})')
+_VIDEO_ID_OVERLAP = len(b"/watch?v=") + 11 - 1     # a match can straddle two chunks
+_YT_MAX_BYTES = 2 << 20
+_YT_CACHE: dict[str, tuple[float, str]] = {}   # query -> (expires_at, videoId)
+_YT_CACHE_TTL = 300.0
+_YT_CACHE_MAX = 256
+
+
 class SystemControlTool(BaseTool):
     """Full desktop assistant — controls Windows like Siri/Alexa/Google.
 
@@ -188,6 +911,15 @@ class SystemControlTool(BaseTool):
     system info, wallpaper, process management, and more.
     """
 
+    # Pooled client for YouTube lookups (BaseTool._http_client)
+    _http_options = {"timeout": 8, "headers": {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}}
+
+    def __init__(self):
+        # Per-thread native handles: COM pointers (see _endpoint_volume)
+        # and the screen grabber (see _grab_screen)
+        self._com = threading.local()
+        self._wifi_iface: Optional[str] = None
+
     @property
     def name(self) -> str:
         return "system_control"
@@ -202,8 +934,14 @@ class SystemControlTool(BaseTool):
             "files/folders, create/delete/rename/move files, set wallpaper, "
             "get system info and battery status, manage processes, empty "
             "recycle bin, open any Windows settings page, zip/unzip files, "
-            "lock screen, put to sleep, shutdown/restart with confirmation, "
-            "media playback control, and any system operation a user asks."
+            "lock screen, put to sleep, shutdown/restart with confirmation "
+            "(cancel_shutdown aborts either), "
+            "media playback control, and any system operation a user asks. "
+            "Examples: 'Open Chrome' -> open_app/chrome; 'Search for Python "
+            "tutorials' -> search_google; 'Play lo-fi on YouTube' -> play_youtube; "
+            "'Minimize everything' -> show_desktop; 'Open Bluetooth settings' -> "
+            "open_settings/bluetooth; 'Kill Chrome' -> kill_process/chrome; "
+            "'Zip my project' -> zip_files with target=path, destination=out.zip."
         )
 
     @property
@@ -225,7 +963,7 @@ class SystemControlTool(BaseTool):
                         "brightness_up", "brightness_down", "set_brightness",
                         # System
                         "screenshot", "lock_screen", "sleep",
-                        "shutdown", "restart",
+                        "shutdown", "restart", "cancel_shutdown",
                         # Network
                         "wifi_on", "wifi_off", "bluetooth_on", "bluetooth_off",
                         # File / folder ops
@@ -268,97 +1006,39 @@ class SystemControlTool(BaseTool):
             "required": ["action"],
         }
 
+    async def execute_raw(self, args: dict) -> ToolResult:
+        return await self.execute(
+            args.get("action", ""), args.get("target") or "", args.get("destination") or ""
+        )
+
     async def execute(
         self, action: str, target: str = "", destination: str = "", **kw
     ) -> ToolResult:
+        handler = self._actions.get(action)
+        if handler is None:
+            return ToolResult(success=False, output="", error=f"Unknown action: {action}")
         try:
-            handler = {
-                "open_app": self._open_app,
-                "close_app": self._close_app,
-                "search_google": self._search_google,
-                "search_youtube": self._search_youtube,
-                "play_youtube": self._play_youtube,
-                "open_url": self._open_url,
-                "open_website": self._open_url,
-                "volume_up": lambda t, d: self._volume("up"),
-                "volume_down": lambda t, d: self._volume("down"),
-                "volume_mute": lambda t, d: self._volume("mute"),
-                "set_volume": lambda t, d: self._set_volume(t),
-                "brightness_up": lambda t, d: self._brightness("up"),
-                "brightness_down": lambda t, d: self._brightness("down"),
-                "set_brightness": lambda t, d: self._set_brightness(t),
-                "screenshot": lambda t, d: self._screenshot(),
-                "lock_screen": lambda t, d: self._lock_screen(),
-                "sleep": lambda t, d: self._sleep(),
-                "shutdown": lambda t, d: self._shutdown(),
-                "restart": lambda t, d: self._restart(),
-                "wifi_on": lambda t, d: self._wifi(True),
-                "wifi_off": lambda t, d: self._wifi(False),
-                "bluetooth_on": lambda t, d: self._bluetooth(True),
-                "bluetooth_off": lambda t, d: self._bluetooth(False),
-                "open_folder": lambda t, d: self._open_folder(t),
-                "open_file": lambda t, d: self._open_file(t),
-                "create_file": lambda t, d: self._create_file(t),
-                "create_folder": lambda t, d: self._create_folder(t),
-                "delete_file": lambda t, d: self._delete_file(t),
-                "rename_file": self._rename_dispatch,
-                "move_file": self._move_dispatch,
-                "copy_file": self._copy_dispatch,
-                "type_text": lambda t, d: self._type_text(t),
-                "copy_to_clipboard": lambda t, d: self._copy_to_clipboard(t),
-                "minimize_all": lambda t, d: self._show_desktop(),
-                "show_desktop": lambda t, d: self._show_desktop(),
-                "switch_window": lambda t, d: self._switch_window(t),
-                "close_window": lambda t, d: self._close_window(t),
-                "system_info": lambda t, d: self._system_info(),
-                "battery_status": lambda t, d: self._battery_status(),
-                "list_processes": lambda t, d: self._list_processes(),
-                "kill_process": lambda t, d: self._kill_process(t),
-                "set_wallpaper": lambda t, d: self._set_wallpaper(t),
-                "empty_recycle_bin": lambda t, d: self._empty_recycle_bin(),
-                "open_settings": lambda t, d: self._open_settings(t),
-                "zip_files": self._zip_dispatch,
-                "unzip_file": lambda t, d: self._unzip_file(t, d),
-                "print_file": lambda t, d: self._print_file(t),
-                "media_play_pause": lambda t, d: self._media_key("play_pause"),
-                "media_next": lambda t, d: self._media_key("next"),
-                "media_previous": lambda t, d: self._media_key("previous"),
-            }.get(action)
-
-            if not handler:
-                return ToolResult(success=False, output="", error=f"Unknown action: {action}")
-
-            return await handler(target, destination)
-
+            return await handler(self, target, destination)
         except Exception as e:
             logger.error(f"System control error [{action}]: {e}")
             return ToolResult(success=False, output="", error=str(e))
 
-    # ── Helper dispatchers for two-arg calls ──
-
-    async def _rename_dispatch(self, t: str, d: str) -> ToolResult:
-        return await self._rename_file(t, d)
-
-    async def _move_dispatch(self, t: str, d: str) -> ToolResult:
-        return await self._move_file(t, d)
-
-    async def _copy_dispatch(self, t: str, d: str) -> ToolResult:
-        return await self._copy_file(t, d)
-
-    async def _zip_dispatch(self, t: str, d: str) -> ToolResult:
-        return await self._zip_files(t, d)
-
     # ══════════════════════════════════════════════════════════════════════════
     #   APP MANAGEMENT
     # ══════════════════════════════════════════════════════════════════════════
 
+    @action("open_app")
     async def _open_app(self, app_name: str, _d: str = "") -> ToolResult:
         if not app_name:
             return ToolResult(success=False, output="", error="No app name provided.")
 
-        key = app_name.lower().strip()
-        executable = APP_MAP.get(key)
+        key = _APP_INDEX.resolve(app_name)
+        executable = APP_MAP[key] if key else None
 
+        if not executable:
+            # Not a name we know - it may still be a registered install ("audacity")
+            spoken = app_name.strip()
+            executable = _app_path(spoken if spoken.lower().endswith(".exe") else f"{spoken}.exe")
         if not executable:
             try:
                 os.startfile(app_name)
@@ -378,40 +1058,55 @@ class SystemControlTool(BaseTool):
                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
                 )
             else:
+                # Launch by full path when registered, so apps outside PATH
+                # start without the FileNotFoundError round trip below
                 subprocess.Popen(
-                    [executable],
+                    [_app_path(executable) or executable],
                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, shell=False,
+                    creationflags=_launch_flags(os.path.basename(executable)),
                 )
             return ToolResult(success=True, output=f"Opened **{app_name}**")
         except FileNotFoundError:
+            # Not on PATH - ShellExecute also searches the App Paths registry
             try:
-                subprocess.Popen(
-                    f'start "" "{executable}"', shell=True,
-                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                )
+                _shell_execute(executable)
                 return ToolResult(success=True, output=f"Opened **{app_name}**")
             except Exception as e:
                 return ToolResult(success=False, output="", error=f"Cannot open {app_name}: {e}")
 
+    @action("close_app")
     async def _close_app(self, app_name: str, _d: str = "") -> ToolResult:
         if not app_name:
             return ToolResult(success=False, output="", error="No app name provided.")
 
-        key = app_name.lower().strip()
-        exe = APP_MAP.get(key)
+        key = _APP_INDEX.resolve(app_name)
+        exe = APP_MAP[key] if key else None
+        spoken = app_name.strip().lower()
         if exe and not exe.endswith(":") and not exe.startswith("ms-") and not exe.endswith(".msc"):
             proc_name = exe
+        elif spoken in _EXE_NAMES:
+            proc_name = _EXE_NAMES[spoken]        # "close chrome.exe"
+        elif spoken.endswith(".exe"):
+            proc_name = app_name.strip()
         else:
             proc_name = f"{app_name}.exe"
 
         try:
-            r = subprocess.run(
-                ["taskkill", "/f", "/im", proc_name],
-                capture_output=True, text=True, timeout=5,
-            )
-            if r.returncode == 0:
-                return ToolResult(success=True, output=f"Closed **{app_name}**")
-            r2 = subprocess.run(
+            if psutil is not None:
+                # In-process kill - no taskkill.exe to spawn
+                n = await asyncio.to_thread(_terminate_by_name, proc_name)
+                if n:
+                    count = f" ({n} processes)" if n > 1 else ""
+                    return ToolResult(success=True, output=f"Closed **{app_name}**{count}")
+            else:
+                r = await _run(
+                    ["taskkill", "/f", "/im", proc_name],
+                    capture_output=True, text=True, timeout=5,
+                )
+                if r.returncode == 0:
+                    return ToolResult(success=True, output=f"Closed **{app_name}**")
+            # Last resort: match a window title, which only taskkill can do
+            r2 = await _run(
                 ["taskkill", "/f", "/fi", f"WINDOWTITLE eq {app_name}*"],
                 capture_output=True, text=True, timeout=5,
             )
@@ -428,50 +1123,73 @@ class SystemControlTool(BaseTool):
     #   BROWSER / SEARCH / YOUTUBE
     # ══════════════════════════════════════════════════════════════════════════
 
+    @action("search_google")
     async def _search_google(self, query: str, _d: str = "") -> ToolResult:
         if not query:
             return ToolResult(success=False, output="", error="No search query.")
-        import urllib.parse
-        url = f"https://www.google.com/search?q={urllib.parse.quote_plus(query)}"
+        url = _GOOGLE_SEARCH_URL + _quote_query(query)
         webbrowser.open(url)
         return ToolResult(success=True, output=f"Searching Google for **{query}**")
 
+    @action("search_youtube")
     async def _search_youtube(self, query: str, _d: str = "") -> ToolResult:
         if not query:
             return ToolResult(success=False, output="", error="No search query.")
-        import urllib.parse
-        url = f"https://www.youtube.com/results?search_query={urllib.parse.quote_plus(query)}"
+        url = _YOUTUBE_SEARCH_URL + _quote_query(query)
         webbrowser.open(url)
         return ToolResult(success=True, output=f"Searching YouTube for **{query}**")
 
+    @action("play_youtube")
     async def _play_youtube(self, query: str, _d: str = "") -> ToolResult:
         """Open YouTube and auto-play the first matching video."""
         if not query:
             return ToolResult(success=False, output="", error="No video query.")
-        try:
-            import re
-            import urllib.parse
-            import urllib.request
-            search_url = (
-                f"https://www.youtube.com/results?search_query="
-                f"{urllib.parse.quote_plus(query)}"
-            )
-            req = urllib.request.Request(search_url, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-            })
-            html = urllib.request.urlopen(req, timeout=8).read().decode("utf-8", errors="ignore")
-            match = re.search(r'/watch\?v=([\w-]{11})', html)
-            if match:
-                webbrowser.open(f"https://www.youtube.com/watch?v={match.group(1)}")
-                return ToolResult(success=True, output=f"Playing **{query}** on YouTube")
-        except Exception:
-            pass
-        import urllib.parse
-        webbrowser.open(
-            f"https://www.youtube.com/results?search_query={urllib.parse.quote_plus(query)}"
-        )
+        video_id = await self._youtube_video_id(query)
+        if video_id:
+            webbrowser.open(f"https://www.youtube.com/watch?v={video_id}")
+            return ToolResult(success=True, output=f"Playing **{query}** on YouTube")
+        webbrowser.open(_YOUTUBE_SEARCH_URL + _quote_query(query))
         return ToolResult(success=True, output=f"Playing **{query}** on YouTube")
 
+    async def _youtube_video_id(self, query: str) -> Optional[str]:
+        """
+        First videoId YouTube returns for query, or None if the lookup fails.
+        Hits are cached for a few minutes so "play lofi" twice in a row
+        doesn't fetch the results page again.
+        """
+        key = query.lower().strip()
+        now = time.monotonic()
+        hit = _YT_CACHE.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        video_id = None
+        try:
+            # Stream the results page and stop reading at the first hit
+            async with self._http_client().stream(
+                "GET", "https://www.youtube.com/results", params={"search_query": query}
+            ) as resp:
+                tail, seen = b"", 0
+                async for chunk in resp.aiter_bytes():
+                    window = tail + chunk
+                    match = _RE_VIDEO_ID.search(window)
+                    if match:
+                        video_id = match.group(1).decode("ascii")
+                        break
+                    seen += len(chunk)
+                    if seen > _YT_MAX_BYTES:
+                        break
+                    tail = window[-_VIDEO_ID_OVERLAP:]
+        except Exception:
+            return None
+        if not video_id:
+            return None
+        _YT_CACHE.pop(key, None)
+        if len(_YT_CACHE) >= _YT_CACHE_MAX:
+            del _YT_CACHE[next(iter(_YT_CACHE))]    # oldest insertion
+        _YT_CACHE[key] = (now + _YT_CACHE_TTL, video_id)
+        return video_id
+
+    @action("open_url", "open_website")
     async def _open_url(self, url: str, _d: str = "") -> ToolResult:
         if not url:
             return ToolResult(success=False, output="", error="No URL provided.")
@@ -484,16 +1202,42 @@ class SystemControlTool(BaseTool):
     #   VOLUME
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _volume(self, direction: str) -> ToolResult:
-        try:
-            from ctypes import POINTER, cast
-
-            from comtypes import CLSCTX_ALL
-            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-
+    @action("volume_up")
+    async def _volume_up(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._volume("up")
+
+    @action("volume_down")
+    async def _volume_down(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._volume("down")
+
+    @action("volume_mute")
+    async def _volume_mute(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._volume("mute")
+
+    def _endpoint_volume(self):
+        """
+        The default speaker's IAudioEndpointVolume, activated once and reused.
+        COM pointers belong to the thread that created them, so the cache is
+        per thread.
+        """
+        vol = getattr(self._com, "endpoint_volume", None)
+        if vol is None:
             devices = AudioUtilities.GetSpeakers()
             iface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            vol = cast(iface, POINTER(IAudioEndpointVolume))
+            vol = ctypes.cast(iface, ctypes.POINTER(IAudioEndpointVolume))
+            self._com.endpoint_volume = vol
+        return vol
+
+    def _with_endpoint_volume(self, fn):
+        """Call fn(vol); if the cached device went away, re-activate once and retry."""
+        try:
+            return fn(self._endpoint_volume())
+        except Exception:
+            self._com.endpoint_volume = None
+            return fn(self._endpoint_volume())
+
+    async def _volume(self, direction: str) -> ToolResult:
+        def apply(vol) -> ToolResult:
             if direction == "mute":
                 muted = vol.GetMute()
                 vol.SetMute(not muted, None)
@@ -503,39 +1247,26 @@ class SystemControlTool(BaseTool):
             new_vol = max(0.0, min(1.0, current + delta))
             vol.SetMasterVolumeLevelScalar(new_vol, None)
             return ToolResult(success=True, output=f"Volume: **{int(new_vol * 100)}%**")
-        except ImportError:
+
+        if AudioUtilities is None:
             return await self._volume_fallback(direction)
+        return self._with_endpoint_volume(apply)
 
     async def _volume_fallback(self, direction: str) -> ToolResult:
-        vk_map = {"up": "0xAF", "down": "0xAE", "mute": "0xAD"}
-        vk = vk_map.get(direction, "0xAF")
         try:
-            ps = (
-                "Add-Type -TypeDefinition '"
-                "using System; using System.Runtime.InteropServices;"
-                "public class VK { "
-                "[DllImport(\"user32.dll\")] public static extern void keybd_event(byte k, byte s, uint f, UIntPtr e); "
-                "}';"
-                f"[VK]::keybd_event({vk},0,0,[UIntPtr]::Zero);"
-                f"[VK]::keybd_event({vk},0,2,[UIntPtr]::Zero)"
-            )
-            subprocess.run(["powershell", "-c", ps], capture_output=True, timeout=5)
+            _press_keys(_VOLUME_KEYS.get(direction, _VOLUME_KEYS["up"]))
             return ToolResult(success=True, output=f"Volume {direction}")
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
 
-    async def _set_volume(self, level_str: str) -> ToolResult:
+    @action("set_volume")
+    async def _set_volume(self, level_str: str, _d: str = "") -> ToolResult:
+        if AudioUtilities is None:
+            return ToolResult(success=False, output="", error="pycaw needed: pip install pycaw")
         try:
             level = int(str(level_str).strip().rstrip("%")) / 100.0
             level = max(0.0, min(1.0, level))
-            from ctypes import POINTER, cast
-
-            from comtypes import CLSCTX_ALL
-            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-            devices = AudioUtilities.GetSpeakers()
-            iface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            vol = cast(iface, POINTER(IAudioEndpointVolume))
-            vol.SetMasterVolumeLevelScalar(level, None)
+            self._with_endpoint_volume(lambda vol: vol.SetMasterVolumeLevelScalar(level, None))
             return ToolResult(success=True, output=f"Volume set to **{int(level * 100)}%**")
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
@@ -544,52 +1275,56 @@ class SystemControlTool(BaseTool):
     #   BRIGHTNESS
     # ══════════════════════════════════════════════════════════════════════════
 
+    @action("brightness_up")
+    async def _brightness_up(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._brightness("up")
+
+    @action("brightness_down")
+    async def _brightness_down(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._brightness("down")
+
     async def _brightness(self, direction: str) -> ToolResult:
         # Prefer screen_brightness_control (works on desktop + laptop)
+        if sbc is not None:
+            try:
+                # sbc talks to WMI/DDC-CI and can take a second - off the event loop
+                new_val = await asyncio.to_thread(_sbc_step, 10 if direction == "up" else -10)
+                return ToolResult(success=True, output=f"Brightness: **{new_val}%**")
+            except Exception:
+                pass
+        # WMI fallback (laptops) — read, adjust, and write in one PowerShell run
         try:
-            import screen_brightness_control as sbc
-            current = sbc.get_brightness(display=0)[0]
-            delta = 10 if direction == "up" else -10
-            new_val = max(0, min(100, current + delta))
-            sbc.set_brightness(new_val, display=0)
-            return ToolResult(success=True, output=f"Brightness: **{new_val}%**")
-        except Exception:
-            pass
-        # WMI fallback (laptops)
-        try:
-            r = subprocess.run(
-                ["powershell", "-c",
-                 "(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness)"
-                 ".CurrentBrightness"],
-                capture_output=True, text=True, timeout=5,
-            )
-            current = int(r.stdout.strip()) if r.stdout.strip() else 50
             delta = 10 if direction == "up" else -10
-            new_val = max(0, min(100, current + delta))
-            subprocess.run(
-                ["powershell", "-c",
-                 f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
-                 f".WmiSetBrightness(1,{new_val})"],
-                capture_output=True, timeout=5,
+            out = await asyncio.to_thread(
+                _ps_host.run,
+                "$b = (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness "
+                "| Select-Object -First 1).CurrentBrightness; "
+                "if ($b -eq $null) { $b = 50 }; "
+                f"$n = [Math]::Max(0, [Math]::Min(100, $b + {delta})); "
+                "[void](Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
+                ".WmiSetBrightness(1, $n); $n",
+                5,
             )
+            new_val = int(out.strip().splitlines()[-1])
             return ToolResult(success=True, output=f"Brightness: **{new_val}%**")
         except Exception as e:
             return ToolResult(success=False, output="", error=f"Brightness not available: {e}")
 
-    async def _set_brightness(self, level_str: str) -> ToolResult:
+    @action("set_brightness")
+    async def _set_brightness(self, level_str: str, _d: str = "") -> ToolResult:
         level = max(0, min(100, int(str(level_str).strip().rstrip("%"))))
+        if sbc is not None:
+            try:
+                await asyncio.to_thread(sbc.set_brightness, level, display=0)
+                return ToolResult(success=True, output=f"Brightness set to **{level}%**")
+            except Exception:
+                pass
         try:
-            import screen_brightness_control as sbc
-            sbc.set_brightness(level, display=0)
-            return ToolResult(success=True, output=f"Brightness set to **{level}%**")
-        except Exception:
-            pass
-        try:
-            subprocess.run(
-                ["powershell", "-c",
-                 f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
-                 f".WmiSetBrightness(1,{level})"],
-                capture_output=True, timeout=5,
+            await asyncio.to_thread(
+                _ps_host.run,
+                f"[void](Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods)"
+                f".WmiSetBrightness(1,{level})",
+                5,
             )
             return ToolResult(success=True, output=f"Brightness set to **{level}%**")
         except Exception as e:
@@ -599,93 +1334,152 @@ class SystemControlTool(BaseTool):
     #   SCREENSHOT
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _screenshot(self) -> ToolResult:
-        try:
-            import pyautogui
+    @action("screenshot")
+    async def _screenshot(self, _t: str = "", _d: str = "") -> ToolResult:
+        if mss is not None or pyautogui is not None:
             path = TEMP_DIR / f"screenshot_{datetime.now():%Y%m%d_%H%M%S}.png"
             path.parent.mkdir(exist_ok=True)
-            pyautogui.screenshot(str(path))
+            grab = self._grab_screen if mss is not None else pyautogui.screenshot
+            await asyncio.to_thread(grab, str(path))
             return ToolResult(
                 success=True,
                 output=f"Screenshot saved: **{path.name}**",
                 data={"path": str(path)},
             )
-        except ImportError:
-            try:
-                subprocess.Popen(["snippingtool.exe", "/clip"])
-                return ToolResult(success=True, output="Snipping Tool opened for screenshot")
-            except Exception:
-                return ToolResult(success=False, output="", error="Install pyautogui for screenshots")
+        try:
+            subprocess.Popen(["snippingtool.exe", "/clip"])
+            return ToolResult(success=True, output="Snipping Tool opened for screenshot")
+        except Exception:
+            return ToolResult(success=False, output="", error="Install mss for screenshots: pip install mss")
+
+    def _grab_screen(self, path: str) -> None:
+        """
+        Capture the primary monitor to a PNG with mss. The grabber keeps its
+        device context between shots; that context belongs to the thread
+        that created it, so there is one grabber per worker thread.
+        """
+        sct = getattr(self._com, "sct", None)
+        if sct is None:
+            sct = self._com.sct = mss.mss()
+        shot = sct.grab(sct.monitors[1])
+        mss.tools.to_png(shot.rgb, shot.size, output=path)
 
     # ══════════════════════════════════════════════════════════════════════════
     #   SYSTEM POWER
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _lock_screen(self) -> ToolResult:
-        subprocess.run(["rundll32.exe", "user32.dll,LockWorkStation"])
+    @action("lock_screen")
+    async def _lock_screen(self, _t: str = "", _d: str = "") -> ToolResult:
+        ctypes.windll.user32.LockWorkStation()
         return ToolResult(success=True, output="Screen locked 🔒")
 
-    async def _sleep(self) -> ToolResult:
-        subprocess.run(
-            ["powershell", "-c",
-             "Add-Type -Assembly System.Windows.Forms; "
-             "[System.Windows.Forms.Application]::SetSuspendState('Suspend', $false, $false)"],
-            capture_output=True, timeout=5,
-        )
+    @action("sleep")
+    async def _sleep(self, _t: str = "", _d: str = "") -> ToolResult:
+        # SetSuspendState(hibernate=False, force=False, wake_events_disabled=False)
+        ctypes.windll.powrprof.SetSuspendState(False, False, False)
         return ToolResult(success=True, output="PC going to sleep 💤")
 
-    async def _shutdown(self) -> ToolResult:
-        subprocess.run(
-            ["shutdown", "/s", "/t", "30", "/c",
-             "Holex Beast: Shutting down in 30 seconds. Run 'shutdown /a' to cancel."],
-            capture_output=True, timeout=5,
-        )
-        return ToolResult(
-            success=True,
-            output="Shutting down in **30 seconds**. Say 'cancel shutdown' or run `shutdown /a` to abort.",
-        )
+    @action("shutdown")
+    async def _shutdown(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._power_off(reboot=False)
 
-    async def _restart(self) -> ToolResult:
-        subprocess.run(
-            ["shutdown", "/r", "/t", "30", "/c",
-             "Holex Beast: Restarting in 30 seconds. Run 'shutdown /a' to cancel."],
-            capture_output=True, timeout=5,
-        )
+    @action("restart")
+    async def _restart(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._power_off(reboot=True)
+
+    async def _power_off(self, reboot: bool) -> ToolResult:
+        verb = "Restarting" if reboot else "Shutting down"
+        try:
+            _schedule_shutdown(reboot)
+        except Exception as e:
+            # No privilege / API refused - shutdown.exe goes through the same countdown
+            logger.debug(f"InitiateSystemShutdownExW failed ({e}), using shutdown.exe")
+            await _run(
+                ["shutdown", "/r" if reboot else "/s", "/t", str(_SHUTDOWN_DELAY), "/c",
+                 f"Holex Beast: {verb} in {_SHUTDOWN_DELAY} seconds. Run 'shutdown /a' to cancel."],
+                capture_output=True, timeout=5,
+            )
         return ToolResult(
             success=True,
-            output="Restarting in **30 seconds**. Say 'cancel restart' or run `shutdown /a` to abort.",
+            output=f"{verb} in **{_SHUTDOWN_DELAY} seconds**. "
+                   f"Say 'cancel {'restart' if reboot else 'shutdown'}' to abort.",
         )
 
-    async def _show_desktop(self) -> ToolResult:
-        subprocess.run(
-            ["powershell", "-c", "(New-Object -ComObject Shell.Application).MinimizeAll()"],
-            capture_output=True, timeout=5,
-        )
+    @action("cancel_shutdown")
+    async def _cancel_shutdown(self, _t: str = "", _d: str = "") -> ToolResult:
+        try:
+            _enable_shutdown_privilege()
+            aborted = ctypes.windll.advapi32.AbortSystemShutdownW(None)
+        except Exception:
+            aborted = (await _run(["shutdown", "/a"], capture_output=True, timeout=5)).returncode == 0
+        if not aborted:
+            return ToolResult(success=False, output="", error="No shutdown or restart is pending.")
+        return ToolResult(success=True, output="Shutdown cancelled ✅")
+
+    @action("minimize_all", "show_desktop")
+    async def _show_desktop(self, _t: str = "", _d: str = "") -> ToolResult:
+        # Win+M is the shell's minimize-all (unlike Win+D it doesn't toggle back)
+        _press_keys(_VK_LWIN, _VK_M)
         return ToolResult(success=True, output="All windows minimized")
 
     # ══════════════════════════════════════════════════════════════════════════
     #   WIFI / BLUETOOTH
     # ══════════════════════════════════════════════════════════════════════════
 
+    @action("wifi_on")
+    async def _wifi_on(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._wifi(True)
+
+    @action("wifi_off")
+    async def _wifi_off(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._wifi(False)
+
+    @action("bluetooth_on")
+    async def _bluetooth_on(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._bluetooth(True)
+
+    @action("bluetooth_off")
+    async def _bluetooth_off(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._bluetooth(False)
+
+    async def _detect_wifi_iface(self) -> str:
+        """Find the wireless adapter's name via netsh (defaults to 'Wi-Fi')."""
+        detect = await _run(
+            ["netsh", "interface", "show", "interface"],
+            capture_output=True, text=True, timeout=5,
+        )
+        for line in detect.stdout.splitlines():
+            lower = line.lower()
+            if "wireless" in lower or "wi-fi" in lower or "wlan" in lower:
+                parts = line.split()
+                if len(parts) >= 4:
+                    return " ".join(parts[3:])
+        return "Wi-Fi"
+
     async def _wifi(self, enable: bool) -> ToolResult:
         state = "enable" if enable else "disable"
         try:
-            detect = subprocess.run(
-                ["netsh", "interface", "show", "interface"],
-                capture_output=True, text=True, timeout=5,
-            )
-            iface = "Wi-Fi"
-            for line in detect.stdout.splitlines():
-                lower = line.lower()
-                if "wireless" in lower or "wi-fi" in lower or "wlan" in lower:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        iface = " ".join(parts[3:])
-                        break
-            subprocess.run(
-                ["netsh", "interface", "set", "interface", iface, state],
-                capture_output=True, timeout=10,
+            # The adapter name basically never changes, so detect it once and
+            # only re-detect if netsh rejects the cached one.
+            fresh = self._wifi_iface is None
+            if fresh:
+                self._wifi_iface = await self._detect_wifi_iface()
+            r = await _run(
+                ["netsh", "interface", "set", "interface", self._wifi_iface, state],
+                capture_output=True, text=True, timeout=10,
             )
+            if r.returncode != 0 and not fresh:
+                self._wifi_iface = await self._detect_wifi_iface()
+                r = await _run(
+                    ["netsh", "interface", "set", "interface", self._wifi_iface, state],
+                    capture_output=True, text=True, timeout=10,
+                )
+            if r.returncode != 0:
+                self._wifi_iface = None
+                return ToolResult(
+                    success=False, output="",
+                    error=(r.stdout or r.stderr).strip() or f"netsh exited with {r.returncode}",
+                )
             return ToolResult(success=True, output=f"WiFi {'enabled ✅' if enable else 'disabled ❌'}")
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
@@ -702,7 +1496,8 @@ class SystemControlTool(BaseTool):
     #   FILE / FOLDER OPERATIONS
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _open_folder(self, path: str) -> ToolResult:
+    @action("open_folder")
+    async def _open_folder(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             path = os.path.expanduser("~")
         target = Path(path).expanduser()
@@ -711,7 +1506,8 @@ class SystemControlTool(BaseTool):
         os.startfile(str(target))
         return ToolResult(success=True, output=f"Opened **{target}**")
 
-    async def _open_file(self, path: str) -> ToolResult:
+    @action("open_file")
+    async def _open_file(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No file path provided.")
         target = Path(path).expanduser()
@@ -720,7 +1516,8 @@ class SystemControlTool(BaseTool):
         os.startfile(str(target))
         return ToolResult(success=True, output=f"Opened **{target.name}**")
 
-    async def _create_file(self, path: str) -> ToolResult:
+    @action("create_file")
+    async def _create_file(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No file path provided.")
         target = Path(path).expanduser()
@@ -728,30 +1525,40 @@ class SystemControlTool(BaseTool):
         target.touch()
         return ToolResult(success=True, output=f"Created file: **{target.name}**")
 
-    async def _create_folder(self, path: str) -> ToolResult:
+    @action("create_folder")
+    async def _create_folder(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No folder path provided.")
         target = Path(path).expanduser()
         target.mkdir(parents=True, exist_ok=True)
         return ToolResult(success=True, output=f"Created folder: **{target.name}**")
 
-    async def _delete_file(self, path: str) -> ToolResult:
+    @action("delete_file")
+    async def _delete_file(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No file path provided.")
         target = Path(path).expanduser()
         if not target.exists():
             return ToolResult(success=False, output="", error=f"Not found: {path}")
+        recycled = f"Moved **{target.name}** to Recycle Bin 🗑️"
+        if hasattr(ctypes, "windll"):
+            try:
+                await asyncio.to_thread(_recycle, str(target))
+                return ToolResult(success=True, output=recycled)
+            except OSError as e:
+                logger.debug(f"SHFileOperation failed ({e}), trying send2trash")
         try:
             from send2trash import send2trash
-            send2trash(str(target))
-            return ToolResult(success=True, output=f"Moved **{target.name}** to Recycle Bin 🗑️")
+            await asyncio.to_thread(send2trash, str(target))
+            return ToolResult(success=True, output=recycled)
         except ImportError:
             if target.is_dir():
-                shutil.rmtree(str(target))
+                await asyncio.to_thread(shutil.rmtree, str(target))
             else:
                 target.unlink()
             return ToolResult(success=True, output=f"Deleted **{target.name}** permanently")
 
+    @action("rename_file")
     async def _rename_file(self, path: str, new_name: str) -> ToolResult:
         if not path or not new_name:
             return ToolResult(success=False, output="", error="Need both path and new name.")
@@ -761,6 +1568,7 @@ class SystemControlTool(BaseTool):
         target.rename(target.parent / new_name)
         return ToolResult(success=True, output=f"Renamed to **{new_name}**")
 
+    @action("move_file")
     async def _move_file(self, source: str, dest: str) -> ToolResult:
         if not source or not dest:
             return ToolResult(success=False, output="", error="Need both source and destination.")
@@ -769,9 +1577,10 @@ class SystemControlTool(BaseTool):
             return ToolResult(success=False, output="", error=f"Not found: {source}")
         dst = Path(dest).expanduser()
         dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(src), str(dst))
+        await asyncio.to_thread(shutil.move, str(src), str(dst), _copy_file)
         return ToolResult(success=True, output=f"Moved **{src.name}** → **{dst}**")
 
+    @action("copy_file")
     async def _copy_file(self, source: str, dest: str) -> ToolResult:
         if not source or not dest:
             return ToolResult(success=False, output="", error="Need both source and destination.")
@@ -781,37 +1590,41 @@ class SystemControlTool(BaseTool):
         dst = Path(dest).expanduser()
         dst.parent.mkdir(parents=True, exist_ok=True)
         if src.is_dir():
-            shutil.copytree(str(src), str(dst))
+            await asyncio.to_thread(shutil.copytree, str(src), str(dst), copy_function=_copy_file)
         else:
-            shutil.copy2(str(src), str(dst))
+            await asyncio.to_thread(_copy_file, str(src), str(dst))
         return ToolResult(success=True, output=f"Copied **{src.name}** → **{dst}**")
 
     # ══════════════════════════════════════════════════════════════════════════
     #   CLIPBOARD / TYPING
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _type_text(self, text: str) -> ToolResult:
+    @action("type_text")
+    async def _type_text(self, text: str, _d: str = "") -> ToolResult:
         if not text:
             return ToolResult(success=False, output="", error="No text to type.")
-        try:
-            import time
-
-            import pyautogui
-            time.sleep(0.5)
-            if text.isascii():
-                pyautogui.typewrite(text, interval=0.02)
-            else:
-                self._clipboard_set(text)
-                pyautogui.hotkey("ctrl", "v")
-            return ToolResult(success=True, output=f"Typed text ({len(text)} chars)")
-        except ImportError:
+        if hasattr(ctypes, "windll"):
+            try:
+                await asyncio.to_thread(_send_text, text)
+                return ToolResult(success=True, output=f"Typed text ({len(text)} chars)")
+            except OSError as e:
+                logger.debug(f"SendInput failed ({e}), falling back to pyautogui")
+        if pyautogui is None:
             return ToolResult(success=False, output="", error="pyautogui needed: pip install pyautogui")
+        await asyncio.sleep(0.5)
+        if text.isascii():
+            await asyncio.to_thread(pyautogui.typewrite, text, interval=0.02)
+        else:
+            await asyncio.to_thread(self._clipboard_set, text)
+            await asyncio.to_thread(pyautogui.hotkey, "ctrl", "v")
+        return ToolResult(success=True, output=f"Typed text ({len(text)} chars)")
 
-    async def _copy_to_clipboard(self, text: str) -> ToolResult:
+    @action("copy_to_clipboard")
+    async def _copy_to_clipboard(self, text: str, _d: str = "") -> ToolResult:
         if not text:
             return ToolResult(success=False, output="", error="No text to copy.")
         try:
-            self._clipboard_set(text)
+            await asyncio.to_thread(self._clipboard_set, text)
             return ToolResult(success=True, output="Text copied to clipboard ✅")
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
@@ -819,8 +1632,13 @@ class SystemControlTool(BaseTool):
     @staticmethod
     def _clipboard_set(text: str) -> None:
         """Set clipboard safely — no command injection."""
+        try:
+            _clipboard_set_win32(text)
+            return
+        except Exception as e:
+            logger.debug(f"Win32 clipboard write failed ({e}), using PowerShell")
         proc = subprocess.Popen(
-            ["powershell", "-c", "Set-Clipboard -Value $input"],
+            [*_POWERSHELL, "Set-Clipboard -Value $input"],
             stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
         )
         proc.communicate(input=text.encode("utf-8"), timeout=5)
@@ -829,37 +1647,28 @@ class SystemControlTool(BaseTool):
     #   WINDOW MANAGEMENT
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _switch_window(self, title: str) -> ToolResult:
-        try:
-            subprocess.run(
-                ["powershell", "-c",
-                 f'(New-Object -ComObject WScript.Shell).AppActivate("{title}")'],
-                capture_output=True, timeout=5,
-            )
-            return ToolResult(success=True, output=f"Switched to **{title}**")
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
-
-    async def _close_window(self, title: str) -> ToolResult:
+    @action("switch_window")
+    async def _switch_window(self, title: str, _d: str = "") -> ToolResult:
         if not title:
-            try:
-                import pyautogui
-                pyautogui.hotkey("alt", "F4")
-                return ToolResult(success=True, output="Closed active window")
-            except ImportError:
-                pass
+            return ToolResult(success=False, output="", error="No window title given.")
+        matched = await asyncio.to_thread(_activate_window, title)
+        if matched is None:
+            return ToolResult(success=False, output="", error=f"No open window matching '{title}'")
+        return ToolResult(success=True, output=f"Switched to **{matched}**")
+
+    @action("close_window")
+    async def _close_window(self, title: str, _d: str = "") -> ToolResult:
+        if not title and pyautogui is not None:
+            await asyncio.to_thread(pyautogui.hotkey, "alt", "F4")
+            return ToolResult(success=True, output="Closed active window")
         return await self._close_app(title)
 
     # ══════════════════════════════════════════════════════════════════════════
     #   SYSTEM INFO / BATTERY
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _system_info(self) -> ToolResult:
-        try:
-            import psutil
-        except ImportError:
-            psutil = None
-
+    @action("system_info")
+    async def _system_info(self, _t: str = "", _d: str = "") -> ToolResult:
         uname = platform.uname()
         lines = [
             f"**Computer**: {uname.node}",
@@ -867,68 +1676,61 @@ class SystemControlTool(BaseTool):
             f"**Processor**: {uname.processor or platform.processor()}",
             f"**Architecture**: {uname.machine}",
         ]
-        if psutil:
-            mem = psutil.virtual_memory()
-            disk = psutil.disk_usage("/")
-            cpu = psutil.cpu_percent(interval=0.5)
+        if psutil is not None:
+            cpu, mem, disk, physical, logical, booted = await asyncio.to_thread(_host_stats)
             lines += [
                 f"**CPU Usage**: {cpu}%",
                 f"**RAM**: {mem.used // (1024**3):.1f} GB / {mem.total // (1024**3):.1f} GB ({mem.percent}%)",
                 f"**Disk**: {disk.used // (1024**3):.1f} GB / {disk.total // (1024**3):.1f} GB ({disk.percent}%)",
-                f"**Cores**: {psutil.cpu_count(logical=False)} physical / {psutil.cpu_count()} logical",
+                f"**Cores**: {physical} physical / {logical} logical",
             ]
-            boot = datetime.fromtimestamp(psutil.boot_time())
+            boot = datetime.fromtimestamp(booted)
             lines.append(f"**Boot Time**: {boot:%Y-%m-%d %H:%M}")
         else:
             lines.append("*(Install psutil for CPU/RAM/disk details)*")
         return ToolResult(success=True, output="\n".join(lines))
 
-    async def _battery_status(self) -> ToolResult:
-        try:
-            import psutil
-            batt = psutil.sensors_battery()
-            if batt is None:
-                return ToolResult(success=True, output="No battery detected — this is a desktop PC 🖥️")
-            plug = "🔌 Plugged in" if batt.power_plugged else "🔋 On battery"
-            time_left = ""
-            if batt.secsleft > 0 and not batt.power_plugged:
-                h, m = divmod(batt.secsleft, 3600)
-                m = m // 60
-                time_left = f" — ~{h}h {m}m left"
-            return ToolResult(success=True, output=f"Battery: **{batt.percent}%** {plug}{time_left}")
-        except ImportError:
+    @action("battery_status")
+    async def _battery_status(self, _t: str = "", _d: str = "") -> ToolResult:
+        if psutil is None:
             return ToolResult(success=False, output="", error="Install psutil: pip install psutil")
+        batt = psutil.sensors_battery()
+        if batt is None:
+            return ToolResult(success=True, output="No battery detected — this is a desktop PC 🖥️")
+        plug = "🔌 Plugged in" if batt.power_plugged else "🔋 On battery"
+        time_left = ""
+        if batt.secsleft > 0 and not batt.power_plugged:
+            h, m = divmod(batt.secsleft, 3600)
+            m = m // 60
+            time_left = f" — ~{h}h {m}m left"
+        return ToolResult(success=True, output=f"Battery: **{batt.percent}%** {plug}{time_left}")
 
     # ══════════════════════════════════════════════════════════════════════════
     #   PROCESS MANAGEMENT
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _list_processes(self) -> ToolResult:
-        try:
-            import psutil
-            procs = []
-            for p in sorted(
-                psutil.process_iter(["pid", "name", "memory_percent"]),
-                key=lambda x: x.info.get("memory_percent", 0) or 0,
-                reverse=True,
-            )[:20]:
-                i = p.info
-                procs.append(f"**{i['name']}** (PID {i['pid']}) — {i.get('memory_percent', 0):.1f}% RAM")
-            return ToolResult(success=True, output="Top 20 processes by memory:\n" + "\n".join(procs))
-        except ImportError:
-            r = subprocess.run(["tasklist", "/fo", "csv", "/nh"], capture_output=True, text=True, timeout=10)
+    @action("list_processes")
+    async def _list_processes(self, _t: str = "", _d: str = "") -> ToolResult:
+        if psutil is None:
+            r = await _run(["tasklist", "/fo", "csv", "/nh"], capture_output=True, text=True, timeout=10)
             return ToolResult(success=True, output="Processes:\n" + "\n".join(r.stdout.strip().splitlines()[:20]))
+        top = await asyncio.to_thread(_top_processes_by_memory, 20)
+        rows = "\n".join(
+            f"**{i['name']}** (PID {i['pid']}) — {i.get('memory_percent') or 0:.1f}% RAM" for i in top
+        )
+        return ToolResult(success=True, output="Top 20 processes by memory:\n" + rows)
 
-    async def _kill_process(self, target: str) -> ToolResult:
+    @action("kill_process")
+    async def _kill_process(self, target: str, _d: str = "") -> ToolResult:
         if not target:
             return ToolResult(success=False, output="", error="No process name or PID given.")
         try:
             pid = int(target)
-            subprocess.run(["taskkill", "/f", "/pid", str(pid)], capture_output=True, timeout=5)
+            await _run(["taskkill", "/f", "/pid", str(pid)], capture_output=True, timeout=5)
             return ToolResult(success=True, output=f"Killed process PID {pid}")
         except ValueError:
             name = target if target.endswith(".exe") else f"{target}.exe"
-            r = subprocess.run(["taskkill", "/f", "/im", name], capture_output=True, text=True, timeout=5)
+            r = await _run(["taskkill", "/f", "/im", name], capture_output=True, text=True, timeout=5)
             if r.returncode == 0:
                 return ToolResult(success=True, output=f"Killed **{target}**")
             return ToolResult(success=False, output="", error=f"Process not found: {target}")
@@ -937,35 +1739,44 @@ class SystemControlTool(BaseTool):
     #   WALLPAPER / SETTINGS / RECYCLE BIN
     # ══════════════════════════════════════════════════════════════════════════
 
-    async def _set_wallpaper(self, path: str) -> ToolResult:
+    @action("set_wallpaper")
+    async def _set_wallpaper(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No image path provided.")
         target = Path(path).expanduser().resolve()
         if not target.exists():
             return ToolResult(success=False, output="", error=f"Image not found: {path}")
         try:
-            import ctypes
-            ctypes.windll.user32.SystemParametersInfoW(0x0014, 0, str(target), 0x01 | 0x02)
+            # SPIF_SENDCHANGE broadcasts to every top-level window and can take a while
+            await asyncio.to_thread(
+                ctypes.windll.user32.SystemParametersInfoW, 0x0014, 0, str(target), 0x01 | 0x02,
+            )
             return ToolResult(success=True, output=f"Wallpaper set to **{target.name}** 🖼️")
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
 
-    async def _empty_recycle_bin(self) -> ToolResult:
-        try:
-            subprocess.run(
-                ["powershell", "-c", "Clear-RecycleBin -Force -ErrorAction SilentlyContinue"],
-                capture_output=True, timeout=15,
-            )
+    @action("empty_recycle_bin")
+    async def _empty_recycle_bin(self, _t: str = "", _d: str = "") -> ToolResult:
+        # All drives, no confirmation / progress dialog / sound; this can take
+        # a while for a big bin, hence the worker thread
+        hr = await asyncio.to_thread(
+            ctypes.windll.shell32.SHEmptyRecycleBinW,
+            None, None, _SHERB_NOCONFIRMATION | _SHERB_NOPROGRESSUI | _SHERB_NOSOUND,
+        )
+        if hr == 0 or hr & 0xFFFFFFFF == _E_UNEXPECTED:    # the latter: bin was already empty
             return ToolResult(success=True, output="Recycle Bin emptied 🗑️")
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+        return ToolResult(
+            success=False, output="",
+            error=f"Couldn't empty the Recycle Bin (HRESULT {hr & 0xFFFFFFFF:#010x})",
+        )
 
-    async def _open_settings(self, page: str) -> ToolResult:
+    @action("open_settings")
+    async def _open_settings(self, page: str, _d: str = "") -> ToolResult:
         if not page:
             os.startfile("ms-settings:")
             return ToolResult(success=True, output="Opened Windows Settings")
-        key = page.lower().strip()
-        uri = SETTINGS_MAP.get(key)
+        key = _SETTINGS_INDEX.resolve(page)
+        uri = SETTINGS_MAP[key] if key else None
         if uri:
             os.startfile(uri)
             return ToolResult(success=True, output=f"Opened **{page}** settings")
@@ -979,6 +1790,7 @@ class SystemControlTool(BaseTool):
     #   ZIP / UNZIP / PRINT / MEDIA KEYS
     # ══════════════════════════════════════════════════════════════════════════
 
+    @action("zip_files")
     async def _zip_files(self, source: str, dest: str) -> ToolResult:
         if not source:
             return ToolResult(success=False, output="", error="No source path for zip.")
@@ -986,16 +1798,11 @@ class SystemControlTool(BaseTool):
         if not src.exists():
             return ToolResult(success=False, output="", error=f"Not found: {source}")
         out = dest or str(src.parent / src.stem)
-        import zipfile
         archive = f"{out}.zip" if not out.endswith(".zip") else out
-        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
-            if src.is_dir():
-                for f in src.rglob("*"):
-                    zf.write(f, f.relative_to(src.parent))
-            else:
-                zf.write(src, src.name)
+        await asyncio.to_thread(_write_zip, src, Path(archive))
         return ToolResult(success=True, output=f"Created **{Path(archive).name}** 📦")
 
+    @action("unzip_file")
     async def _unzip_file(self, source: str, dest: str) -> ToolResult:
         if not source:
             return ToolResult(success=False, output="", error="No zip file path.")
@@ -1003,12 +1810,11 @@ class SystemControlTool(BaseTool):
         if not src.exists():
             return ToolResult(success=False, output="", error=f"Not found: {source}")
         out = dest or str(src.parent / src.stem)
-        import zipfile
-        with zipfile.ZipFile(str(src), "r") as zf:
-            zf.extractall(out)
+        await asyncio.to_thread(_extract_zip, src, out)
         return ToolResult(success=True, output=f"Extracted to **{out}** 📂")
 
-    async def _print_file(self, path: str) -> ToolResult:
+    @action("print_file")
+    async def _print_file(self, path: str, _d: str = "") -> ToolResult:
         if not path:
             return ToolResult(success=False, output="", error="No file path to print.")
         target = Path(path).expanduser()
@@ -1017,18 +1823,18 @@ class SystemControlTool(BaseTool):
         os.startfile(str(target), "print")
         return ToolResult(success=True, output=f"Printing **{target.name}** 🖨️")
 
-    async def _media_key(self, action: str) -> ToolResult:
-        vk_map = {"play_pause": "0xB3", "next": "0xB0", "previous": "0xB1"}
-        vk = vk_map.get(action, "0xB3")
-        ps = (
-            "Add-Type -TypeDefinition '"
-            "using System; using System.Runtime.InteropServices;"
-            "public class MK { "
-            "[DllImport(\"user32.dll\")] public static extern void keybd_event(byte k, byte s, uint f, UIntPtr e); "
-            "}';"
-            f"[MK]::keybd_event({vk},0,0,[UIntPtr]::Zero);"
-            f"[MK]::keybd_event({vk},0,2,[UIntPtr]::Zero)"
-        )
-        subprocess.run(["powershell", "-c", ps], capture_output=True, timeout=5)
-        labels = {"play_pause": "Play/Pause ⏯️", "next": "Next Track ⏭️", "previous": "Previous Track ⏮️"}
-        return ToolResult(success=True, output=labels.get(action, action))
+    @action("media_play_pause")
+    async def _media_play_pause(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._media_key("play_pause")
+
+    @action("media_next")
+    async def _media_next(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._media_key("next")
+
+    @action("media_previous")
+    async def _media_previous(self, _t: str = "", _d: str = "") -> ToolResult:
+        return await self._media_key("previous")
+
+    async def _media_key(self, key: str) -> ToolResult:
+        _press_keys(_MEDIA_KEYS.get(key, _MEDIA_KEYS["play_pause"]))
+        return ToolResult(success=True, output=_MEDIA_LABELS.get(key, key))
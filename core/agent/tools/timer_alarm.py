@@ -1,19 +1,23 @@
 """Timer, alarm, and stopwatch tool.
 
 Handles: set timer, set alarm, start/stop stopwatch.
-Uses threading for background countdown and system notifications.
+One background scheduler thread fires every timer and alarm.
 """
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import re
 import threading
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from core.agent.tools.base import BaseTool, ToolResult
+from core.agent.tools.reminders import _notify  # shares the long-lived PowerShell notifier host
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +27,23 @@ _stopwatch_start: Optional[float] = None
 _stopwatch_elapsed: float = 0.0
 _timer_lock = threading.Lock()
 
+# One scheduler thread drives a min-heap of (fire_at, timer_id). Cancelling
+# drops the id from _active_timers and prunes its heap entry, so nothing
+# lingers or fires; the loop still skips any id it no longer knows.
+_timer_heap: list[tuple[float, str]] = []
+_timer_cv = threading.Condition(_timer_lock)
+_scheduler: Optional[threading.Thread] = None
+_MAX_WAIT = 60.0   # re-check the wall clock at least this often (sleep/clock changes)
+_timer_ids = itertools.count(1)
 
+# "<number> <unit>"; the named group that matched says which unit it was
+_RE_DURATION = re.compile(
+    r'(?P<n>\d+)\s*(?:(?P<h>hours?|hrs?|h)|(?P<m>minutes?|mins?|m(?!s))|(?P<s>seconds?|secs?|s))'
+)
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+
+@lru_cache(maxsize=512)
 def _parse_duration(text: str) -> Optional[int]:
     """Parse a human duration string into seconds.
 
@@ -36,23 +56,15 @@ def _parse_duration(text: str) -> Optional[int]:
     if text.isdigit():
         return int(text)
 
-    total = 0
-    # hours
-    m = re.search(r'(\d+)\s*(?:hours?|hrs?|h)', text)
-    if m:
-        total += int(m.group(1)) * 3600
-    # minutes
-    m = re.search(r'(\d+)\s*(?:minutes?|mins?|m(?!s))', text)
-    if m:
-        total += int(m.group(1)) * 60
-    # seconds
-    m = re.search(r'(\d+)\s*(?:seconds?|secs?|s)', text)
-    if m:
-        total += int(m.group(1))
-
+    # One pass over the text; the first amount given for each unit counts
+    found: dict[str, int] = {}
+    for m in _RE_DURATION.finditer(text):
+        found.setdefault(m.lastgroup, int(m.group("n")))
+    total = sum(n * _UNIT_SECONDS[unit] for unit, n in found.items())
     return total if total > 0 else None
 
 
+@lru_cache(maxsize=1024)
 def _format_duration(seconds: int) -> str:
     """Format seconds into a readable string."""
     if seconds < 60:
@@ -71,47 +83,37 @@ def _format_duration(seconds: int) -> str:
     return " ".join(parts)
 
 
-def _notify(title: str, message: str) -> None:
-    """Show a Windows toast notification."""
-    try:
-        from plyer import notification
-        notification.notify(
-            title=title,
-            message=message,
-            app_name="Holex Beast",
-            timeout=10,
-        )
-        return
-    except Exception:
-        pass
-
-    # Fallback: PowerShell toast
-    try:
-        import subprocess
-        ps = (
-            "Add-Type -AssemblyName System.Windows.Forms;"
-            "$n = New-Object System.Windows.Forms.NotifyIcon;"
-            "$n.Icon = [System.Drawing.SystemIcons]::Information;"
-            "$n.Visible = $true;"
-            f"$n.ShowBalloonTip(5000, '{title}', '{message}', 'Info');"
-            "Start-Sleep -Seconds 6; $n.Dispose()"
-        )
-        subprocess.Popen(
-            ["powershell", "-c", ps],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        )
-    except Exception:
-        logger.warning(f"Could not show notification: {title} — {message}")
-
-
-def _timer_thread(timer_id: str, seconds: int, label: str) -> None:
-    """Background thread that counts down and fires notification."""
-    time.sleep(seconds)
-    with _timer_lock:
-        if timer_id in _active_timers:
-            del _active_timers[timer_id]
-    _notify("⏰ Timer Done!", f"{label} — {_format_duration(seconds)} elapsed")
-    logger.info(f"Timer '{label}' completed after {seconds}s")
+def _scheduler_loop() -> None:
+    """Wait for the earliest timer, fire it, repeat."""
+    while True:
+        with _timer_cv:
+            while True:
+                if not _timer_heap:
+                    _timer_cv.wait()
+                    continue
+                fire_at, timer_id = _timer_heap[0]
+                delay = fire_at - time.time()
+                if delay > 0:
+                    _timer_cv.wait(min(delay, _MAX_WAIT))
+                    continue
+                heapq.heappop(_timer_heap)
+                info = _active_timers.pop(timer_id, None)
+                if info is not None:
+                    break
+        _notify("⏰ Timer Done!", info["message"])
+        logger.info(f"Timer '{info['label']}' completed after {info['seconds']}s")
+
+
+def _schedule(timer_id: str, info: dict) -> None:
+    """Register a timer and wake the scheduler (starting it on first use)."""
+    global _scheduler
+    with _timer_cv:
+        _active_timers[timer_id] = info
+        heapq.heappush(_timer_heap, (info["fire_at"], timer_id))
+        if _scheduler is None:
+            _scheduler = threading.Thread(target=_scheduler_loop, name="timers", daemon=True)
+            _scheduler.start()
+        _timer_cv.notify()
 
 
 class TimerAlarmTool(BaseTool):
@@ -127,7 +129,10 @@ class TimerAlarmTool(BaseTool):
             "Set timers, alarms, and use a stopwatch. "
             "Timer: counts down and notifies (e.g., '5 minutes'). "
             "Alarm: fires at a specific time (e.g., '7:30 AM'). "
-            "Stopwatch: start, stop, lap, reset."
+            "Stopwatch: start, stop, lap, reset. "
+            "Examples: 'Set a timer for 5 minutes' -> set_timer/5 minutes; "
+            "'Set an alarm for 7:30 AM' -> set_alarm/7:30 AM; "
+            "'Start a stopwatch' -> stopwatch_start."
         )
 
     @property
@@ -203,18 +208,15 @@ class TimerAlarmTool(BaseTool):
         if not seconds:
             return ToolResult(success=False, output="", error=f"Could not parse duration: '{duration}'")
 
-        timer_id = f"timer_{int(time.time())}_{label or 'default'}"
         display_label = label or "Timer"
-        with _timer_lock:
-            _active_timers[timer_id] = {
-                "label": display_label,
-                "seconds": seconds,
-                "started": time.time(),
-            }
-        t = threading.Thread(
-            target=_timer_thread, args=(timer_id, seconds, display_label), daemon=True,
-        )
-        t.start()
+        now = time.time()
+        _schedule(f"timer_{next(_timer_ids)}", {
+            "label": display_label,
+            "seconds": seconds,
+            "started": now,
+            "fire_at": now + seconds,
+            "message": f"{display_label} — {_format_duration(seconds)} elapsed",
+        })
         return ToolResult(
             success=True,
             output=f"⏰ Timer set: **{display_label}** for {_format_duration(seconds)}",
@@ -230,6 +232,9 @@ class TimerAlarmTool(BaseTool):
                 to_remove = list(_active_timers.keys())
             for k in to_remove:
                 del _active_timers[k]
+            _timer_heap[:] = [e for e in _timer_heap if e[1] in _active_timers]
+            heapq.heapify(_timer_heap)
+            _timer_cv.notify()   # the earliest deadline may have just gone
         count = len(to_remove)
         return ToolResult(success=True, output=f"Cancelled {count} timer(s)")
 
@@ -274,21 +279,13 @@ class TimerAlarmTool(BaseTool):
 
         seconds_until = (alarm_time - now).total_seconds()
         display_label = label or "Alarm"
-        timer_id = f"alarm_{int(time.time())}_{display_label}"
-
-        with _timer_lock:
-            _active_timers[timer_id] = {
-                "label": display_label,
-                "seconds": int(seconds_until),
-                "started": time.time(),
-            }
-
-        t = threading.Thread(
-            target=_timer_thread,
-            args=(timer_id, int(seconds_until), f"🔔 {display_label}"),
-            daemon=True,
-        )
-        t.start()
+        _schedule(f"alarm_{next(_timer_ids)}", {
+            "label": display_label,
+            "seconds": int(seconds_until),
+            "started": time.time(),
+            "fire_at": alarm_time.timestamp(),
+            "message": f"🔔 {display_label} — {_format_duration(int(seconds_until))} elapsed",
+        })
 
         return ToolResult(
             success=True,
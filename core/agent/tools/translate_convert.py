@@ -8,8 +8,12 @@ Three capabilities in one tool:
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import re
+import urllib.parse
+import urllib.request
 from typing import Optional
 
 from core.agent.tools.base import BaseTool, ToolResult
@@ -83,6 +87,12 @@ _CONVERSION_TABLES = [
     ("time", _TIME_UNITS),
 ]
 
+# unit -> the table it belongs to (unit names are unique across tables)
+_UNIT_TABLE = {unit: table for _, table in _CONVERSION_TABLES for unit in table}
+
+# "<value> <unit> to|in|= <unit>", for conversions given as one sentence
+_RE_CONVERT = re.compile(r'([\d.]+)\s*([a-zA-Z°/]+)\s+(?:to|in|=)\s+([a-zA-Z°/]+)')
+
 
 def _convert_temperature(value: float, from_u: str, to_u: str) -> Optional[float]:
     """Handle temperature conversions."""
@@ -120,20 +130,47 @@ def _convert_units(value: float, from_unit: str, to_unit: str) -> Optional[str]:
     if temp_result is not None:
         return f"**{value} {from_unit}** = **{temp_result} {to_unit}**"
 
-    # Standard tables
-    for category, table in _CONVERSION_TABLES:
-        if fl in table and tl in table:
-            # Convert through base unit
-            base_value = value * table[fl]
-            result = base_value / table[tl]
-            # Clean up decimal
-            if result == int(result):
-                result = int(result)
-            else:
-                result = round(result, 6)
-            return f"**{value} {from_unit}** = **{result} {to_unit}**"
+    # Standard tables: both units must come from the same one
+    table = _UNIT_TABLE.get(fl)
+    if table is None or tl not in table:
+        return None
+    # Convert through base unit
+    base_value = value * table[fl]
+    result = base_value / table[tl]
+    # Clean up decimal
+    if result == int(result):
+        result = int(result)
+    else:
+        result = round(result, 6)
+    return f"**{value} {from_unit}** = **{result} {to_unit}**"
+
 
-    return None
+def _fetch_definition(word: str) -> Optional[str]:
+    """Look a word up on the Free Dictionary API; the formatted entry, or None."""
+    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{urllib.parse.quote(word)}"
+    req = urllib.request.Request(url, headers={"User-Agent": "Holex/1.0"})
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        data = json.loads(resp.read().decode())
+    if not isinstance(data, list) or not data:
+        return None
+
+    entry = data[0]
+    lines = [f"**{entry.get('word', word)}**"]
+    if entry.get("phonetic"):
+        lines[0] += f" ({entry['phonetic']})"
+
+    for meaning in entry.get("meanings", [])[:3]:
+        pos = meaning.get("partOfSpeech", "")
+        lines.append(f"\n*{pos}*")
+        for d in meaning.get("definitions", [])[:2]:
+            lines.append(f"- {d['definition']}")
+            if d.get("example"):
+                lines.append(f"  *\"{d['example']}\"*")
+
+        syns = meaning.get("synonyms", [])[:5]
+        if syns:
+            lines.append(f"  Synonyms: {', '.join(syns)}")
+    return "\n".join(lines)
 
 
 # ── Language codes for translation ──
@@ -155,6 +192,9 @@ LANG_CODES = {
 class TranslateConvertTool(BaseTool):
     """Translate text, convert units, and look up words."""
 
+    cacheable = True
+    cache_ttl = 3600.0  # definitions and translations don't change by the hour
+
     @property
     def name(self) -> str:
         return "translate_convert"
@@ -167,7 +207,10 @@ class TranslateConvertTool(BaseTool):
             "(e.g., 'translate hello to Hindi'). "
             "2) Convert units (length, weight, temperature, volume, "
             "speed, data, time — e.g., '5 miles to km', '100°F to °C'). "
-            "3) Dictionary lookup (definition and synonyms)."
+            "3) Dictionary lookup (definition and synonyms). "
+            "Examples: 'Translate hello to Spanish' -> translate with "
+            "text=hello, to_lang=Spanish; 'Convert 5 miles to km' -> "
+            "convert/5 miles to km; 'Define serendipity' -> define/serendipity."
         )
 
     @property
@@ -241,7 +284,8 @@ class TranslateConvertTool(BaseTool):
         # Try deep_translator (pip install deep-translator)
         try:
             from deep_translator import GoogleTranslator
-            result = GoogleTranslator(source=src_code, target=dest_code).translate(text)
+            # Blocking HTTP call - keep it off the event loop
+            result = await asyncio.to_thread(GoogleTranslator(source=src_code, target=dest_code).translate, text)
             return ToolResult(
                 success=True,
                 output=f"**{src}** → **{dest}**:\n\n> {result}",
@@ -253,7 +297,7 @@ class TranslateConvertTool(BaseTool):
         try:
             from googletrans import Translator
             translator = Translator()
-            result = translator.translate(text, src=src_code, dest=dest_code)
+            result = await asyncio.to_thread(translator.translate, text, src=src_code, dest=dest_code)
             return ToolResult(
                 success=True,
                 output=f"**{src}** → **{dest}**:\n\n> {result.text}",
@@ -269,10 +313,7 @@ class TranslateConvertTool(BaseTool):
     def _convert(self, value: float, from_u: str, to_u: str, text: str) -> ToolResult:
         # If value/units weren't passed separately, try parsing from text
         if (not from_u or not to_u) and text:
-            m = re.match(
-                r'([\d.]+)\s*([a-zA-Z°/]+)\s+(?:to|in|=)\s+([a-zA-Z°/]+)',
-                text.strip(),
-            )
+            m = _RE_CONVERT.match(text.strip())
             if m:
                 value = float(m.group(1))
                 from_u = m.group(2)
@@ -295,32 +336,9 @@ class TranslateConvertTool(BaseTool):
 
         # Try Free Dictionary API
         try:
-            import json
-            import urllib.request
-            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.strip()}"
-            req = urllib.request.Request(url, headers={"User-Agent": "Holex/1.0"})
-            resp = urllib.request.urlopen(req, timeout=5)
-            data = json.loads(resp.read().decode())
-
-            if isinstance(data, list) and data:
-                entry = data[0]
-                lines = [f"**{entry.get('word', word)}**"]
-                if entry.get("phonetic"):
-                    lines[0] += f" ({entry['phonetic']})"
-
-                for meaning in entry.get("meanings", [])[:3]:
-                    pos = meaning.get("partOfSpeech", "")
-                    lines.append(f"\n*{pos}*")
-                    for d in meaning.get("definitions", [])[:2]:
-                        lines.append(f"- {d['definition']}")
-                        if d.get("example"):
-                            lines.append(f"  *\"{d['example']}\"*")
-
-                    syns = meaning.get("synonyms", [])[:5]
-                    if syns:
-                        lines.append(f"  Synonyms: {', '.join(syns)}")
-
-                return ToolResult(success=True, output="\n".join(lines))
+            definition = await asyncio.to_thread(_fetch_definition, word.strip())
+            if definition:
+                return ToolResult(success=True, output=definition)
         except Exception:
             pass
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from core.agent.tools.base import BaseTool, ToolResult
 
@@ -18,10 +19,18 @@ WEATHER_CODES = {
     95: "⛈️ Thunderstorm", 96: "⛈️ Thunderstorm + hail", 99: "⛈️ Heavy hail",
 }
 
+# Cities don't move: city -> (expires_at, (lat, lon, display name))
+_GEO_CACHE: dict[str, tuple[float, tuple[float, float, str]]] = {}
+_GEO_TTL = 86400.0
+_GEO_CACHE_MAX = 512
+
 
 class WeatherTool(BaseTool):
     """Get weather forecast using Open-Meteo. No API key required."""
 
+    cacheable = True
+    cache_ttl = 600.0  # forecasts barely move in 10 minutes
+
     @property
     def name(self) -> str:
         return "weather"
@@ -30,7 +39,8 @@ class WeatherTool(BaseTool):
     def description(self) -> str:
         return (
             "Get current weather and 3-day forecast for any city. "
-            "Returns temperature, conditions, humidity, wind speed."
+            "Returns temperature, conditions, humidity, wind speed. "
+            "Example: 'What's the weather in Mumbai?' -> city=Mumbai."
         )
 
     @property
@@ -48,10 +58,15 @@ class WeatherTool(BaseTool):
 
     async def execute(self, city: str, **kwargs) -> ToolResult:
         try:
-            import httpx
-
-            # Step 1: Geocode city name to coordinates
-            async with httpx.AsyncClient(timeout=10) as client:
+            client = self._http_client()
+
+            # Step 1: Geocode city name to coordinates (cached per city)
+            key = city.lower().strip()
+            now = time.monotonic()
+            hit = _GEO_CACHE.get(key)
+            if hit and hit[0] > now:
+                lat, lon, city_name = hit[1]
+            else:
                 geo_resp = await client.get(
                     "https://geocoding-api.open-meteo.com/v1/search",
                     params={"name": city, "count": 1, "language": "en"},
@@ -67,23 +82,27 @@ class WeatherTool(BaseTool):
                 loc = geo_data["results"][0]
                 lat, lon = loc["latitude"], loc["longitude"]
                 city_name = f"{loc['name']}, {loc.get('country', '')}"
-
-                # Step 2: Get weather data
-                weather_resp = await client.get(
-                    "https://api.open-meteo.com/v1/forecast",
-                    params={
-                        "latitude": lat,
-                        "longitude": lon,
-                        "current": (
-                            "temperature_2m,relative_humidity_2m,"
-                            "weather_code,wind_speed_10m,apparent_temperature"
-                        ),
-                        "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max",
-                        "timezone": "auto",
-                        "forecast_days": 3,
-                    },
-                )
-                data = weather_resp.json()
+                _GEO_CACHE.pop(key, None)
+                if len(_GEO_CACHE) >= _GEO_CACHE_MAX:
+                    del _GEO_CACHE[next(iter(_GEO_CACHE))]    # oldest insertion
+                _GEO_CACHE[key] = (now + _GEO_TTL, (lat, lon, city_name))
+
+            # Step 2: Get weather data
+            weather_resp = await client.get(
+                "https://api.open-meteo.com/v1/forecast",
+                params={
+                    "latitude": lat,
+                    "longitude": lon,
+                    "current": (
+                        "temperature_2m,relative_humidity_2m,"
+                        "weather_code,wind_speed_10m,apparent_temperature"
+                    ),
+                    "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max",
+                    "timezone": "auto",
+                    "forecast_days": 3,
+                },
+            )
+            data = weather_resp.json()
 
             current = data["current"]
             daily = data["daily"]
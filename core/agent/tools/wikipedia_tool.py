@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from core.agent.tools.base import BaseTool, ToolResult
@@ -9,9 +10,22 @@ from core.agent.tools.base import BaseTool, ToolResult
 logger = logging.getLogger(__name__)
 
 
+def _first_sentences(text: str, n: int) -> str:
+    """Cut text after its nth ". ", stopping the scan there instead of splitting it all."""
+    end = -1
+    for _ in range(n):
+        end = text.find(". ", end + 1)
+        if end < 0:
+            return text
+    return text[:end] + "." if end >= 0 else text
+
+
 class WikipediaTool(BaseTool):
     """Look up factual information from Wikipedia."""
 
+    cacheable = True
+    cache_ttl = 3600.0  # article summaries rarely change
+
     @property
     def name(self) -> str:
         return "wikipedia"
@@ -42,66 +56,72 @@ class WikipediaTool(BaseTool):
             "required": ["topic"],
         }
 
+    @staticmethod
+    async def _summary(client, title: str):
+        return await client.get(
+            f"https://en.wikipedia.org/api/rest_v1/page/summary/{title.replace(' ', '_')}",
+            headers={"User-Agent": "HolexBeast/1.0"},
+            follow_redirects=True,
+        )
+
+    @staticmethod
+    async def _suggestions(client, topic: str) -> list[str]:
+        resp = await client.get(
+            "https://en.wikipedia.org/w/api.php",
+            params={
+                "action": "opensearch",
+                "search": topic,
+                "limit": 3,
+                "format": "json",
+            },
+        )
+        data = resp.json()
+        return data[1] if len(data) > 1 else []
+
     async def execute(self, topic: str, sentences: int = 5, **kwargs) -> ToolResult:
         try:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=10) as client:
-                # Use Wikipedia REST API
-                resp = await client.get(
-                    f"https://en.wikipedia.org/api/rest_v1/page/summary/{topic.replace(' ', '_')}",
-                    headers={"User-Agent": "HolexBeast/1.0"},
-                    follow_redirects=True,
-                )
-
+            client = self._http_client()
+
+            # Use Wikipedia REST API. The search that a 404 falls back on is
+            # started alongside, so a miss costs two round trips, not three.
+            summary = asyncio.create_task(self._summary(client, topic))
+            search = asyncio.create_task(self._suggestions(client, topic))
+            try:
+                resp = await summary
                 if resp.status_code == 404:
-                    # Try search
-                    search_resp = await client.get(
-                        "https://en.wikipedia.org/w/api.php",
-                        params={
-                            "action": "opensearch",
-                            "search": topic,
-                            "limit": 3,
-                            "format": "json",
-                        },
-                    )
-                    search_data = search_resp.json()
-                    suggestions = search_data[1] if len(search_data) > 1 else []
-
-                    if suggestions:
-                        # Try first suggestion
-                        resp = await client.get(
-                            f"https://en.wikipedia.org/api/rest_v1/page/summary/{suggestions[0].replace(' ', '_')}",
-                            headers={"User-Agent": "HolexBeast/1.0"},
-                            follow_redirects=True,
-                        )
-                    else:
+                    suggestions = await search
+                    if not suggestions:
                         return ToolResult(
                             success=False, output="",
                             error=f"No Wikipedia article found for '{topic}'",
                         )
+                    # Try first suggestion
+                    resp = await self._summary(client, suggestions[0])
+            finally:
+                if not search.done():
+                    search.cancel()
+                elif not search.cancelled():
+                    search.exception()  # a failed, unneeded search is not worth a warning
+
+            if resp.status_code != 200:
+                return ToolResult(
+                    success=False, output="",
+                    error=f"Wikipedia API returned status {resp.status_code}",
+                )
 
-                if resp.status_code != 200:
-                    return ToolResult(
-                        success=False, output="",
-                        error=f"Wikipedia API returned status {resp.status_code}",
-                    )
-
-                data = resp.json()
-                title = data.get("title", topic)
-                extract = data.get("extract", "No content available.")
-                url = data.get("content_urls", {}).get("desktop", {}).get("page", "")
+            data = resp.json()
+            title = data.get("title", topic)
+            extract = data.get("extract", "No content available.")
+            url = data.get("content_urls", {}).get("desktop", {}).get("page", "")
 
-                # Trim to requested sentences
-                sents = extract.split(". ")
-                if len(sents) > sentences:
-                    extract = ". ".join(sents[:sentences]) + "."
+            # Trim to requested sentences
+            extract = _first_sentences(extract, sentences)
 
-                output = f"## 📚 {title}\n\n{extract}"
-                if url:
-                    output += f"\n\n🔗 [Read more on Wikipedia]({url})"
+            output = f"## 📚 {title}\n\n{extract}"
+            if url:
+                output += f"\n\n🔗 [Read more on Wikipedia]({url})"
 
-                return ToolResult(success=True, output=output, data=data)
+            return ToolResult(success=True, output=output, data=data)
 
         except ImportError:
             return ToolResult(
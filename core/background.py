@@ -0,0 +1,45 @@
+"""One long-lived event loop for backend work started from sync code.
+
+The GUI and startup code used to spin up a fresh loop per request. Pooled
+HTTP clients (LLM providers, tools) are bound to the loop that created
+them, so a new loop per request meant a new client - and a fresh TCP/TLS
+handshake - every time, with the old client never closed. Everything now
+runs on this loop instead, so connections opened while initialising are
+still warm for the first request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The shared backend loop, started on a daemon thread on first use."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="holex-loop", daemon=True).start()
+        return _loop
+
+
+def run(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run coro on the shared loop and block the calling thread for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def close_on(client: Any, loop: Optional[asyncio.AbstractEventLoop]) -> Optional[concurrent.futures.Future]:
+    """
+    Schedule client.aclose() on the loop that owns client. Returns the
+    concurrent future, or None if that loop is no longer running (its
+    sockets went with it; there is nothing left to await).
+    """
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return None
+    return asyncio.run_coroutine_threadsafe(client.aclose(), loop)
@@ -0,0 +1,59 @@
+"""
+JSON helpers that use orjson when it's installed.
+
+Falls back to the stdlib json module with matching behaviour, so callers
+never need to care which one is doing the work. Decode errors are always
+json.JSONDecodeError (orjson's error subclasses it).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (indent=True means two-space indent)."""
+    if orjson is not None:
+        option = 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(
+        obj, sort_keys=sort_keys, indent=2 if indent else None,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    """Serialize to a JSON string."""
+    return dumps_bytes(obj, sort_keys=sort_keys, indent=indent).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from a str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_with_raw(obj: dict, raw: dict[str, bytes]) -> bytes:
+    """
+    Serialize a dict, splicing in values that are already JSON-encoded.
+    Lets callers reuse a pre-serialized blob (e.g. static tool schemas)
+    instead of re-encoding it on every request.
+    """
+    body = dumps_bytes(obj)
+    if not raw:
+        return body
+    extra = b",".join(dumps_bytes(key) + b":" + value for key, value in raw.items())
+    return body[:-1] + (b"," if obj else b"") + extra + b"}"
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional, Union
+
+from core import background
 
 
 class Role(str, Enum):
@@ -64,6 +67,16 @@ class Message:
         return cls(role=Role.TOOL, content=content, name=name, tool_call_id=tool_call_id)
 
 
+# Conversation entries are usually Message objects, but hot paths (tool
+# results in the agent loop) may pass ready-made OpenAI-format dicts.
+MessageLike = Union[Message, dict]
+
+
+def to_wire(messages: list[MessageLike]) -> list[dict]:
+    """OpenAI-format dicts for a message list; pre-built dicts pass through."""
+    return [m if isinstance(m, dict) else m.to_dict() for m in messages]
+
+
 @dataclass
 class LLMResponse:
     """Response from an LLM provider."""
@@ -114,6 +127,46 @@ class BaseLLMProvider(ABC):
     def __init__(self, name: str):
         self.name = name
         self._is_available = False
+        self._client: Any = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @abstractmethod
+    def _get_client(self) -> Any:
+        """Build a new HTTP client for this provider."""
+        ...
+
+    def _shared_client(self) -> Any:
+        """
+        Return a pooled HTTP client for the running event loop.
+
+        Back-to-back requests (e.g. every iteration of the agent's tool
+        loop) reuse open keep-alive connections instead of paying for a
+        new TCP + TLS handshake. The app runs all backend work on one
+        long-lived loop (core.background), so normally the client lives
+        as long as the provider. Connections can't cross loops, though:
+        if the loop does change, a new client is built and the old one is
+        closed on its own loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            if self._client is not None and self._client_loop is not loop:
+                background.close_on(self._client, self._client_loop)
+            self._client = self._get_client()
+            self._client_loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled client, on whichever loop it belongs to."""
+        client, loop = self._client, self._client_loop
+        self._client, self._client_loop = None, None
+        if client is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await client.aclose()
+        else:
+            future = background.close_on(client, loop)
+            if future is not None:
+                await asyncio.wrap_future(future)
 
     @abstractmethod
     async def initialize(self) -> bool:
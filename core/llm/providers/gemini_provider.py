@@ -7,18 +7,19 @@ Supports function calling, vision, and streaming.
 
 from __future__ import annotations
 
-import json
 import logging
 import time
 from typing import AsyncGenerator, Optional
 
 import httpx
 
+from core import fastjson
 from core.exceptions import LLMError, RateLimitError
 from core.llm.base import (
     BaseLLMProvider,
     LLMResponse,
     Message,
+    MessageLike,
     ModelInfo,
     Role,
     StreamChunk,
@@ -38,9 +39,10 @@ class GeminiProvider(BaseLLMProvider):
         self.api_key = api_key
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Fresh per-request client to avoid cross-event-loop issues."""
+        """Build a client; use _shared_client() to get the pooled one."""
         return httpx.AsyncClient(
             timeout=httpx.Timeout(90.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=60.0),
             headers={"x-goog-api-key": self.api_key},
         )
 
@@ -61,12 +63,23 @@ class GeminiProvider(BaseLLMProvider):
             self._is_available = False
             return False
 
-    def _convert_messages(self, messages: list[Message]) -> tuple[str, list[dict]]:
-        """Convert Message objects to Gemini API format."""
+    def _convert_messages(self, messages: list[MessageLike]) -> tuple[str, list[dict]]:
+        """Convert Message objects (or OpenAI-format dicts) to Gemini API format."""
         system_instruction = ""
         contents = []
 
         for msg in messages:
+            if isinstance(msg, dict):
+                if msg.get("role") == "tool":
+                    contents.append({
+                        "role": "function",
+                        "parts": [{"functionResponse": {
+                            "name": msg.get("name") or "tool",
+                            "response": {"result": msg.get("content", "")}
+                        }}]
+                    })
+                    continue
+                msg = Message(role=Role(msg["role"]), content=msg.get("content", ""))
             if msg.role == Role.SYSTEM:
                 system_instruction = msg.content
             elif msg.role == Role.USER:
@@ -139,7 +152,7 @@ class GeminiProvider(BaseLLMProvider):
             if gemini_tools:
                 payload["tools"] = gemini_tools
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
             resp = await client.post(url, json=payload)
 
@@ -147,7 +160,7 @@ class GeminiProvider(BaseLLMProvider):
                 raise RateLimitError("gemini")
             resp.raise_for_status()
 
-            data = resp.json()
+            data = fastjson.loads(resp.content)
             candidate = data["candidates"][0]
             content_parts = candidate["content"]["parts"]
             text = "".join(p.get("text", "") for p in content_parts)
@@ -172,8 +185,6 @@ class GeminiProvider(BaseLLMProvider):
             raise LLMError(f"Gemini API error: {e.response.status_code} - {e.response.text}")
         except Exception as e:
             raise LLMError(f"Gemini request failed: {e}")
-        finally:
-            await client.aclose()
 
     async def stream(
         self,
@@ -204,7 +215,7 @@ class GeminiProvider(BaseLLMProvider):
                 "parts": [{"text": system_instruction}]
             }
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
             async with client.stream("POST", url, json=payload) as resp:
                 if resp.status_code == 429:
@@ -218,7 +229,7 @@ class GeminiProvider(BaseLLMProvider):
                     if not data_str:
                         continue
                     try:
-                        data = json.loads(data_str)
+                        data = fastjson.loads(data_str)
                         candidates = data.get("candidates", [])
                         if candidates:
                             parts = candidates[0].get("content", {}).get("parts", [])
@@ -230,7 +241,7 @@ class GeminiProvider(BaseLLMProvider):
                                     model=model,
                                     provider="gemini",
                                 )
-                    except json.JSONDecodeError:
+                    except fastjson.JSONDecodeError:
                         continue
 
             yield StreamChunk(content="", is_final=True, model=model, provider="gemini")
@@ -239,8 +250,6 @@ class GeminiProvider(BaseLLMProvider):
             raise
         except Exception as e:
             raise LLMError(f"Gemini stream failed: {e}")
-        finally:
-            await client.aclose()
 
     def _convert_tools(self, openai_tools: list[dict]) -> list[dict]:
         """Convert OpenAI tool format to Gemini function declarations."""
@@ -259,7 +268,7 @@ class GeminiProvider(BaseLLMProvider):
 
     async def get_models(self) -> list[ModelInfo]:
         """Return available Gemini models."""
-        client = self._get_client()
+        client = self._shared_client()
         try:
             url = f"{GEMINI_API_BASE}/models"
             resp = await client.get(url)
@@ -267,10 +276,3 @@ class GeminiProvider(BaseLLMProvider):
             return GEMINI_MODELS
         except Exception:
             return []
-        finally:
-            await client.aclose()
-
-    async def close(self) -> None:
-        """Nothing to clean up — clients are closed after each request."""
-        pass
-        pass
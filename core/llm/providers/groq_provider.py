@@ -8,6 +8,7 @@ from typing import AsyncGenerator, Optional
 
 import httpx
 
+from core import fastjson
 from core.exceptions import LLMError, RateLimitError
 from core.llm.base import (
     BaseLLMProvider,
@@ -15,6 +16,7 @@ from core.llm.base import (
     Message,
     ModelInfo,
     StreamChunk,
+    to_wire,
 )
 from core.llm.models import GROQ_MODELS
 
@@ -30,7 +32,7 @@ class GroqProvider(BaseLLMProvider):
         self.base_url = base_url
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Get a fresh httpx client (avoids cross-event-loop issues)."""
+        """Build a client; use _shared_client() to get the pooled one."""
         return httpx.AsyncClient(
             base_url=self.base_url,
             headers={
@@ -38,6 +40,7 @@ class GroqProvider(BaseLLMProvider):
                 "Content-Type": "application/json",
             },
             timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=60.0),
         )
 
     async def initialize(self) -> bool:
@@ -64,6 +67,7 @@ class GroqProvider(BaseLLMProvider):
         temperature: float = 0.7,
         max_tokens: int = 4096,
         tools: Optional[list[dict]] = None,
+        tools_json: Optional[bytes] = None,
         **kwargs,
     ) -> LLMResponse:
         """Generate a complete response via Groq."""
@@ -72,25 +76,31 @@ class GroqProvider(BaseLLMProvider):
 
         payload: dict = {
             "model": model,
-            "messages": [m.to_dict() for m in messages],
+            "messages": to_wire(messages),
             "temperature": temperature,
             "max_tokens": max_tokens,
             "stream": False,
         }
-        if tools:
+        raw: dict[str, bytes] = {}
+        if tools_json:
+            raw["tools"] = tools_json
+            payload["tool_choice"] = "auto"
+        elif tools:
             payload["tools"] = tools
             payload["tool_choice"] = "auto"
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
-            resp = await client.post("/chat/completions", json=payload)
+            resp = await client.post(
+                "/chat/completions", content=fastjson.dumps_with_raw(payload, raw),
+            )
 
             if resp.status_code == 429:
                 retry_after = float(resp.headers.get("retry-after", 60))
                 raise RateLimitError("groq", retry_after)
 
             resp.raise_for_status()
-            data = resp.json()
+            data = fastjson.loads(resp.content)
 
             choice = data["choices"][0]
             usage = data.get("usage", {})
@@ -115,8 +125,6 @@ class GroqProvider(BaseLLMProvider):
             raise
         except Exception as e:
             raise LLMError(f"Groq request failed: {type(e).__name__}: {e}")
-        finally:
-            await client.aclose()
 
     async def stream(
         self,
@@ -131,13 +139,13 @@ class GroqProvider(BaseLLMProvider):
 
         payload = {
             "model": model,
-            "messages": [m.to_dict() for m in messages],
+            "messages": to_wire(messages),
             "temperature": temperature,
             "max_tokens": max_tokens,
             "stream": True,
         }
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
             async with client.stream(
                 "POST", "/chat/completions", json=payload
@@ -154,8 +162,7 @@ class GroqProvider(BaseLLMProvider):
                         yield StreamChunk(content="", is_final=True, model=model, provider="groq")
                         break
 
-                    import json
-                    data = json.loads(data_str)
+                    data = fastjson.loads(data_str)
                     delta = data["choices"][0].get("delta", {})
                     content = delta.get("content", "")
                     if content:
@@ -170,21 +177,13 @@ class GroqProvider(BaseLLMProvider):
             raise
         except Exception as e:
             raise LLMError(f"Groq stream failed: {e}")
-        finally:
-            await client.aclose()
 
     async def get_models(self) -> list[ModelInfo]:
         """Return available Groq models."""
-        client = self._get_client()
+        client = self._shared_client()
         try:
             resp = await client.get("/models")
             resp.raise_for_status()
             return GROQ_MODELS
         except Exception:
             return []
-        finally:
-            await client.aclose()
-
-    async def close(self) -> None:
-        """Cleanup (per-request clients are closed after each request)."""
-        pass
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import time
 from typing import AsyncGenerator, Optional
 
 import httpx
 
+from core import fastjson
 from core.exceptions import LLMError
 from core.llm.base import (
     BaseLLMProvider,
@@ -16,6 +16,7 @@ from core.llm.base import (
     Message,
     ModelInfo,
     StreamChunk,
+    to_wire,
 )
 from core.llm.models import OLLAMA_MODELS
 
@@ -31,19 +32,20 @@ class OllamaProvider(BaseLLMProvider):
         self._installed_models: list[str] = []
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Get a fresh httpx client (avoids cross-event-loop issues)."""
+        """Build a client; use _shared_client() to get the pooled one."""
         return httpx.AsyncClient(
             base_url=self.base_url,
             timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=60.0),
         )
 
     async def initialize(self) -> bool:
         """Initialize and check if Ollama is running."""
-        client = self._get_client()
+        client = self._shared_client()
         try:
             resp = await client.get("/api/tags")
             if resp.status_code == 200:
-                data = resp.json()
+                data = fastjson.loads(resp.content)
                 self._installed_models = [
                     m["name"] for m in data.get("models", [])
                 ]
@@ -63,8 +65,6 @@ class OllamaProvider(BaseLLMProvider):
             logger.error(f"Ollama initialization failed: {e}")
             self._is_available = False
             return False
-        finally:
-            await client.aclose()
 
     async def generate(
         self,
@@ -73,6 +73,7 @@ class OllamaProvider(BaseLLMProvider):
         temperature: float = 0.7,
         max_tokens: int = 4096,
         tools: Optional[list[dict]] = None,
+        tools_json: Optional[bytes] = None,
         **kwargs,
     ) -> LLMResponse:
         """Generate a complete response via Ollama."""
@@ -81,21 +82,28 @@ class OllamaProvider(BaseLLMProvider):
 
         payload: dict = {
             "model": model,
-            "messages": [m.to_dict() for m in messages],
+            "messages": to_wire(messages),
             "stream": False,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
             },
         }
-        if tools:
+        raw: dict[str, bytes] = {}
+        if tools_json:
+            raw["tools"] = tools_json
+        elif tools:
             payload["tools"] = tools
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
-            resp = await client.post("/api/chat", json=payload)
+            resp = await client.post(
+                "/api/chat",
+                content=fastjson.dumps_with_raw(payload, raw),
+                headers={"Content-Type": "application/json"},
+            )
             resp.raise_for_status()
-            data = resp.json()
+            data = fastjson.loads(resp.content)
 
             return LLMResponse(
                 content=data.get("message", {}).get("content", ""),
@@ -116,8 +124,6 @@ class OllamaProvider(BaseLLMProvider):
             raise LLMError("Ollama server not running. Start with: ollama serve")
         except Exception as e:
             raise LLMError(f"Ollama request failed: {e}")
-        finally:
-            await client.aclose()
 
     async def stream(
         self,
@@ -132,7 +138,7 @@ class OllamaProvider(BaseLLMProvider):
 
         payload = {
             "model": model,
-            "messages": [m.to_dict() for m in messages],
+            "messages": to_wire(messages),
             "stream": True,
             "options": {
                 "temperature": temperature,
@@ -140,7 +146,7 @@ class OllamaProvider(BaseLLMProvider):
             },
         }
 
-        client = self._get_client()
+        client = self._shared_client()
         try:
             async with client.stream(
                 "POST", "/api/chat", json=payload
@@ -150,7 +156,7 @@ class OllamaProvider(BaseLLMProvider):
                     if not line.strip():
                         continue
                     try:
-                        data = json.loads(line)
+                        data = fastjson.loads(line)
                         content = data.get("message", {}).get("content", "")
                         done = data.get("done", False)
 
@@ -169,23 +175,21 @@ class OllamaProvider(BaseLLMProvider):
                                 provider="ollama",
                             )
                             break
-                    except json.JSONDecodeError:
+                    except fastjson.JSONDecodeError:
                         continue
 
         except httpx.ConnectError:
             raise LLMError("Ollama server not running")
         except Exception as e:
             raise LLMError(f"Ollama stream failed: {e}")
-        finally:
-            await client.aclose()
 
     async def get_models(self) -> list[ModelInfo]:
         """Return locally installed Ollama models."""
-        client = self._get_client()
+        client = self._shared_client()
         try:
             resp = await client.get("/api/tags")
             resp.raise_for_status()
-            data = resp.json()
+            data = fastjson.loads(resp.content)
 
             models = []
             for m in data.get("models", []):
@@ -204,46 +208,35 @@ class OllamaProvider(BaseLLMProvider):
             return models
         except Exception:
             return []
-        finally:
-            await client.aclose()
 
     async def pull_model(self, model: str) -> AsyncGenerator[dict, None]:
         """Pull/download a model. Yields progress updates."""
-        client = self._get_client()
-        try:
-            async with client.stream(
-                "POST", "/api/pull", json={"name": model}
-            ) as resp:
-                async for line in resp.aiter_lines():
-                    if line.strip():
-                        try:
-                            yield json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-        finally:
-            await client.aclose()
+        client = self._shared_client()
+        async with client.stream(
+            "POST", "/api/pull", json={"name": model}
+        ) as resp:
+            async for line in resp.aiter_lines():
+                if line.strip():
+                    try:
+                        yield fastjson.loads(line)
+                    except fastjson.JSONDecodeError:
+                        continue
 
     async def generate_embeddings(
         self, text: str, model: str = "nomic-embed-text"
     ) -> list[float]:
         """Generate embeddings using Ollama (for RAG)."""
-        client = self._get_client()
+        client = self._shared_client()
         try:
             resp = await client.post(
                 "/api/embeddings",
                 json={"model": model, "prompt": text},
             )
             resp.raise_for_status()
-            return resp.json().get("embedding", [])
+            return fastjson.loads(resp.content).get("embedding", [])
         except Exception as e:
             raise LLMError(f"Ollama embeddings failed: {e}")
-        finally:
-            await client.aclose()
 
     @property
     def installed_models(self) -> list[str]:
         return self._installed_models
-
-    async def close(self) -> None:
-        """Cleanup (per-request clients are closed after each request)."""
-        pass
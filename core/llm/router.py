@@ -25,6 +25,7 @@ from core.llm.base import (
     BaseLLMProvider,
     LLMResponse,
     Message,
+    MessageLike,
     ModelInfo,
     Role,
     StreamChunk,
@@ -288,18 +289,23 @@ class LLMRouter:
 
     async def generate(
         self,
-        messages: list[Message],
+        messages: list[MessageLike],
         provider: Optional[str] = None,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         tools: Optional[list[dict]] = None,
         auto_route: bool = True,
+        tools_json: Optional[bytes] = None,
     ) -> LLMResponse:
         """
         Generate a response with automatic failover.
         If auto_route=True (default), picks the best model based on
         the last user message's complexity.
+
+        tools_json is an optional pre-serialized copy of `tools`; providers
+        that send OpenAI-format tools verbatim splice it into the request
+        body instead of re-encoding the schemas every call.
         """
         provider = provider or self._current_provider
         model = model or self._current_model
@@ -369,6 +375,7 @@ class LLMRouter:
                     temperature=temperature,
                     max_tokens=max_tokens,
                     tools=tools,
+                    tools_json=tools_json,
                 )
                 self._request_count += 1
                 self._total_tokens += response.tokens_used
@@ -402,7 +409,7 @@ class LLMRouter:
 
     async def stream(
         self,
-        messages: list[Message],
+        messages: list[MessageLike],
         provider: Optional[str] = None,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
@@ -64,7 +65,7 @@ class RAGPipeline:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         # Parse document
-        text = self._parse_file(path)
+        text = await asyncio.to_thread(self._parse_file, path)
         if not text.strip():
             return {"error": "No text content found in file"}
 
@@ -91,8 +92,10 @@ class RAGPipeline:
                 "file_type": path.suffix.lower(),
             })
 
-        # Upsert to ChromaDB (it handles embeddings internally if configured)
-        self._collection.upsert(
+        # Upsert to ChromaDB (it handles embeddings internally if configured);
+        # embedding is slow, so it runs on a worker thread
+        await asyncio.to_thread(
+            self._collection.upsert,
             ids=ids,
             documents=documents,
             metadatas=metadatas,
@@ -120,7 +123,8 @@ class RAGPipeline:
         top_k = top_k or self.settings.rag.top_k
 
         try:
-            results = self._collection.query(
+            results = await asyncio.to_thread(
+                self._collection.query,
                 query_texts=[question],
                 n_results=min(top_k, self._collection.count()),
             )
@@ -40,6 +40,7 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from core import background
 from gui.styles import get_palette
 from gui.widgets.chat_bubbles import MessageBubble, ToolCallBadge, TypingIndicator
 from gui.widgets.control_center import ControlCenter
@@ -67,15 +68,12 @@ class AsyncWorker(QThread):
         self._coro = coro
 
     def run(self):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # On the shared backend loop, so pooled HTTP clients survive between requests
         try:
-            result = loop.run_until_complete(self._coro)
+            result = background.run(self._coro)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(str(e))
-        finally:
-            loop.close()
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -790,7 +788,7 @@ class HolexBeastApp(QMainWindow):
                 # Rebuild agent history
                 if self.agent:
                     self.agent.clear_history()
-                    self.agent._history = list(conv.messages)
+                    self.agent._history.extend(conv.messages)
                 self._sidebar.set_active(conv_id)
                 self._current_conversation_id = conv_id
 
@@ -1055,14 +1053,7 @@ class HolexBeastApp(QMainWindow):
     def _on_file_attached(self, path: str) -> None:
         if self.rag_pipeline:
             try:
-                import asyncio as _aio
-                _loop = _aio.new_event_loop()
-                try:
-                    _loop.run_until_complete(
-                        self.rag_pipeline.ingest_file(path)
-                    )
-                finally:
-                    _loop.close()
+                background.run(self.rag_pipeline.ingest_file(path))
                 self._settings_panel.rag_tab.add_document_item(
                     Path(path).name, path
                 )
@@ -1263,11 +1254,14 @@ class HolexBeastApp(QMainWindow):
                 self.wake_word.stop()
             except Exception:
                 pass
+        if self.agent:
+            try:
+                background.run(self.agent.close(), timeout=5)
+            except Exception:
+                pass
         if self.llm_router:
             try:
-                loop = asyncio.new_event_loop()
-                loop.run_until_complete(self.llm_router.shutdown())
-                loop.close()
+                background.run(self.llm_router.shutdown(), timeout=5)
             except Exception:
                 pass
         for worker in self._workers:
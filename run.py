@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -58,12 +57,10 @@ def init_services(args: argparse.Namespace) -> dict:
     try:
         from core.llm.router import LLMRouter
         router = LLMRouter(settings)
-        # Need a temp loop just to get the router ready
-        loop = asyncio.new_event_loop()
-        try:
-            loop.run_until_complete(router.initialize())
-        finally:
-            loop.close()
+        # Initialise on the shared backend loop: the health checks leave
+        # warm, pooled connections behind for the first real request
+        from core import background
+        background.run(router.initialize())
         if router.available_providers:
             services["llm_router"] = router
             logger.info(
@@ -83,3 +83,1709 @@ def test_code_runner_rejects_imports():
         runner.execute(code="import subprocess; subprocess.call(['ls'])")
     )
     assert not result.success
+
+
+def test_image_mime_sniffing():
+    """In-memory images should get their MIME type from magic bytes."""
+    from core.agent.agent import _sniff_mime
+
+    assert _sniff_mime(b"\x89PNG\r\n\x1a\n" + b"\x00" * 8) == "image/png"
+    assert _sniff_mime(b"\xff\xd8\xff\xe0" + b"\x00" * 8) == "image/jpeg"
+    assert _sniff_mime(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert _sniff_mime(b"unknown") == "image/png"
+
+
+def test_tool_schemas_cached_until_registration():
+    """Tool schemas should be built once and refreshed when a tool is added."""
+    from core.agent.agent import HolexAgent
+    from core.agent.tools.calculator import CalculatorTool
+
+    class ExtraCalc(CalculatorTool):
+        @property
+        def name(self) -> str:
+            return "extra_calc"
+
+    agent = HolexAgent(router=None)
+    first = agent.get_tool_schemas()
+    assert agent.get_tool_schemas() is first
+    assert len(first) == agent.tool_count
+
+    agent.register_tool(ExtraCalc())
+    refreshed = agent.get_tool_schemas()
+    assert refreshed is not first
+    assert "extra_calc" in [s["function"]["name"] for s in refreshed]
+
+
+def test_history_trims_whole_turns():
+    """History should stay under the cap and always start on a user turn."""
+    from core.agent.agent import HolexAgent
+    from core.llm.base import Message, Role
+
+    agent = HolexAgent(router=None)
+    for i in range(agent._max_history):
+        agent._remember(Message.user(f"question {i}"))
+        agent._remember(Message.assistant(f"answer {i}"))
+        history = agent.get_history()
+        assert len(history) <= agent._max_history
+        assert history[0].role == Role.USER
+
+    history = agent.get_history()
+    assert history[-1].content == f"answer {agent._max_history - 1}"
+
+    # Between trims the prefix is stable: one more turn only appends
+    before = agent.get_history()
+    if len(before) + 2 <= agent._max_history:
+        agent._remember(Message.user("next"))
+        agent._remember(Message.assistant("reply"))
+        assert agent.get_history()[:len(before)] == before
+
+
+def test_system_prompt_reused_within_minute(monkeypatch):
+    """The rendered prompt object is reused within a minute and re-rendered when it rolls over."""
+    from datetime import datetime, timezone
+
+    from core.agent import prompts
+
+    clock = [datetime(2024, 5, 6, 9, 30, 5, tzinfo=timezone.utc)]
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock[0]
+
+    monkeypatch.setattr(prompts, "datetime", FakeDatetime)
+    monkeypatch.setattr(prompts, "_cached_prompt", (None, ""))
+    first = prompts.get_system_prompt()
+    clock[0] = clock[0].replace(second=59)
+    assert prompts.get_system_prompt() is first
+    assert "09:30" in first and "{now}" not in first
+    clock[0] = clock[0].replace(minute=31, second=0)
+    later = prompts.get_system_prompt()
+    assert later is not first and "09:31" in later
+
+
+def test_calculator_compile_cache():
+    """Repeated expressions should reuse the cached code object."""
+    import asyncio
+
+    from core.agent.tools.calculator import CalculatorTool, _compile_safe
+
+    calc = CalculatorTool()
+    asyncio.run(calc.execute(expression="7 * 6"))
+    hits = _compile_safe.cache_info().hits
+    result = asyncio.run(calc.execute(expression="7 * 6"))
+    assert result.success
+    assert _compile_safe.cache_info().hits == hits + 1
+
+
+def test_encode_image_matches_stdlib(tmp_path):
+    """Image encoding (file or bytes) should produce standard base64."""
+    import base64
+
+    from core.agent.agent import _encode_image
+
+    payload = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+    image_file = tmp_path / "img.png"
+    image_file.write_bytes(payload)
+    expected = base64.b64encode(payload).decode("ascii")
+
+    assert _encode_image(image_file) == expected
+    assert _encode_image(payload) == expected
+
+    empty = tmp_path / "empty.png"
+    empty.write_bytes(b"")
+    assert _encode_image(empty) == ""
+
+
+def test_extract_tool_calls_formats():
+    """Tool calls should be parsed from OpenAI/Groq and Gemini responses."""
+    from core.agent.agent import HolexAgent
+
+    agent = HolexAgent(router=None)
+    openai_raw = {"choices": [{"message": {"tool_calls": [
+        {"id": "call_1", "function": {"name": "calculator", "arguments": '{"expression": "1+1"}'}},
+        {"id": "call_2", "function": {"name": "notes", "arguments": "{}"}},
+        {"id": "call_3", "function": {"name": "notes", "arguments": "not json"}},
+    ]}}]}
+    calls = agent._extract_tool_calls(openai_raw)
+    assert [c["id"] for c in calls] == ["call_1", "call_2", "call_3"]
+    assert calls[0]["arguments"] == {"expression": "1+1"}
+    assert calls[1]["arguments"] == {}
+    assert calls[2]["arguments"] == {}
+
+    gemini_raw = {"candidates": [{"content": {"parts": [
+        {"text": "thinking"},
+        {"functionCall": {"name": "weather", "args": {"city": "Pune"}}},
+    ]}}]}
+    calls = agent._extract_tool_calls(gemini_raw)
+    assert calls == [{"name": "weather", "arguments": {"city": "Pune"}}]
+
+    assert agent._extract_tool_calls({"choices": [{"message": {"content": "hi"}}]}) == []
+    assert agent._extract_tool_calls({}) == []
+
+
+def test_run_tools_cancels_stragglers_on_failure():
+    """A failing tool call should cancel the calls still in flight."""
+    import asyncio
+
+    from core.agent.agent import HolexAgent
+    from core.agent.tools.base import ToolResult
+
+    class FakeAgent(HolexAgent):
+        async def _execute_tool(self, tool_name, args):
+            if tool_name == "boom":
+                raise RuntimeError("exploded")
+            if tool_name == "slow":
+                await asyncio.sleep(30)
+            return ToolResult(success=True, output=tool_name)
+
+    agent = FakeAgent(router=None)
+    calls = [
+        {"name": "fast", "arguments": {}},
+        {"name": "slow", "arguments": {}},
+        {"name": "boom", "arguments": {}},
+    ]
+    results = asyncio.run(asyncio.wait_for(agent._run_tools(calls), timeout=5))
+    assert results[0].success and results[0].output == "fast"
+    assert not results[1].success and results[1].error == "Cancelled"
+    assert not results[2].success and "exploded" in results[2].error
+
+
+def test_run_tools_deduplicates_identical_calls():
+    """Identical calls to cacheable tools run once; side-effecting tools run every time."""
+    import asyncio
+
+    from core.agent.agent import HolexAgent
+    from core.agent.tools.base import ToolResult
+
+    executed = []
+
+    class FakeAgent(HolexAgent):
+        async def _execute_tool(self, tool_name, args):
+            executed.append((tool_name, args))
+            return ToolResult(success=True, output=f"{tool_name}:{args}")
+
+    agent = FakeAgent(router=None)
+    calls = [
+        {"name": "calculator", "arguments": {"expression": "2+2"}},
+        {"name": "wikipedia", "arguments": {"query": "Python", "sentences": 2}},
+        {"name": "calculator", "arguments": {"expression": "2+2"}},
+        {"name": "wikipedia", "arguments": {"sentences": 2, "query": "Python"}},
+        {"name": "system_control", "arguments": {"action": "volume_up"}},
+        {"name": "system_control", "arguments": {"action": "volume_up"}},
+    ]
+    results = asyncio.run(agent._run_tools(calls))
+    assert len(executed) == 4
+    assert [r.output for r in results[:4]] == [
+        results[0].output, results[1].output, results[0].output, results[1].output,
+    ]
+    assert results[0].output.startswith("calculator")
+    # Not cacheable, so each side-effecting call runs
+    assert executed[-2:] == [("system_control", {"action": "volume_up"})] * 2
+
+
+def test_cacheable_tool_results_reused():
+    """Cacheable tools should be served from the agent's cache until the TTL expires."""
+    import asyncio
+
+    from core.agent.agent import HolexAgent
+    from core.agent.tools.base import BaseTool, ToolResult
+
+    class CountingTool(BaseTool):
+        cacheable = True
+        cache_ttl = 60.0
+
+        def __init__(self):
+            self.calls = 0
+
+        @property
+        def name(self) -> str:
+            return "counting"
+
+        @property
+        def description(self) -> str:
+            return "Counts its own invocations."
+
+        @property
+        def parameters(self) -> dict:
+            return {"type": "object", "properties": {}}
+
+        async def execute(self, **kwargs) -> ToolResult:
+            self.calls += 1
+            return ToolResult(success=True, output=str(self.calls))
+
+    agent = HolexAgent(router=None)
+    tool = CountingTool()
+    agent.register_tool(tool)
+
+    async def run():
+        first = await agent._execute_tool("counting", {"x": 1})
+        second = await agent._execute_tool("counting", {"x": 1})
+        other = await agent._execute_tool("counting", {"x": 2})
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert first.output == second.output == "1"
+    assert other.output == "2"
+    assert tool.calls == 2
+
+    tool.cache_ttl = 0.0
+    agent._tool_cache.clear()
+    asyncio.run(run())
+    assert tool.calls == 5
+
+
+def test_blocked_tokens_ignore_case_and_unicode():
+    """Token scan lowercases ASCII only and still sees past non-ASCII text."""
+    from core.agent.tools.code_runner import _ascii_lower, _find_blocked_token
+
+    assert _ascii_lower("ÉCOLE Open(") == "École open(".encode()
+    assert _find_blocked_token(_ascii_lower("print('héllo'); OPEN('x')")) == "open("
+    assert _find_blocked_token(_ascii_lower("print('日本語')")) is None
+
+
+def test_notes_journal_replays(tmp_path, monkeypatch):
+    """Notes mutations append to a journal that replays to the same state."""
+    import asyncio
+
+    from core.agent.tools import notes
+
+    monkeypatch.setattr(notes, "_NOTES_FILE", tmp_path / "notes.jsonl")
+    monkeypatch.setattr(notes, "_LEGACY_FILE", tmp_path / "notes.json")
+    monkeypatch.setattr(notes, "_CACHE", None)
+    tool = notes.NotesTool()
+
+    async def run():
+        await tool.execute("add_note", text="first")
+        await tool.execute("add_note", text="second")
+        await tool.execute("delete_note", index=1)
+        await tool.execute("add_todo", text="ship it")
+        await tool.execute("complete_todo", index=1)
+
+    asyncio.run(run())
+    assert len((tmp_path / "notes.jsonl").read_text(encoding="utf-8").splitlines()) == 5
+
+    before = notes._load_notes()
+    monkeypatch.setattr(notes, "_CACHE", None)
+    after = notes._load_notes()
+    assert after == before
+    assert [n["text"] for n in after["notes"]] == ["second"]
+    assert after["todos"][0]["done"] is True
+
+
+def test_notes_cache_follows_mtime(tmp_path, monkeypatch):
+    """Notes are served from memory until the file changes on disk."""
+    import os
+
+    from core.agent.tools import notes
+
+    path = tmp_path / "notes.jsonl"
+    monkeypatch.setattr(notes, "_NOTES_FILE", path)
+    monkeypatch.setattr(notes, "_LEGACY_FILE", tmp_path / "notes.json")
+    monkeypatch.setattr(notes, "_CACHE", None)
+
+    path.write_text('{"op": "add_note", "note": {"text": "a", "created": ""}}\n', encoding="utf-8")
+    first = notes._load_notes()
+    assert notes._load_notes() is first
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add_note", "note": {"text": "b", "created": ""}}\n')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert [n["text"] for n in notes._load_notes()["notes"]] == ["a", "b"]
+
+
+def test_notes_search_uses_lowered_index(tmp_path, monkeypatch):
+    """Search matches case-insensitively and stays aligned after deletes."""
+    import asyncio
+
+    from core.agent.tools import notes
+
+    monkeypatch.setattr(notes, "_NOTES_FILE", tmp_path / "notes.jsonl")
+    monkeypatch.setattr(notes, "_LEGACY_FILE", tmp_path / "notes.json")
+    monkeypatch.setattr(notes, "_CACHE", None)
+    tool = notes.NotesTool()
+
+    async def run():
+        await tool.execute("add_note", text="Buy MILK")
+        await tool.execute("add_note", text="call mom")
+        await tool.execute("add_note", text="milk the cow")
+        await tool.execute("delete_note", index=1)
+        return await tool.execute("search_notes", text="Milk")
+
+    result = asyncio.run(run())
+    assert "Found 1 note" in result.output
+    assert "**2.** milk the cow" in result.output
+
+
+def test_reminders_fire_in_order_from_one_thread(tmp_path, monkeypatch):
+    """Reminders fire earliest-first from a single scheduler; cancelled ones never fire."""
+    import threading
+    import time
+
+    from core.agent.tools import reminders
+
+    monkeypatch.setattr(reminders, "_REMINDERS_FILE", tmp_path / "reminders.jsonl")
+    fired = []
+    done = threading.Event()
+
+    def notify(title, message):
+        fired.append((message, threading.current_thread().name))
+        if len(fired) == 2:
+            done.set()
+
+    monkeypatch.setattr(reminders, "_notify", notify)
+    now = time.time()
+    reminders._schedule("t_late", {"text": "late", "fire_at": now + 0.2})
+    reminders._schedule("t_gone", {"text": "gone", "fire_at": now + 0.1})
+    reminders._schedule("t_early", {"text": "early", "fire_at": now + 0.05})
+    with reminders._reminder_lock:
+        del reminders._active_reminders["t_gone"]
+
+    assert done.wait(2)
+    assert [m for m, _ in fired] == ["early", "late"]
+    assert {name for _, name in fired} == {"reminders"}
+
+    # Let the scheduler journal the last fire before the file patch is undone
+    journal = tmp_path / "reminders.jsonl"
+    deadline = time.time() + 2
+    while time.time() < deadline:
+        if journal.exists() and journal.read_text(encoding="utf-8").count('"fire"') == 2:
+            break
+        time.sleep(0.01)
+
+
+def test_timers_fire_from_one_scheduler(monkeypatch):
+    """Timers share one scheduler thread and a cancelled timer never fires."""
+    import threading
+    import time
+
+    from core.agent.tools import timer_alarm
+
+    fired = []
+    done = threading.Event()
+
+    def notify(title, message):
+        fired.append((message, threading.current_thread().name))
+        if len(fired) == 2:
+            done.set()
+
+    monkeypatch.setattr(timer_alarm, "_notify", notify)
+    now = time.time()
+    for tid, label, delay in (("t_late", "late", 0.2), ("t_gone", "gone", 0.1), ("t_early", "early", 0.05)):
+        timer_alarm._schedule(tid, {"label": label, "seconds": 0, "started": now,
+                                    "fire_at": now + delay, "message": label})
+    with timer_alarm._timer_lock:
+        del timer_alarm._active_timers["t_gone"]
+
+    assert done.wait(2)
+    time.sleep(0.05)
+    assert [m for m, _ in fired] == ["early", "late"]
+    assert {name for _, name in fired} == {"timers"}
+
+
+def test_cancel_timer_prunes_schedule():
+    """Cancelling a timer removes it from the scheduler's heap right away."""
+    import asyncio
+
+    from core.agent.tools import timer_alarm
+
+    tool = timer_alarm.TimerAlarmTool()
+    assert asyncio.run(tool.execute(action="set_timer", duration="2 hours", label="bread")).success
+    assert asyncio.run(tool.execute(action="set_timer", duration="3 hours", label="tea")).success
+    result = asyncio.run(tool.execute(action="cancel_timer", label="bread"))
+    assert result.output == "Cancelled 1 timer(s)"
+    with timer_alarm._timer_lock:
+        labels = [timer_alarm._active_timers[tid]["label"] for _, tid in timer_alarm._timer_heap]
+    assert labels == ["tea"]
+    asyncio.run(tool.execute(action="cancel_timer"))
+    assert timer_alarm._timer_heap == []
+
+
+def test_reminders_journal_replays(tmp_path, monkeypatch):
+    """Set/cancel/fire records replay to just the still-pending reminders."""
+    import asyncio
+
+    from core.agent.tools import reminders
+
+    path = tmp_path / "reminders.jsonl"
+    monkeypatch.setattr(reminders, "_REMINDERS_FILE", path)
+    monkeypatch.setattr(reminders, "_LEGACY_FILE", tmp_path / "reminders.json")
+    monkeypatch.setattr(reminders, "_journal_lines", 0)
+    tool = reminders.RemindersTool()
+
+    async def run():
+        await tool.execute("set_reminder", text="stretch", when="in 50 minutes")
+        await tool.execute("set_reminder", text="water plants", when="in 40 minutes")
+        await tool.execute("cancel_reminder", text="water")
+
+    asyncio.run(run())
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    pending = reminders._replay()
+    assert [info["text"] for info in pending.values()] == ["stretch"]
+    with reminders._reminder_lock:
+        reminders._active_reminders.clear()
+
+
+def test_parse_reminder_time_forms():
+    """Relative, absolute, and 'tomorrow' reminder times all parse."""
+    import time
+    from datetime import datetime
+
+    from core.agent.tools.reminders import _parse_reminder_time
+
+    assert abs(_parse_reminder_time("in 5 minutes") - (time.time() + 300)) < 2
+    assert abs(_parse_reminder_time("within 2 hrs") - (time.time() + 7200)) < 2
+    at = datetime.fromtimestamp(_parse_reminder_time("at 3:15 PM"))
+    assert (at.hour, at.minute) == (15, 15)
+    tomorrow = datetime.fromtimestamp(_parse_reminder_time("tomorrow at 12 am"))
+    assert tomorrow.hour == 0 and tomorrow > datetime.now()
+    assert _parse_reminder_time("sometime soon") is None
+
+
+def test_powershell_notifier_passes_text_as_data(monkeypatch):
+    """Quotes in reminder text go over stdin as JSON, not into the script."""
+    import io
+    import json
+
+    from core.agent.tools import reminders
+
+    spawned = []
+
+    class FakeProc:
+        def __init__(self, args, **kwargs):
+            self.args = args
+            self.stdin = io.StringIO()
+            spawned.append(self)
+
+        def poll(self):
+            return None
+
+    monkeypatch.setattr(reminders.subprocess, "Popen", FakeProc)
+    monkeypatch.setattr(reminders, "_ps_notifier", None)
+    reminders._notify_powershell("Reminder", "it's Bob's turn")
+    reminders._notify_powershell("Reminder", "again")
+
+    assert len(spawned) == 1
+    assert "Bob" not in " ".join(spawned[0].args)
+    lines = spawned[0].stdin.getvalue().splitlines()
+    assert json.loads(lines[0]) == {"t": "Reminder", "m": "it's Bob's turn"}
+
+
+def test_reminder_ids_continue_after_reload(tmp_path, monkeypatch):
+    """Reloading the journal reseeds rem_N ids past the persisted ones."""
+    import time
+
+    from core.agent.tools import reminders
+
+    path = tmp_path / "reminders.jsonl"
+    path.write_text(
+        '{"op": "set", "rid": "rem_7", "text": "a", "fire_at": %f}\n' % (time.time() + 3600),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(reminders, "_REMINDERS_FILE", path)
+    monkeypatch.setattr(reminders, "_LEGACY_FILE", tmp_path / "reminders.json")
+    monkeypatch.setattr(reminders, "_rid_counter", reminders._rid_counter)
+    reminders._load_reminders()
+
+    assert next(reminders._rid_counter) == 8
+    with reminders._reminder_lock:
+        reminders._active_reminders.clear()
+
+
+def test_code_runner_caps_runaway_output():
+    """A snippet that floods stdout is killed once it passes the output cap."""
+    import asyncio
+
+    from core.agent.tools.code_runner import CodeRunnerTool
+
+    tool = CodeRunnerTool()
+    result = asyncio.run(tool.execute(code="while True: print('x' * 1000)"))
+    assert not result.success
+    assert "exceeded" in result.error
+
+
+def test_code_runner_can_import_site_packages():
+    """Snippets run isolated but can still import installed third-party packages."""
+    import asyncio
+
+    from core.agent.tools.code_runner import CodeRunnerTool
+
+    result = asyncio.run(CodeRunnerTool().execute(code="import httpx\nprint(httpx.__name__)"))
+    assert result.success and "httpx" in result.output
+
+
+def test_code_runner_subprocess_runs_off_the_event_loop(monkeypatch):
+    """The blocking subprocess wait happens on a worker thread, not the shared loop."""
+    import asyncio
+    import threading
+
+    from core.agent.tools import code_runner
+
+    threads = []
+
+    def run_capped(args, **kwargs):
+        threads.append(threading.current_thread())
+        return 0, "done", "", False
+
+    monkeypatch.setattr(code_runner, "_run_capped", run_capped)
+    result = asyncio.run(code_runner.CodeRunnerTool().execute(code="x = 5\nprint(x)"))
+    assert result.success and "done" in result.output
+    assert threads and threading.main_thread() not in threads
+
+
+def test_code_runner_inline_fast_path():
+    """Cheap arithmetic/print snippets run in-process; anything else needs the subprocess."""
+    from core.agent.tools.code_runner import _run_inline
+
+    assert _run_inline("print(sum(range(10)))") == "45"
+    assert _run_inline("print('area:', round(math.pi * 2 ** 2, 2))") == "area: 12.57"
+    assert _run_inline("2 + 2") == ""
+    assert _run_inline("print(1 / 0)") is None              # traceback comes from the subprocess
+    assert _run_inline("print(9 ** 9 ** 9)") is None         # nested power
+    assert _run_inline("print(2 ** 100000)") is None         # exponent too large
+    assert _run_inline("print('x' * 10 ** 9)") is None       # string arithmetic
+    assert _run_inline("print(sum(range(10 ** 12)))") is None
+    assert _run_inline("print(math.factorial(10 ** 6))") is None
+    assert _run_inline("print(1, file=None)") is None
+    assert _run_inline("x = 5") is None
+
+
+def test_code_runner_dedents_indented_paste():
+    """Uniformly indented code still runs after the dedent shortcut."""
+    import asyncio
+
+    from core.agent.tools.code_runner import CodeRunnerTool
+
+    result = asyncio.run(CodeRunnerTool().execute(code="    x = 6\n    print(x * 7)\n"))
+    assert result.success
+    assert "42" in result.output
+
+
+def test_action_tables_built_at_class_definition():
+    """@action handlers are collected per class; unknown actions are rejected."""
+    import asyncio
+
+    from core.agent.tools.notes import NotesTool
+    from core.agent.tools.reminders import RemindersTool
+
+    assert set(NotesTool._actions) == {
+        "add_note", "list_notes", "search_notes", "delete_note",
+        "add_todo", "list_todos", "complete_todo", "delete_todo",
+    }
+    assert set(RemindersTool._actions) == {"set_reminder", "list_reminders", "cancel_reminder"}
+    result = asyncio.run(RemindersTool().execute(action="snooze"))
+    assert not result.success and "Unknown action" in result.error
+
+
+def test_notes_compaction_replaces_atomically(tmp_path, monkeypatch):
+    """Compaction writes a temp file and renames it over the journal."""
+    from core.agent.tools import notes
+
+    path = tmp_path / "notes.jsonl"
+    monkeypatch.setattr(notes, "_NOTES_FILE", path)
+    data = notes._empty()
+    notes._apply(data, {"op": "add_note", "note": {"text": "keep", "created": ""}})
+    notes._save_notes(data)
+
+    assert path.read_text(encoding="utf-8").count("\n") == 1
+    assert not (tmp_path / "notes.jsonl.tmp").exists()
+
+
+def test_notes_list_view_refreshes_after_mutation(tmp_path, monkeypatch):
+    """Cached list output is reused until the next mutation."""
+    import asyncio
+
+    from core.agent.tools import notes
+
+    monkeypatch.setattr(notes, "_NOTES_FILE", tmp_path / "notes.jsonl")
+    monkeypatch.setattr(notes, "_LEGACY_FILE", tmp_path / "notes.json")
+    monkeypatch.setattr(notes, "_CACHE", None)
+    tool = notes.NotesTool()
+
+    async def run():
+        await tool.execute("add_todo", text="write tests")
+        first = await tool.execute("list_todos")
+        again = await tool.execute("list_todos")
+        await tool.execute("complete_todo", index=1)
+        after = await tool.execute("list_todos")
+        return first, again, after
+
+    first, again, after = asyncio.run(run())
+    assert again.output is first.output
+    assert "⬜ **1.** write tests" in first.output
+    assert "✅ **1.** write tests" in after.output
+
+
+def test_blocked_token_prefilter():
+    """The byte-set pre-check skips code that can't contain any token, and never hides one."""
+    from core.agent.tools import code_runner
+
+    assert not any(
+        code_runner._byte_mask(b"print(sum(range(10)))") & m == m for m in code_runner._TOKEN_MASKS
+    )
+    for token in code_runner._BLOCKED_TOKENS:
+        lowered = code_runner._ascii_lower(f"x = 1\n{token}")
+        assert code_runner._find_blocked_token(lowered) == token
+
+
+def test_system_control_actions_match_schema():
+    """Every action in the system_control schema has exactly one registered handler."""
+    import asyncio
+
+    from core.agent.tools.system_control import SystemControlTool
+
+    tool = SystemControlTool()
+    assert set(tool.parameters["properties"]["action"]["enum"]) == set(SystemControlTool._actions)
+    assert SystemControlTool._actions["minimize_all"] is SystemControlTool._actions["show_desktop"]
+    result = asyncio.run(tool.execute(action="teleport"))
+    assert not result.success and "Unknown action" in result.error
+
+
+def test_app_name_resolution():
+    """App/settings names resolve exactly, by leading word, or by unambiguous completion."""
+    from core.agent.tools.system_control import _APP_INDEX, _SETTINGS_INDEX
+
+    assert _APP_INDEX.resolve("  Chrome ") == "chrome"
+    assert _APP_INDEX.resolve("chrome browser") == "chrome"
+    assert _APP_INDEX.resolve("visual studio code please") == "visual studio code"
+    assert _APP_INDEX.resolve("microsoft wor") == "microsoft word"
+    assert _APP_INDEX.resolve("visual stu") == "visual studio"
+    assert _APP_INDEX.resolve("wordpad") is None        # "word" only matches on a word boundary
+    assert _APP_INDEX.resolve("ca") is None             # too short to complete
+    assert _APP_INDEX.resolve("mic") is None            # ambiguous
+    assert _SETTINGS_INDEX.resolve("bluetooth settings") == "bluetooth"
+
+
+def test_endpoint_volume_cached_and_reactivated(monkeypatch):
+    """The audio endpoint is activated once and re-activated after a device error."""
+    import asyncio
+
+    from core.agent.tools import system_control
+    from core.agent.tools.system_control import SystemControlTool
+
+    class FakeVolume:
+        def __init__(self):
+            self.level, self.broken = 0.5, False
+
+        def GetMasterVolumeLevelScalar(self):
+            if self.broken:
+                raise OSError("device gone")
+            return self.level
+
+        def SetMasterVolumeLevelScalar(self, level, ctx):
+            self.level = level
+
+    tool = SystemControlTool()
+    activations = []
+
+    def activate():
+        activations.append(FakeVolume())
+        tool._com.endpoint_volume = activations[-1]
+        return activations[-1]
+
+    monkeypatch.setattr(system_control, "AudioUtilities", object())
+    monkeypatch.setattr(tool, "_endpoint_volume", lambda: getattr(tool._com, "endpoint_volume", None) or activate())
+
+    asyncio.run(tool.execute(action="volume_up"))
+    asyncio.run(tool.execute(action="volume_up"))
+    assert len(activations) == 1 and abs(activations[0].level - 0.7) < 1e-9
+
+    activations[0].broken = True
+    result = asyncio.run(tool.execute(action="volume_down"))
+    assert result.success and len(activations) == 2
+
+
+def test_wifi_iface_detected_once(monkeypatch):
+    """The WiFi adapter name is looked up once and re-detected only when netsh rejects it."""
+    import asyncio
+    import subprocess
+
+    from core.agent.tools import system_control
+
+    calls = []
+    fail_next_set = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args[2])
+        if args[2] == "show":
+            return subprocess.CompletedProcess(args, 0, "Enabled  Connected  Dedicated  Wi-Fi 2\n", "")
+        code = 1 if fail_next_set and fail_next_set.pop() else 0
+        return subprocess.CompletedProcess(args, code, "", "")
+
+    monkeypatch.setattr(system_control.subprocess, "run", fake_run)
+    tool = system_control.SystemControlTool()
+    asyncio.run(tool.execute(action="wifi_off"))
+    asyncio.run(tool.execute(action="wifi_on"))
+    assert calls == ["show", "set", "set"]
+    assert tool._wifi_iface == "Wi-Fi 2"
+
+    fail_next_set.append(True)
+    assert asyncio.run(tool.execute(action="wifi_off")).success
+    assert calls[3:] == ["set", "show", "set"]
+
+
+def test_show_desktop_sends_win_m(monkeypatch):
+    """show_desktop taps Win+M in-process instead of spawning PowerShell."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    events = []
+    def keybd_event(vk, scan, flags, extra):
+        events.append((vk, flags))
+
+    fake = SimpleNamespace(user32=SimpleNamespace(keybd_event=keybd_event))
+    monkeypatch.setattr(ctypes, "windll", fake, raising=False)
+    monkeypatch.setattr(system_control.subprocess, "run", None)
+
+    result = asyncio.run(system_control.SystemControlTool().execute(action="show_desktop"))
+    assert result.success
+    assert events == [(0x5B, 0), (0x4D, 0), (0x4D, 2), (0x5B, 2)]
+
+
+def test_media_keys_use_keybd_event(monkeypatch):
+    """Media keys tap the virtual key directly."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    events = []
+
+    def keybd_event(vk, scan, flags, extra):
+        events.append((vk, flags))
+
+    user32 = SimpleNamespace(keybd_event=keybd_event)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(user32=user32), raising=False)
+    result = asyncio.run(system_control.SystemControlTool().execute(action="media_next"))
+    assert result.success and events == [(0xB0, 0), (0xB0, 2)]
+
+
+def test_type_text_single_send_input(monkeypatch):
+    """type_text sends the whole string as Unicode key packets in one SendInput call."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    calls = []
+
+    def send_input(n, inputs, size):
+        calls.append([(i.u.ki.wVk, i.u.ki.wScan, i.u.ki.dwFlags) for i in inputs])
+        assert size == ctypes.sizeof(system_control._INPUT)
+        return n
+
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(user32=SimpleNamespace(SendInput=send_input)), raising=False)
+    monkeypatch.setattr(system_control, "pyautogui", None)
+    result = asyncio.run(system_control.SystemControlTool().execute(action="type_text", target="hé\n😀"))
+    assert result.success and len(calls) == 1
+    assert calls[0] == [
+        (0, ord("h"), 4), (0, ord("h"), 6), (0, 0xE9, 4), (0, 0xE9, 6),
+        (0x0D, 0, 0), (0x0D, 0, 2),
+        (0, 0xD83D, 4), (0, 0xD83D, 6), (0, 0xDE00, 4), (0, 0xDE00, 6),
+    ]
+
+
+def test_brightness_wmi_fallback_single_process(monkeypatch):
+    """Without screen_brightness_control, brightness goes through one reused PowerShell host."""
+    import asyncio
+    import io
+
+    from core.agent.tools import system_control
+
+    spawned, scripts = [], []
+
+    class FakeHost:
+        def __init__(self, args, **kwargs):
+            spawned.append(args)
+            self.stdout = io.StringIO()
+            host = self
+
+            class Stdin:
+                def write(self, text):
+                    script, end = text.splitlines()
+                    scripts.append(script)
+                    pos = host.stdout.tell()
+                    host.stdout.write("60\r\n" + end.split("'")[1] + "\r\n")
+                    host.stdout.seek(pos)
+
+                def flush(self):
+                    pass
+
+            self.stdin = Stdin()
+
+        def poll(self):
+            return None
+
+        def kill(self):
+            pass
+
+    monkeypatch.setattr(system_control, "sbc", None)
+    monkeypatch.setattr(system_control.subprocess, "Popen", FakeHost)
+    monkeypatch.setattr(system_control, "_ps_host", system_control._PowerShellHost())
+    tool = system_control.SystemControlTool()
+    result = asyncio.run(tool.execute(action="brightness_up"))
+    assert result.success and "60%" in result.output
+    assert asyncio.run(tool.execute(action="set_brightness", target="30")).success
+    assert len(spawned) == 1 and tuple(spawned[0]) == (*system_control._POWERSHELL, "-")
+    assert "+ 10" in scripts[0] and "WmiSetBrightness(1,30)" in scripts[1]
+
+
+def test_brightness_library_calls_run_off_the_event_loop(monkeypatch):
+    """screen_brightness_control reads and writes happen on a worker thread."""
+    import asyncio
+    import threading
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    threads, levels = [], [55]
+
+    def get_brightness(display):
+        threads.append(threading.current_thread())
+        return [levels[-1]]
+
+    def set_brightness(value, display):
+        threads.append(threading.current_thread())
+        levels.append(value)
+
+    monkeypatch.setattr(system_control, "sbc",
+                        SimpleNamespace(get_brightness=get_brightness, set_brightness=set_brightness))
+    tool = system_control.SystemControlTool()
+    assert asyncio.run(tool.execute(action="brightness_down")).output == "Brightness: **45%**"
+    assert asyncio.run(tool.execute(action="set_brightness", target="80%")).success
+    assert levels == [55, 45, 80]
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+def test_close_app_accepts_exe_names(monkeypatch):
+    """close_app maps app names and .exe names to the right image name."""
+    import asyncio
+    import subprocess
+
+    from core.agent.tools import system_control
+
+    killed = []
+
+    def fake_run(args, **kwargs):
+        killed.append(args[-1])
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    monkeypatch.setattr(system_control.subprocess, "run", fake_run)
+    tool = system_control.SystemControlTool()
+    for name in ("obs studio", "OBS64.EXE", "myapp.exe", "myapp"):
+        asyncio.run(tool.execute(action="close_app", target=name))
+    assert killed == ["obs64.exe", "obs64.exe", "myapp.exe", "myapp.exe"]
+
+
+def test_play_youtube_caches_video_id(monkeypatch):
+    """Repeated play_youtube queries reuse the cached videoId."""
+    import asyncio
+
+    from core.agent.tools import system_control
+
+    fetches = []
+
+    class FakeStream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def aiter_bytes(self):
+            # The id straddles a chunk boundary; the last chunk must never be read
+            for chunk in (b"<html>" * 100 + b'<a href="/watc', b'h?v=abcdefghijk">', b"unreachable"):
+                assert chunk != b"unreachable"
+                yield chunk
+
+    class FakeClient:
+        is_closed = False
+
+        def stream(self, method, url, params=None):
+            fetches.append(params["search_query"])
+            return FakeStream()
+
+    opened = []
+    monkeypatch.setattr(system_control.webbrowser, "open", opened.append)
+    monkeypatch.setattr(system_control, "_YT_CACHE", {})
+    tool = system_control.SystemControlTool()
+    monkeypatch.setattr(tool, "_http_client", lambda: FakeClient())
+
+    async def play_twice():
+        await tool.execute(action="play_youtube", target="Lofi ")
+        await tool.execute(action="play_youtube", target="lofi")
+
+    asyncio.run(play_twice())
+    assert fetches == ["Lofi "]
+    assert opened == ["https://www.youtube.com/watch?v=abcdefghijk"] * 2
+
+
+def test_open_app_falls_back_to_shell_execute(monkeypatch):
+    """An app missing from PATH is opened through ShellExecuteW, not cmd /c start."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    launches, opened = [], []
+
+    def fake_popen(args, **kwargs):
+        launches.append((args, kwargs.get("creationflags")))
+        if args == ["chrome.exe"]:
+            raise FileNotFoundError(args[0])
+
+    def shell_execute(hwnd, verb, target, params, cwd, show):
+        opened.append(target)
+        return 42
+
+    shell32 = SimpleNamespace(ShellExecuteW=shell_execute)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(shell32=shell32), raising=False)
+    monkeypatch.setattr(system_control.subprocess, "Popen", fake_popen)
+    tool = system_control.SystemControlTool()
+    assert asyncio.run(tool.execute(action="open_app", target="chrome")).success
+    assert asyncio.run(tool.execute(action="open_app", target="cmd")).success
+    assert opened == ["chrome.exe"]
+    assert launches[0][1] & system_control._DETACHED_PROCESS
+    assert launches[1] == (["cmd.exe"], system_control._launch_flags("cmd.exe"))
+    assert not launches[1][1] & system_control._DETACHED_PROCESS
+
+
+def test_system_commands_run_off_the_event_loop(monkeypatch):
+    """Blocking subprocess calls run on a worker thread, not the event loop's."""
+    import asyncio
+    import subprocess
+    import threading
+
+    from core.agent.tools import system_control
+
+    threads = []
+
+    def fake_run(args, **kwargs):
+        threads.append(threading.current_thread())
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    monkeypatch.setattr(system_control.subprocess, "run", fake_run)
+    result = asyncio.run(system_control.SystemControlTool().execute(action="close_app", target="notepad"))
+    assert result.success
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_copy_file_uses_copyfileex(monkeypatch, tmp_path):
+    """copy_file hands each file to CopyFileExW, including inside copied folders."""
+    import asyncio
+    import ctypes
+    import shutil
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    copied = []
+
+    def copy_file_ex(src, dst, progress, data, cancel, flags):
+        copied.append((src, dst))
+        shutil.copyfile(src, dst)
+        return 1
+
+    kernel32 = SimpleNamespace(CopyFileExW=copy_file_ex)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(kernel32=kernel32), raising=False)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.txt").write_text("hi")
+    (tmp_path / "out").mkdir()
+    tool = system_control.SystemControlTool()
+
+    r1 = asyncio.run(tool.execute(action="copy_file", target=str(tmp_path / "src" / "a.txt"),
+                                  destination=str(tmp_path / "out")))
+    r2 = asyncio.run(tool.execute(action="copy_file", target=str(tmp_path / "src"),
+                                  destination=str(tmp_path / "tree")))
+    assert r1.success and r2.success
+    assert (tmp_path / "out" / "a.txt").read_text() == "hi"
+    assert (tmp_path / "tree" / "a.txt").read_text() == "hi"
+    assert [dst for _, dst in copied] == [str(tmp_path / "out" / "a.txt"), str(tmp_path / "tree" / "a.txt")]
+
+
+def test_name_index_memoises_resolutions():
+    """Repeated phrases are resolved from the cache."""
+    import pytest
+
+    from core.agent.tools.system_control import _NameIndex
+
+    index = _NameIndex({"chrome": "chrome.exe", "google chrome": "chrome.exe"})
+    assert index.resolve("Chrome browser") == "chrome"
+    assert index.resolve("Chrome browser") == "chrome"
+    assert index.resolve.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        _NameIndex({"Chrome": "chrome.exe"})
+
+
+def test_open_app_uses_registered_app_paths(monkeypatch):
+    """Registered App Paths give full executable paths, even for unmapped names."""
+    import asyncio
+
+    from core.agent.tools import system_control
+
+    launched = []
+    monkeypatch.setattr(system_control.subprocess, "Popen", lambda args, **kw: launched.append(args[0]))
+    monkeypatch.setattr(system_control, "_app_paths", {
+        "chrome.exe": r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        "foobar2000.exe": r"C:\Apps\foobar2000\foobar2000.exe",
+    })
+    tool = system_control.SystemControlTool()
+    assert asyncio.run(tool.execute(action="open_app", target="chrome")).success
+    assert asyncio.run(tool.execute(action="open_app", target="foobar2000")).success
+    assert asyncio.run(tool.execute(action="open_app", target="notepad")).success
+    assert launched == [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Apps\foobar2000\foobar2000.exe",
+        "notepad.exe",
+    ]
+
+
+def test_refresh_app_paths_without_winreg(monkeypatch):
+    """Off Windows the App Paths table is simply empty."""
+    from core.agent.tools import system_control
+
+    monkeypatch.setattr(system_control, "winreg", None)
+    monkeypatch.setattr(system_control, "_app_paths", None)
+    assert system_control.refresh_app_paths() == {}
+    assert system_control._app_path("chrome.exe") is None
+
+
+def test_close_app_terminates_in_process_with_psutil(monkeypatch):
+    """With psutil, close_app terminates matching processes without spawning taskkill."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    class FakeProc:
+        def __init__(self, name):
+            self.info = {"name": name}
+            self.terminated = False
+
+        def terminate(self):
+            self.terminated = True
+
+    procs = [FakeProc("Chrome.exe"), FakeProc("chrome.exe"), FakeProc("code.exe"), FakeProc(None)]
+    fake_psutil = SimpleNamespace(
+        process_iter=lambda attrs: iter(procs),
+        wait_procs=lambda ps, timeout: ([], []),
+        Error=Exception,
+    )
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("taskkill should not run")
+
+    monkeypatch.setattr(system_control, "psutil", fake_psutil)
+    monkeypatch.setattr(system_control.subprocess, "run", no_subprocess)
+    result = asyncio.run(system_control.SystemControlTool().execute(action="close_app", target="chrome"))
+    assert result.success and "2 processes" in result.output
+    assert [p.terminated for p in procs] == [True, True, False, False]
+
+
+def test_system_control_execute_raw(monkeypatch):
+    """execute_raw dispatches straight from the LLM's argument dict."""
+    import asyncio
+
+    from core.agent.tools import system_control
+
+    opened = []
+    monkeypatch.setattr(system_control.webbrowser, "open", opened.append)
+    tool = system_control.SystemControlTool()
+    result = asyncio.run(tool.execute_raw({"action": "open_url", "target": "example.com", "extra": 1}))
+    assert result.success and opened == ["https://example.com"]
+    result = asyncio.run(tool.execute_raw({"action": "teleport"}))
+    assert not result.success and "Unknown action" in result.error
+
+
+def test_shutdown_and_cancel_use_win32_calls(monkeypatch):
+    """Shutdown/restart schedule via InitiateSystemShutdownExW and cancel via AbortSystemShutdownW."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    calls = []
+    advapi32 = SimpleNamespace(
+        OpenProcessToken=lambda proc, access, token: 1,
+        LookupPrivilegeValueW=lambda system, name, luid: calls.append(name) or 1,
+        AdjustTokenPrivileges=lambda *a: 1,
+        InitiateSystemShutdownExW=lambda m, msg, t, force, reboot, reason: calls.append(("init", t, reboot)) or 1,
+        AbortSystemShutdownW=lambda m: calls.append("abort") or 1,
+    )
+    kernel32 = SimpleNamespace(GetCurrentProcess=lambda: -1, CloseHandle=lambda h: 1)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(advapi32=advapi32, kernel32=kernel32), raising=False)
+
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("shutdown.exe should not run")
+
+    monkeypatch.setattr(system_control.subprocess, "run", no_subprocess)
+    tool = system_control.SystemControlTool()
+    assert asyncio.run(tool.execute(action="restart")).success
+    assert asyncio.run(tool.execute(action="cancel_shutdown")).success
+    assert calls == ["SeShutdownPrivilege", ("init", 30, True), "SeShutdownPrivilege", "abort"]
+
+
+def test_screenshot_reuses_mss_grabber(monkeypatch, tmp_path):
+    """Screenshots go through one cached mss grabber per thread."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    created, written = [], []
+
+    class FakeGrabber:
+        monitors = [{"all": True}, {"primary": True}]
+
+        def __init__(self):
+            created.append(self)
+
+        def grab(self, monitor):
+            assert monitor == {"primary": True}
+            return SimpleNamespace(rgb=b"\0\0\0", size=(1, 1))
+
+    fake_mss = SimpleNamespace(
+        mss=FakeGrabber,
+        tools=SimpleNamespace(to_png=lambda rgb, size, output: written.append(output)),
+    )
+    monkeypatch.setattr(system_control, "mss", fake_mss)
+    monkeypatch.setattr(system_control, "TEMP_DIR", tmp_path)
+    tool = system_control.SystemControlTool()
+
+    result = asyncio.run(tool.execute(action="screenshot"))
+    assert result.success and written == [result.data["path"]]
+
+    created.clear()
+    tool._grab_screen(str(tmp_path / "a.png"))
+    tool._grab_screen(str(tmp_path / "b.png"))
+    assert len(created) == 1
+
+
+def test_name_index_bisect_fallback(monkeypatch):
+    """Without marisa-trie the index searches a sorted key tuple."""
+    from core.agent.tools import system_control
+
+    monkeypatch.setattr(system_control, "marisa_trie", None)
+    index = system_control._NameIndex({"microsoft word": "winword.exe", "microsoft edge": "msedge.exe"})
+    assert index._sorted == ("microsoft edge", "microsoft word")
+    assert index.resolve("microsoft wo") == "microsoft word"
+    assert index.resolve("microsoft") is None
+
+
+def test_quote_query_matches_quote_plus():
+    """The plain-query shortcut produces exactly what quote_plus would."""
+    from urllib.parse import quote_plus
+
+    from core.agent.tools.system_control import _quote_query
+
+    for q in ["lofi hip hop", "python 3.12 tutorial", "a-b_c.d~e", "", "c++ vs rust", "what's 5% of 20?",
+              "AC/DC & more", "café", "a+b=c #1"]:
+        assert _quote_query(q) == quote_plus(q)
+
+
+def test_delete_file_recycles_via_shell_api(monkeypatch, tmp_path):
+    """delete_file recycles with SHFileOperationW and only deletes outright if that fails without send2trash."""
+    import asyncio
+    import ctypes
+    import sys
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    doomed = tmp_path / "old.txt"
+    doomed.write_text("bye")
+    ops = []
+
+    def sh_file_operation(ref):
+        op = ref._obj
+        ops.append((op.wFunc, op.pFrom, op.fFlags))
+        return 0
+
+    shell32 = SimpleNamespace(SHFileOperationW=sh_file_operation)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(shell32=shell32), raising=False)
+    tool = system_control.SystemControlTool()
+    result = asyncio.run(tool.execute(action="delete_file", target=str(doomed)))
+    assert result.success and "Recycle Bin" in result.output
+    assert ops == [(3, str(doomed), 0x0454)]   # reading pFrom back stops at the first NUL
+    assert doomed.exists()   # the fake shell didn't really move it
+
+    shell32.SHFileOperationW = lambda ref: 0x7C
+    monkeypatch.setitem(sys.modules, "send2trash", None)
+    result = asyncio.run(tool.execute(action="delete_file", target=str(doomed)))
+    assert result.success and "permanently" in result.output and not doomed.exists()
+
+
+def test_empty_recycle_bin_calls_shell_api(monkeypatch):
+    """Emptying the bin is one SHEmptyRecycleBinW call; an already-empty bin still succeeds."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    results = iter([0, -2147418113, -2147024891])     # S_OK, E_UNEXPECTED, E_ACCESSDENIED
+    calls = []
+
+    def empty_bin(hwnd, root, flags):
+        calls.append(flags)
+        return next(results)
+
+    shell32 = SimpleNamespace(SHEmptyRecycleBinW=empty_bin)
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(shell32=shell32), raising=False)
+    tool = system_control.SystemControlTool()
+    outcomes = [asyncio.run(tool.execute(action="empty_recycle_bin")).success for _ in range(3)]
+    assert outcomes == [True, True, False]
+    assert calls == [0x7] * 3
+
+
+def test_clipboard_set_uses_win32_api(monkeypatch):
+    """Clipboard writes open the clipboard with a hidden window and copy UTF-16 text for SetClipboardData."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    block = ctypes.create_string_buffer(64)
+    events = []
+
+    def fn(name, result=1):
+        def call(*args):
+            events.append((name, *args) if name in ("open", "destroy") else name)
+            return result
+        return call
+
+    dlls = {
+        "kernel32": SimpleNamespace(
+            GlobalAlloc=fn("alloc", 1234), GlobalLock=fn("lock", ctypes.addressof(block)),
+            GlobalUnlock=fn("unlock"), GlobalFree=fn("free"),
+        ),
+        "user32": SimpleNamespace(
+            CreateWindowExW=fn("window", 99), DestroyWindow=fn("destroy"),
+            OpenClipboard=fn("open"), EmptyClipboard=fn("empty"),
+            SetClipboardData=fn("set"), CloseClipboard=fn("close"),
+        ),
+    }
+    loaded = []
+
+    def win_dll(name, use_last_error=False):
+        loaded.append(name)
+        return dlls[name]
+
+    monkeypatch.setattr(ctypes, "WinDLL", win_dll, raising=False)
+    system_control._clipboard_api.cache_clear()
+
+    def no_powershell(*args, **kwargs):
+        raise AssertionError("PowerShell should not run")
+
+    monkeypatch.setattr(system_control.subprocess, "Popen", no_powershell)
+    tool = system_control.SystemControlTool()
+    try:
+        for _ in range(2):
+            events.clear()
+            result = asyncio.run(tool.execute(action="copy_to_clipboard", target="héllo"))
+            assert result.success
+            assert events == ["window", ("open", 99), "empty", "alloc", "lock", "unlock", "set", "close",
+                              ("destroy", 99)]
+            assert block.raw[:12] == "héllo\0".encode("utf-16-le")
+    finally:
+        system_control._clipboard_api.cache_clear()
+    assert loaded == ["user32", "kernel32"]
+    assert dlls["user32"].SetClipboardData.restype is ctypes.c_void_p
+
+
+def test_switch_window_prefers_best_title_match(monkeypatch):
+    """switch_window activates the best-matching visible window without PowerShell."""
+    import asyncio
+    import ctypes
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    titles = {1: "Notes - Notepad", 2: "Notepad", 3: "", 4: "Notepad++ (hidden)"}
+    foreground = []
+
+    def get_text(hwnd, buf, n):
+        buf.value = titles[hwnd][:n - 1]
+        return len(buf.value)
+
+    user32 = SimpleNamespace(
+        EnumWindows=lambda proc, lparam: [proc(h, 0) for h in titles] and 1,
+        IsWindowVisible=lambda hwnd: hwnd != 4,
+        GetWindowTextLengthW=lambda hwnd: len(titles[hwnd]),
+        GetWindowTextW=get_text,
+        IsIconic=lambda hwnd: 0,
+        SetForegroundWindow=foreground.append,
+        keybd_event=lambda *a: None,
+    )
+    monkeypatch.setattr(ctypes, "windll", SimpleNamespace(user32=user32), raising=False)
+    tool = system_control.SystemControlTool()
+
+    result = asyncio.run(tool.execute(action="switch_window", target="notepad"))
+    assert result.success and "**Notepad**" in result.output and foreground == [2]
+    result = asyncio.run(tool.execute(action="switch_window", target="excel"))
+    assert not result.success and foreground == [2]
+
+
+def test_zip_files_stores_compressed_media(tmp_path):
+    """Already-compressed files are stored, text is deflated, and the tree round-trips."""
+    import asyncio
+    import zipfile
+
+    from core.agent.tools.system_control import SystemControlTool
+
+    folder = tmp_path / "trip"
+    (folder / "empty").mkdir(parents=True)
+    (folder / "notes.txt").write_text("hello " * 1000)
+    (folder / "photo.JPG").write_bytes(b"\xff\xd8" + bytes(range(256)) * 8)
+    (folder / "a" / "b").mkdir(parents=True)
+    (folder / "a" / "b" / "deep.txt").write_text("deep")
+    tool = SystemControlTool()
+
+    result = asyncio.run(tool.execute(action="zip_files", target=str(folder)))
+    assert result.success
+    with zipfile.ZipFile(tmp_path / "trip.zip") as zf:
+        kinds = {i.filename: i.compress_type for i in zf.infolist()}
+        assert kinds["trip/photo.JPG"] == zipfile.ZIP_STORED
+        assert kinds["trip/notes.txt"] == zipfile.ZIP_DEFLATED
+        assert "trip/empty/" in kinds
+        assert zf.read("trip/notes.txt") == b"hello " * 1000
+        assert list(kinds) == ["trip/a/", "trip/a/b/", "trip/a/b/deep.txt", "trip/empty/",
+                               "trip/notes.txt", "trip/photo.JPG"]
+
+
+def test_copy_file_range_with_fallback(monkeypatch, tmp_path):
+    """Linux copies use copy_file_range and fall back to copy2 when it isn't supported."""
+    import errno
+    import os
+    import shutil
+
+    import pytest
+
+    from core.agent.tools import system_control
+
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("os.copy_file_range not available")
+    src = tmp_path / "big.bin"
+    src.write_bytes(os.urandom(3000))
+    os.utime(src, (1_000_000, 1_000_000))
+
+    with pytest.raises(shutil.SameFileError):
+        system_control._copy_file(str(src), str(tmp_path))
+    assert len(src.read_bytes()) == 3000
+    out = tmp_path / "copy.bin"
+    assert system_control._copy_file(str(src), str(out)) == str(out)
+    assert out.read_bytes() == src.read_bytes() and out.stat().st_mtime == 1_000_000
+
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(system_control.os, "copy_file_range", unsupported)
+    other = tmp_path / "other.bin"
+    system_control._copy_file(str(src), str(other))
+    assert other.read_bytes() == src.read_bytes()
+
+
+def test_unzip_file_parallel_extraction(monkeypatch, tmp_path):
+    """Large multi-file archives extract across worker threads with the same result as extractall."""
+    import asyncio
+    import os
+    import zipfile
+
+    from core.agent.tools import system_control
+
+    monkeypatch.setattr(system_control, "_PARALLEL_UNZIP_MIN_BYTES", 0)
+    monkeypatch.setattr(system_control.os, "cpu_count", lambda: 4)
+    archive = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("empty/", "")
+        for i in range(12):
+            zf.writestr(f"a/b{i % 3}/f{i}.txt", os.urandom(64).hex())
+        zf.writestr("../escape.txt", "nope")
+        zf.writestr("C:/Windows/x/evil.txt", "drive")
+        zf.writestr("D:/odd:name?/f.txt", "chars")
+
+    result = asyncio.run(system_control.SystemControlTool().execute(
+        action="unzip_file", target=str(archive), destination=str(tmp_path / "out")))
+    assert result.success
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(tmp_path / "reference")
+
+    def tree(root):
+        return sorted(str(p.relative_to(root)) for p in root.rglob("*"))
+
+    assert tree(tmp_path / "out") == tree(tmp_path / "reference")
+    with zipfile.ZipFile(archive) as zf:
+        for i in range(12):
+            assert (tmp_path / "out" / f"a/b{i % 3}/f{i}.txt").read_text() == zf.read(f"a/b{i % 3}/f{i}.txt").decode()
+    assert (tmp_path / "out" / "empty").is_dir()
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_list_processes_top_by_memory(monkeypatch):
+    """list_processes shows the 20 biggest processes, largest first."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    procs = [SimpleNamespace(info={"pid": i, "name": f"p{i}.exe", "memory_percent": (i * 7) % 50 or None})
+             for i in range(60)]
+    monkeypatch.setattr(system_control, "psutil", SimpleNamespace(process_iter=lambda attrs: iter(procs)))
+    result = asyncio.run(system_control.SystemControlTool().execute(action="list_processes"))
+    lines = result.output.splitlines()[1:]
+    shown = [float(line.split("— ")[1].split("%")[0]) for line in lines]
+    assert len(lines) == 20 and shown == sorted(shown, reverse=True) and shown[0] == 49.0
+
+
+def test_system_info_reads_cached_cpu(monkeypatch):
+    """Once the sampler has a reading, system_info reports it without measuring again."""
+    import asyncio
+    import threading
+    from types import SimpleNamespace
+
+    from core.agent.tools import system_control
+
+    def no_blocking_sample(*a, **kw):
+        raise AssertionError("cpu_percent should come from the sampler")
+
+    ready = threading.Event()
+    ready.set()
+    gib = 1024**3
+    monkeypatch.setattr(system_control, "psutil", SimpleNamespace(
+        cpu_percent=no_blocking_sample,
+        virtual_memory=lambda: SimpleNamespace(used=4 * gib, total=16 * gib, percent=25.0),
+        disk_usage=lambda path: SimpleNamespace(used=100 * gib, total=500 * gib, percent=20.0),
+        cpu_count=lambda logical=True: 8 if logical else 4,
+        boot_time=lambda: 0.0,
+    ))
+    monkeypatch.setattr(system_control, "_cpu_sampler", object())
+    monkeypatch.setattr(system_control, "_cpu_ready", ready)
+    monkeypatch.setattr(system_control, "_cpu_pct", 37.5)
+    result = asyncio.run(system_control.SystemControlTool().execute(action="system_info"))
+    assert "**CPU Usage**: 37.5%" in result.output
+    assert "**Cores**: 4 physical / 8 logical" in result.output
+
+
+def test_parse_duration_single_pass():
+    """The fused duration regex agrees with the old per-unit searches."""
+    import re
+
+    from core.agent.tools.timer_alarm import _parse_duration
+
+    def per_unit(text):
+        text = text.lower().strip()
+        if text.isdigit():
+            return int(text)
+        total = 0
+        for pattern, scale in ((r'(\d+)\s*(?:hours?|hrs?|h)', 3600),
+                               (r'(\d+)\s*(?:minutes?|mins?|m(?!s))', 60),
+                               (r'(\d+)\s*(?:seconds?|secs?|s)', 1)):
+            m = re.search(pattern, text)
+            if m:
+                total += int(m.group(1)) * scale
+        return total or None
+
+    cases = ["5 minutes", "1 hour 30 minutes", "90 seconds", "2h 15m", "1h30m", "45s", "10 min",
+             "1 hr 2 hrs", "5 ms", "3 mins 4 secs", "120", "  7 Minutes ", "soon", "0 h", "1h 1h 5m"]
+    for text in cases:
+        assert _parse_duration(text) == per_unit(text), text
+    assert _parse_duration("1h30m") == 5400
+
+
+def test_unit_conversion_by_index():
+    """Units resolve to their table in one lookup; mixed tables are rejected."""
+    import asyncio
+
+    from core.agent.tools.translate_convert import TranslateConvertTool
+
+    tool = TranslateConvertTool()
+
+    def convert(text):
+        return asyncio.run(tool.execute(action="convert", text=text))
+
+    assert convert("5 miles to km").output == "**5.0 miles** = **8.04672 km**"
+    assert convert("2 KB in bytes").output == "**2.0 KB** = **2048 bytes**"
+    assert convert("100 f to c").output == "**100.0 f** = **37.78 c**"
+    assert not convert("3 miles to kg").success
+    assert not convert("3 parsecs to km").success
+
+
+def test_define_fetches_off_the_event_loop(monkeypatch):
+    """define runs the dictionary request on a worker thread, and its results are cacheable."""
+    import asyncio
+    import threading
+
+    from core.agent.tools import translate_convert
+
+    threads = []
+
+    def fetch(word):
+        threads.append(threading.current_thread())
+        return f"**{word}**" if word != "zzxq" else None
+
+    monkeypatch.setattr(translate_convert, "_fetch_definition", fetch)
+    tool = translate_convert.TranslateConvertTool()
+    assert asyncio.run(tool.execute(action="define", text=" serendipity ")).output == "**serendipity**"
+    assert not asyncio.run(tool.execute(action="define", text="zzxq")).success
+    assert threading.main_thread() not in threads
+    assert tool.cacheable and tool.cache_ttl > 0
+
+
+def test_translate_runs_off_the_event_loop(monkeypatch):
+    """The blocking translator call runs on a worker thread."""
+    import asyncio
+    import sys
+    import threading
+    from types import ModuleType
+
+    from core.agent.tools.translate_convert import TranslateConvertTool
+
+    threads = []
+
+    class GoogleTranslator:
+        def __init__(self, source, target):
+            self.target = target
+
+        def translate(self, text):
+            threads.append(threading.current_thread())
+            return f"{text} ({self.target})"
+
+    module = ModuleType("deep_translator")
+    module.GoogleTranslator = GoogleTranslator
+    monkeypatch.setitem(sys.modules, "deep_translator", module)
+    result = asyncio.run(TranslateConvertTool().execute(action="translate", text="hello", to_lang="hindi"))
+    assert result.success and result.output.endswith("> hello (hi)")
+    assert threads and threading.main_thread() not in threads
+
+
+def test_weather_geocodes_each_city_once(monkeypatch):
+    """A repeat city skips the geocoding request, and both calls share one HTTP client."""
+    import asyncio
+
+    import httpx
+
+    from core.agent.tools import weather
+
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host.startswith("geocoding"):
+            return httpx.Response(200, json={"results": [
+                {"name": "Pune", "country": "India", "latitude": 18.5, "longitude": 73.9}]})
+        return httpx.Response(200, json={
+            "current": {"temperature_2m": 30, "apparent_temperature": 32, "relative_humidity_2m": 40,
+                        "wind_speed_10m": 5, "weather_code": 0},
+            "daily": {"time": ["2024-01-01"], "weather_code": [1], "temperature_2m_max": [31],
+                      "temperature_2m_min": [20], "precipitation_probability_max": [0]},
+        })
+
+    clients = []
+    real_client = httpx.AsyncClient
+
+    def make_client(**kwargs):
+        clients.append(real_client(transport=httpx.MockTransport(handler), **kwargs))
+        return clients[-1]
+
+    async def twice():
+        return await tool.execute(city="Pune"), await tool.execute(city=" pune ")
+
+    monkeypatch.setattr(httpx, "AsyncClient", make_client)
+    monkeypatch.setattr(weather, "_GEO_CACHE", {})
+    tool = weather.WeatherTool()
+    first, second = asyncio.run(twice())
+    assert len(clients) == 1
+    assert first.success and second.output == first.output and "Pune, India" in first.output
+    assert hosts == ["geocoding-api.open-meteo.com", "api.open-meteo.com", "api.open-meteo.com"]
+
+
+def test_wikipedia_falls_back_to_search(monkeypatch):
+    """A missing title resolves through the search suggestion; a hit needs no suggestion."""
+    import asyncio
+
+    import httpx
+
+    from core.agent.tools.wikipedia_tool import WikipediaTool
+
+    def handler(request):
+        if request.url.path.endswith("/w/api.php"):
+            return httpx.Response(200, json=["einstien", ["Albert Einstein"], [], []])
+        if request.url.path.endswith("/summary/Albert_Einstein"):
+            return httpx.Response(200, json={"title": "Albert Einstein",
+                                             "extract": "One. Two. Three. Four. Five. Six. Seven"})
+        return httpx.Response(404)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient",
+                        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    tool = WikipediaTool()
+    result = asyncio.run(tool.execute(topic="einstien", sentences=3))
+    assert result.success and result.output == "## 📚 Albert Einstein\n\nOne. Two. Three."
+    assert asyncio.run(tool.execute(topic="Albert Einstein", sentences=10)).output.endswith("Six. Seven")
+
+
+def test_first_sentences_matches_split():
+    """The bounded sentence scan trims exactly like split/join did."""
+    from core.agent.tools.wikipedia_tool import _first_sentences
+
+    def by_split(text, n):
+        sents = text.split(". ")
+        return ". ".join(sents[:n]) + "." if len(sents) > n else text
+
+    for text in ["", "One.", "One. Two", "One. Two. Three.", "A. . B. C", "Dr. Who. Is. Here. "]:
+        for n in range(1, 6):
+            assert _first_sentences(text, n) == by_split(text, n), (text, n)
+
+
+def test_calculator_refuses_huge_results_up_front():
+    """Powers, shifts and factorials that would run for seconds are refused before evaluation."""
+    import asyncio
+    import time
+
+    from core.agent.tools.calculator import CalculatorTool
+
+    calc = CalculatorTool()
+    for expression in ["10**(10**7)", "pow(10, 10**7)", "factorial(10**6)", "1 << (1 << 70)",
+                       "(9**1000)**1000", "[0] * 10**9", "'a' * 10**9", "10**9 * b'a'", "('ab' * 10**5) * 10**5"]:
+        started = time.perf_counter()
+        result = asyncio.run(calc.execute(expression=expression))
+        assert not result.success and "too large" in result.error, expression
+        assert time.perf_counter() - started < 0.5, expression
+    for expression, shown in [("2**100", "1,267,650,600,228,229,401,496,703,205,376"),
+                              ("factorial(20)", "2,432,902,008,176,640,000"), ("2**-3", "0.125"),
+                              ("100**0.5", "10"), ("2**2.5", "5.656854"), ("8**(1/3)", "2")]:
+        assert asyncio.run(calc.execute(expression=expression)).output.endswith(f"**{shown}**")
+
+
+def test_tool_http_client_closed_by_agent():
+    """A tool reuses one client per loop, and the agent closes it, even from another loop."""
+    import asyncio
+
+    from core import background
+    from core.agent.agent import HolexAgent
+
+    agent = HolexAgent(router=None)
+    tool = agent._tools["weather"]
+
+    async def grab():
+        return tool._http_client(), tool._http_client()
+
+    first, again = background.run(grab())
+    assert first is again and not first.is_closed
+    asyncio.run(agent.close())
+    assert first.is_closed and tool._http is None
+
+    replaced = background.run(grab())[0]
+    fresh = asyncio.run(grab())[0]
+    background.run(asyncio.sleep(0.05))
+    assert replaced.is_closed and fresh is not replaced
+    asyncio.run(agent.close())
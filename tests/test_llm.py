@@ -64,3 +64,55 @@ def test_llm_response():
     assert resp.content == "Test response"
     assert resp.model == "test-model"
     assert resp.prompt_tokens == 10
+
+
+def test_provider_client_pooled_per_event_loop():
+    """Providers reuse one HTTP client per loop and close it when the loop changes."""
+    import asyncio
+    import time
+
+    from core import background
+    from core.llm.providers.groq_provider import GroqProvider
+
+    provider = GroqProvider(api_key="test")
+
+    async def grab_twice():
+        return provider._shared_client(), provider._shared_client()
+
+    first, second = background.run(grab_twice())
+    assert first is second
+    assert background.run(grab_twice())[0] is first  # later requests on the shared loop reuse it
+
+    async def grab_and_close():
+        client = provider._shared_client()
+        await provider.close()
+        return client
+
+    other = asyncio.run(grab_and_close())
+    assert other is not first and other.is_closed
+    deadline = time.monotonic() + 2
+    while not first.is_closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert first.is_closed  # replaced client was closed on its own loop
+
+    third, _ = background.run(grab_twice())
+    asyncio.run(provider.close())  # closing from another loop still closes it
+    assert third.is_closed and provider._client is None
+
+
+def test_wire_format_accepts_prebuilt_tool_dicts():
+    """Providers should accept OpenAI-format tool dicts next to Message objects."""
+    from core.llm.base import Message, to_wire
+    from core.llm.providers.gemini_provider import GeminiProvider
+
+    tool_msg = {"role": "tool", "content": "42", "name": "calculator", "tool_call_id": "call_1"}
+    messages = [Message.system("sys"), Message.user("6*7?"), tool_msg]
+
+    wire = to_wire(messages)
+    assert wire[2] is tool_msg
+    assert wire[0] == {"role": "system", "content": "sys"}
+
+    system, contents = GeminiProvider(api_key="test")._convert_messages(messages)
+    assert system == "sys"
+    assert contents[-1]["role"] == "function"
+    assert contents[-1]["parts"][0]["functionResponse"]["name"] == "calculator"
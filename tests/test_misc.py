@@ -55,3 +55,37 @@ def test_stylesheet_generation():
     assert isinstance(qss, str)
     assert len(qss) > 1000  # should be substantial
     assert "QMainWindow" in qss or "QWidget" in qss
+
+
+def test_fastjson_roundtrip_with_and_without_orjson(monkeypatch):
+    """fastjson should behave the same with orjson or the stdlib fallback."""
+    import json
+
+    from core import fastjson
+
+    payload = {"b": 1, "a": ["ü", 2.5, None]}
+    for backend in (fastjson.orjson, None):
+        monkeypatch.setattr(fastjson, "orjson", backend)
+        text = fastjson.dumps(payload, sort_keys=True)
+        assert json.loads(text) == payload
+        assert text.index('"a"') < text.index('"b"')
+        assert fastjson.loads(text.encode()) == payload
+        try:
+            fastjson.loads("{not json")
+        except json.JSONDecodeError:
+            pass
+        else:
+            raise AssertionError("expected JSONDecodeError")
+
+
+def test_fastjson_splices_preserialized_values():
+    """dumps_with_raw should embed pre-encoded JSON as-is."""
+    import json
+
+    from core import fastjson
+
+    tools = [{"type": "function", "function": {"name": "calculator"}}]
+    body = fastjson.dumps_with_raw({"model": "m"}, {"tools": fastjson.dumps_bytes(tools)})
+    assert json.loads(body) == {"model": "m", "tools": tools}
+    assert json.loads(fastjson.dumps_with_raw({}, {"tools": b"[]"})) == {"tools": []}
+    assert json.loads(fastjson.dumps_with_raw({"a": 1}, {})) == {"a": 1}